@@ -0,0 +1,87 @@
+"""
+Project serialization benchmark:
+the default response_model path (validate every nested wave/allocation, then json.dumps) against
+fast_project_response (shape the stored document, then orjson) for a 500-allocation project.
+
+Run from backend/:  python benchmarks/project_serialization.py [allocations] [repeats]
+No database is needed; the project document is generated in memory.
+"""
+
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "benchmark")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+import server  # noqa: E402
+
+
+def build_project(allocation_count: int, waves: int = 5, months: int = 12) -> dict:
+    """Stored project document with allocation_count grid rows spread over the waves"""
+    def allocation(i: int) -> dict:
+        return {
+            "id": str(uuid.uuid4()), "skill_id": f"skill-{i % 40}", "skill_name": f"SAP Consultant {i % 40}",
+            "proficiency_level": "Senior", "avg_monthly_salary": 5000.0 + i, "original_monthly_salary": 5000.0,
+            "base_location_id": f"loc-{i % 6}", "base_location_name": "India Offshore", "overhead_percentage": 20.0,
+            "is_onsite": i % 3 == 0, "travel_required": i % 5 == 0,
+            "phase_allocations": {str(m): 1.0 for m in range(months)},
+            "per_diem_daily": 50.0, "per_diem_days": 30, "accommodation_daily": 80.0, "accommodation_days": 30,
+            "local_conveyance_daily": 20.0, "local_conveyance_days": 21, "flight_cost_per_trip": 450.0,
+            "visa_insurance_per_trip": 120.0, "num_trips": 2,
+        }
+    per_wave = allocation_count // waves
+    now = datetime.now(timezone.utc)
+    project = server.Project(name="Benchmark", project_number="PRJ-9999").model_dump()
+    project.update(created_at=now, updated_at=now, waves=[{
+        "id": str(uuid.uuid4()), "name": f"Wave {w + 1}", "duration_months": float(months),
+        "phase_names": [f"M{m + 1}" for m in range(months)], "logistics_defaults": {},
+        "logistics_config": {"num_trips": 2.0}, "nego_buffer_percentage": 0.0,
+        "grid_allocations": [allocation(w * per_wave + i) for i in range(per_wave)],
+    } for w in range(waves)])
+    return project
+
+
+async def model_path(project: dict) -> bytes:
+    field = create_response_field(name="Response_get_project", type_=server.Project, mode="serialization")
+    content = await serialize_response(field=field, response_content=project, is_coroutine=True)
+    return JSONResponse(content).body
+
+
+async def fast_path(project: dict) -> bytes:
+    return server.fast_project_response(project).body
+
+
+async def timed(render, project: dict, repeats: int) -> float:
+    await render(project)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        await render(project)
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+async def main(allocation_count: int, repeats: int):
+    project = build_project(allocation_count)
+    assert json.loads(await model_path(project)) == json.loads(await fast_path(project)), "Response bodies differ"
+    default_ms = await timed(model_path, project, repeats)
+    fast_ms = await timed(fast_path, project, repeats)
+    size = len(await fast_path(project))
+    print(f"{allocation_count} allocations, {size / 1024:.0f} KiB response, {repeats} runs")
+    print(f"  response_model + json: {default_ms:8.2f} ms")
+    print(f"  fast_project_response: {fast_ms:8.2f} ms")
+    print(f"  speedup:               {default_ms / fast_ms:8.1f}x")
+
+
+if __name__ == "__main__":
+    import asyncio
+    allocations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    asyncio.run(main(allocations, runs))
@@ -1,26 +1,46 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query, status, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, UpdateOne, DeleteMany, ReturnDocument
+from pymongo.errors import OperationFailure, DuplicateKeyError, BulkWriteError, PyMongoError
+import asyncio
+import copy
+import gzip
+import json
+import multiprocessing
 import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import orjson
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional, Dict
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter, ValidationError
+from typing import Any, Callable, List, Optional, Dict
 import uuid
 from datetime import datetime, timezone, timedelta
 import hashlib
 import jwt
+from collections import OrderedDict
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+try:
+    import brotli
+except ImportError:  # Optional: without it responses are only gzip-compressed
+    brotli = None
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+# tz_aware: stored BSON dates are read back as UTC-aware datetimes
+client = AsyncIOMotorClient(mongo_url, tz_aware=True)
 db = client[os.environ['DB_NAME']]
 
 # JWT Settings
@@ -36,6 +56,56 @@ SMTP_PASSWORD = os.environ.get('SMTP_PASSWORD', '')
 SMTP_FROM_EMAIL = os.environ.get('SMTP_FROM_EMAIL', '')
 SMTP_FROM_NAME = os.environ.get('SMTP_FROM_NAME', 'YASH EstiPro')
 
+# Notification retention settings
+NOTIFICATION_RETENTION_DAYS = int(os.environ.get('NOTIFICATION_RETENTION_DAYS', '30'))
+
+# Background scheduler settings (cron expressions are evaluated in UTC)
+SCHEDULER_ENABLED = os.environ.get('SCHEDULER_ENABLED', 'true').lower() == 'true'
+SCHEDULER_LOCK_TTL_SECONDS = int(os.environ.get('SCHEDULER_LOCK_TTL_SECONDS', '900'))
+JOB_RUN_HISTORY_DAYS = int(os.environ.get('JOB_RUN_HISTORY_DAYS', '30'))
+NOTIFICATION_COMPACTION_SCHEDULE = os.environ.get('NOTIFICATION_COMPACTION_SCHEDULE', '0 */6 * * *')
+AUDIT_ARCHIVE_SCHEDULE = os.environ.get('AUDIT_ARCHIVE_SCHEDULE', '30 2 * * *')
+AUDIT_RETENTION_DAYS = int(os.environ.get('AUDIT_RETENTION_DAYS', '365'))
+
+# Async job settings
+JOB_PROCESS_WORKERS = int(os.environ.get('JOB_PROCESS_WORKERS', str(os.cpu_count() or 2)))
+JOB_MAX_CONCURRENCY = int(os.environ.get('JOB_MAX_CONCURRENCY', '4'))
+JOB_RESULT_TTL_HOURS = int(os.environ.get('JOB_RESULT_TTL_HOURS', '24'))
+JOB_RESULT_CHUNK_BYTES = int(os.environ.get('JOB_RESULT_CHUNK_BYTES', str(4 * 1024 * 1024)))
+JOB_HEARTBEAT_SECONDS = int(os.environ.get('JOB_HEARTBEAT_SECONDS', '30'))
+VALUATION_SHARD_SIZE = int(os.environ.get('VALUATION_SHARD_SIZE', '250'))
+VALUATION_RECOMPUTE_SCHEDULE = os.environ.get('VALUATION_RECOMPUTE_SCHEDULE', '0 3 * * *')
+VALUATION_INLINE_LIMIT = int(os.environ.get('VALUATION_INLINE_LIMIT', '20'))
+VALUATION_MAX_PROJECTS = int(os.environ.get('VALUATION_MAX_PROJECTS', '500'))
+SUMMARY_CACHE_SIZE = int(os.environ.get('SUMMARY_CACHE_SIZE', '512'))
+VALUATION_REFRESH_DELAY_SECONDS = float(os.environ.get('VALUATION_REFRESH_DELAY_SECONDS', '2'))
+
+# Estimator autosave (delta sync) settings
+SYNC_MAX_OPERATIONS = int(os.environ.get('SYNC_MAX_OPERATIONS', '500'))
+SYNC_MAX_ATTEMPTS = int(os.environ.get('SYNC_MAX_ATTEMPTS', '3'))
+
+# Project version storage settings
+VERSION_SNAPSHOT_INTERVAL = int(os.environ.get('VERSION_SNAPSHOT_INTERVAL', '5'))
+VERSION_CACHE_SIZE = int(os.environ.get('VERSION_CACHE_SIZE', '256'))
+
+# Schema migration settings
+MIGRATION_BATCH_SIZE = int(os.environ.get('MIGRATION_BATCH_SIZE', '500'))
+MIGRATION_LOCK_SECONDS = int(os.environ.get('MIGRATION_LOCK_SECONDS', '1800'))
+MIGRATION_RETRY_SECONDS = int(os.environ.get('MIGRATION_RETRY_SECONDS', '30'))
+
+# Response compression settings
+COMPRESSION_MINIMUM_SIZE = int(os.environ.get('COMPRESSION_MINIMUM_SIZE', '1024'))
+COMPRESSION_GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL', '6'))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', '5'))
+
+# Cross-worker cache invalidation settings (polling is the fallback where change streams are unavailable)
+CACHE_CHANGE_STREAMS = os.environ.get('CACHE_CHANGE_STREAMS', 'true').lower() == 'true'
+CACHE_POLL_INTERVAL_SECONDS = float(os.environ.get('CACHE_POLL_INTERVAL_SECONDS', '5'))
+
+# Bulk master data import settings
+BULK_IMPORT_MAX_ROWS = int(os.environ.get('BULK_IMPORT_MAX_ROWS', '5000'))
+RATE_IMPACT_TOP_PROJECTS = int(os.environ.get('RATE_IMPACT_TOP_PROJECTS', '20'))
+
 security = HTTPBearer(auto_error=False)
 
 app = FastAPI()
@@ -312,17 +382,21 @@ async def delete_user(user_id: str, user: dict = Depends(require_auth)):
     return {"message": "User deleted successfully"}
 
 
-@api_router.get("/users/approvers/list")
-async def get_approvers(user: dict = Depends(get_current_user)):
-    """Get list of users who can approve projects (approvers and admins)"""
-    approvers = await db.users.find(
+async def list_approvers() -> List[dict]:
+    """Active users who can approve projects (approvers and admins)"""
+    return await db.users.find(
         {
             "role": {"$in": ["approver", "admin"]},
             "is_active": {"$ne": False}
         },
         {"_id": 0, "id": 1, "email": 1, "name": 1, "role": 1}
     ).to_list(100)
-    return approvers
+
+
+@api_router.get("/users/approvers/list")
+async def get_approvers(user: dict = Depends(get_current_user)):
+    """Get list of users who can approve projects (approvers and admins)"""
+    return await list_approvers()
 
 
 @api_router.post("/users/{user_id}/reset-password")
@@ -477,6 +551,14 @@ class SkillCreate(BaseModel):
     technology_id: str
     technology_name: str
 
+class SkillImportRow(BaseModel):
+    # One skills sheet row; the technology is resolved case-insensitively by name
+    technology_name: str = ""
+    name: str = ""
+
+class SkillBulkImport(BaseModel):
+    rows: List[SkillImportRow]
+
 
 # Models for Proficiency Rates
 class ProficiencyRate(BaseModel):
@@ -502,6 +584,21 @@ class ProficiencyRateCreate(BaseModel):
     proficiency_level: str
     avg_monthly_salary: float
 
+PROFICIENCY_LEVELS = ["Junior", "Mid", "Senior", "Lead", "Architect", "Project Management", "Delivery"]
+
+class ProficiencyRateImportRow(BaseModel):
+    # One rate card sheet row; names are resolved case-insensitively against master data
+    technology_name: str = ""
+    skill_name: str = ""
+    base_location_name: str = ""
+    proficiency_level: str = ""
+    avg_monthly_salary: Optional[float] = None
+
+class ProficiencyRateBulkImport(BaseModel):
+    rows: List[ProficiencyRateImportRow]
+    update_existing: bool = False  # Re-price rates that already exist instead of reporting them as duplicates
+    dry_run: bool = False  # Classify the rows and preview the project impact without writing
+
 
 # Models for Wave Grid Allocation
 class WaveGridAllocation(BaseModel):
@@ -548,6 +645,10 @@ class Project(BaseModel):
     project_number: str = ""  # Unique project number like PRJ-0001
     version: int = 1  # Version number for tracking changes
     version_notes: str = ""  # Notes for this version
+    revision: int = 0  # Bumped on every in-place update; used for optimistic concurrency
+    content_hash: str = ""  # Hash of the estimate content (see estimate_hashes)
+    wave_hashes: List[Dict[str, str]] = []  # [{"id", "hash"}] per wave, in wave order
+    duplicate_of_version: Optional[int] = None  # Set when a new version's content matches an earlier version
     name: str
     customer_id: str = ""
     customer_name: str = ""
@@ -574,8 +675,8 @@ class Project(BaseModel):
     status: str = "draft"  # draft, in_review, approved, rejected
     approver_email: str = ""
     approval_comments: str = ""
-    submitted_at: Optional[str] = None
-    approved_at: Optional[str] = None
+    submitted_at: Optional[datetime] = None
+    approved_at: Optional[datetime] = None
     submitted_by: str = ""
     approved_by: str = ""
     # Sales Manager
@@ -640,6 +741,34 @@ class ProjectUpdate(BaseModel):
     approval_comments: Optional[str] = None
     sales_manager_id: Optional[str] = None
     sales_manager_name: Optional[str] = None
+    revision: Optional[int] = None  # Revision the client last read; a mismatch returns 409
+
+class WaveUpdate(BaseModel):
+    name: Optional[str] = None
+    duration_months: Optional[float] = None
+    phase_names: Optional[List[str]] = None
+    logistics_defaults: Optional[Dict[str, float]] = None
+    logistics_config: Optional[Dict[str, float]] = None
+    nego_buffer_percentage: Optional[float] = None
+
+class PhaseAllocationUpdate(BaseModel):
+    value: float
+
+class SyncOperation(BaseModel):
+    op: str  # set_cell, insert_row, delete_row, rename_wave, set_logistics
+    wave_id: str
+    allocation_id: Optional[str] = None  # set_cell, delete_row
+    phase_key: Optional[str] = None  # set_cell on a phase (grid month) cell
+    field: Optional[str] = None  # set_cell on a row field (salary, skill, onsite, ...)
+    value: Any = None
+    allocation: Optional[Dict] = None  # insert_row
+    index: Optional[int] = None  # insert_row position; appended when omitted
+    name: Optional[str] = None  # rename_wave
+    logistics_config: Optional[Dict[str, float]] = None  # set_logistics (merged into the wave config)
+
+class ProjectSyncRequest(BaseModel):
+    base_revision: int
+    operations: List[SyncOperation] = []
 
 # Notification model
 class Notification(BaseModel):
@@ -652,6 +781,8 @@ class Notification(BaseModel):
     project_id: str
     project_number: str
     is_read: bool = False
+    read_at: Optional[datetime] = None  # Set when marked read; drives TTL expiry
+    repeat_count: int = 1  # Number of identical events collapsed into this entry
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
@@ -702,7 +833,6 @@ async def create_audit_log(
         metadata=metadata
     )
     doc = audit_log.model_dump()
-    doc['timestamp'] = doc['timestamp'].isoformat()
     await db.audit_logs.insert_one(doc)
     return audit_log
 
@@ -722,6 +852,32 @@ def detect_changes(old_data: dict, new_data: dict, fields_to_track: List[str]) -
     return changes
 
 
+# Timestamps are stored as native BSON dates (UTC), so range filters and sorts run in Mongo
+def parse_timestamp(value: str) -> datetime:
+    """Parse an ISO date or timestamp; a trailing Z or any offset is honoured, naive values are UTC"""
+    parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def date_range_filter(date_from: Optional[str] = None, date_to: Optional[str] = None) -> Optional[dict]:
+    """Build a Mongo range filter from YYYY-MM-DD dates or ISO timestamps.
+    A bare date as the upper bound includes that whole day."""
+    date_filter = {}
+    try:
+        if date_from:
+            date_filter["$gte"] = parse_timestamp(date_from)
+        if date_to:
+            if len(date_to.strip()) == 10:
+                date_filter["$lt"] = parse_timestamp(date_to) + timedelta(days=1)
+            else:
+                date_filter["$lte"] = parse_timestamp(date_to)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date filter, expected YYYY-MM-DD or an ISO timestamp")
+    return date_filter or None
+
+
 # Email Helper Function
 async def send_email(to_email: str, subject: str, html_body: str, text_body: str = None):
     """Send email via SMTP"""
@@ -845,28 +1001,250 @@ class SalesManagerUpdate(BaseModel):
     is_active: Optional[bool] = None
 
 
+# Conditional GET.
+# Master data lists carry an ETag built from a per-collection change counter in
+# db.master_data_versions, bumped by every write; they are served from the master data cache
+# below, so a matching If-None-Match is answered with 304 without touching Mongo. Project reads
+# derive theirs from revision, updated_at and the content hash of each version. Responses ask
+# clients to revalidate on every use.
+MASTER_DATA_COLLECTIONS = [
+    "customers", "technologies", "project_types", "base_locations", "skills", "proficiency_rates", "sales_managers"
+]
+PROJECT_ETAG_PROJECTION = {"_id": 0, "id": 1, "revision": 1, "updated_at": 1, "content_hash": 1}
+
+
+async def bump_master_data_version(*collections: str):
+    """Record a change to master data collections, invalidating their ETags and cached copies"""
+    for name in collections:
+        await db.master_data_versions.update_one(
+            {"collection": name},
+            {"$inc": {"version": 1}, "$setOnInsert": {"epoch": uuid.uuid4().hex[:8]}},
+            upsert=True
+        )
+    master_data_cache.invalidate(*collections)
+
+
+def counter_etag(counter: dict) -> str:
+    return f'"{counter["collection"]}-{counter["epoch"]}-{counter["version"]}"'
+
+
+async def master_data_etag(name: str) -> str:
+    counter = await db.master_data_versions.find_one({"collection": name})
+    if counter is None:
+        # The epoch keeps ETags from repeating if the counters are ever reset
+        counter = await db.master_data_versions.find_one_and_update(
+            {"collection": name},
+            {"$setOnInsert": {"version": 0, "epoch": uuid.uuid4().hex[:8]}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+    return counter_etag(counter)
+
+
+def projects_etag(projects: List[dict]) -> str:
+    validators = sorted(
+        [p.get("id"), p.get("revision", 0), p.get("updated_at"), p.get("content_hash", "")] for p in projects
+    )
+    return f'"{canonical_hash(validators)[:32]}"'
+
+
+def if_none_match(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match matches etag (weak comparison, as for GET)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in tags or etag in tags
+
+
+def etag_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=etag_headers(etag))
+
+
+# Master data cache.
+# Each worker holds every master data collection in memory, loaded in full at startup (no row
+# limit) and reloaded on the next read after a write invalidates it. Documents are kept by id in
+# load order, with unique-key indexes for the lookups the API makes, e.g. proficiency rates by
+# (skill_id, base_location_id, proficiency_level). Cached documents are shared: do not mutate them.
+MASTER_DATA_INDEXES = {
+    "skills": ("name", "technology_id"),
+    "proficiency_rates": ("skill_id", "base_location_id", "proficiency_level"),
+}
+
+
+class MasterDataCache:
+    def __init__(self, collections: List[str]):
+        self._entries = {}
+        # Bumped on invalidation so a load that raced with a write is not kept
+        self._generations = {name: 0 for name in collections}
+        self._locks = {name: asyncio.Lock() for name in collections}
+    
+    def invalidate(self, *collections: str):
+        for name in collections:
+            self._generations[name] += 1
+            self._entries.pop(name, None)
+    
+    def invalidate_stale(self, counter: dict):
+        """Drop a collection whose cached copy predates the given master_data_versions document"""
+        name = counter.get("collection")
+        entry = self._entries.get(name)
+        if entry is not None and entry["etag"] != counter_etag(counter):
+            self.invalidate(name)
+    
+    def status(self) -> dict:
+        return {
+            name: {"etag": entry["etag"], "documents": len(entry["by_id"])} for name, entry in self._entries.items()
+        }
+    
+    async def entry(self, name: str) -> dict:
+        """{"etag", "by_id", "index"} for a collection, loading it if needed"""
+        entry = self._entries.get(name)
+        if entry is not None:
+            return entry
+        async with self._locks[name]:
+            entry = self._entries.get(name)
+            if entry is not None:
+                return entry
+            generation = self._generations[name]
+            # Read the counter before the documents: a write in between only makes the ETag older
+            etag = await master_data_etag(name)
+            documents = await db[name].find({}, {"_id": 0}).to_list(None)
+            key_fields = MASTER_DATA_INDEXES.get(name)
+            entry = {
+                "etag": etag,
+                "by_id": {doc["id"]: doc for doc in documents},
+                "index": {tuple(doc.get(f) for f in key_fields): doc for doc in documents} if key_fields else {},
+            }
+            if self._generations[name] == generation:
+                self._entries[name] = entry
+            return entry
+    
+    async def documents(self, name: str) -> List[dict]:
+        return list((await self.entry(name))["by_id"].values())
+    
+    async def get(self, name: str, document_id: str) -> Optional[dict]:
+        return (await self.entry(name))["by_id"].get(document_id)
+    
+    async def lookup(self, name: str, *key) -> Optional[dict]:
+        """Document by its MASTER_DATA_INDEXES key"""
+        return (await self.entry(name))["index"].get(tuple(key))
+    
+    async def load_all(self):
+        for name in self._locks:
+            await self.entry(name)
+
+
+master_data_cache = MasterDataCache(MASTER_DATA_COLLECTIONS)
+
+
+# Cross-worker invalidation.
+# Every master data write bumps its counter in db.master_data_versions, so that one small collection
+# is all a worker needs to follow to learn about writes made by other workers. Each worker watches
+# it with a change stream; on a standalone mongod (no change streams) or after the stream fails it
+# polls the counters every CACHE_POLL_INTERVAL_SECONDS instead. Either way only collections whose
+# counter moved past the cached copy are dropped, so a worker's own writes are not reloaded twice.
+# Project summaries and reconstructed versions are keyed by immutable values and need no events.
+CHANGE_STREAMS_UNSUPPORTED = {40573, 40324}  # standalone mongod / $changeStream not recognized
+
+
+class CacheInvalidationListener:
+    def __init__(self):
+        self.mode = None  # "change_stream" or "polling" once running
+        self._task = None
+    
+    async def poll(self):
+        for counter in await db.master_data_versions.find({}, {"_id": 0}).to_list(None):
+            master_data_cache.invalidate_stale(counter)
+    
+    async def _watch(self):
+        async with db.master_data_versions.watch(full_document="updateLookup") as stream:
+            self.mode = "change_stream"
+            # Catch up on writes made before the stream opened
+            await self.poll()
+            async for change in stream:
+                if change.get("fullDocument"):
+                    master_data_cache.invalidate_stale(change["fullDocument"])
+                else:
+                    # Counters deleted or the collection dropped: reload everything
+                    master_data_cache.invalidate(*MASTER_DATA_COLLECTIONS)
+    
+    async def _run(self):
+        if CACHE_CHANGE_STREAMS:
+            while True:
+                try:
+                    await self._watch()
+                except OperationFailure as e:
+                    if e.code in CHANGE_STREAMS_UNSUPPORTED:
+                        logger.info("Change streams are not available; polling for master data changes")
+                        break
+                    logger.warning(f"Master data change stream failed: {str(e)}")
+                except PyMongoError as e:
+                    logger.warning(f"Master data change stream interrupted: {str(e)}")
+                except Exception:
+                    logger.exception("Master data change stream failed; falling back to polling")
+                    break
+                # Changes may have been missed while the stream was down
+                await asyncio.sleep(CACHE_POLL_INTERVAL_SECONDS)
+                try:
+                    await self.poll()
+                except PyMongoError as e:
+                    logger.warning(f"Master data poll failed: {str(e)}")
+        self.mode = "polling"
+        while True:
+            try:
+                await self.poll()
+            except PyMongoError as e:
+                logger.warning(f"Master data poll failed: {str(e)}")
+            await asyncio.sleep(CACHE_POLL_INTERVAL_SECONDS)
+    
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+cache_listener = CacheInvalidationListener()
+
+
+async def master_data_response(
+    name: str, request: Request, response: Response, where: Optional[Callable[[dict], bool]] = None
+):
+    """A cached master data list, or 304 when the client's copy is current"""
+    entry = await master_data_cache.entry(name)
+    if if_none_match(request, entry["etag"]):
+        return not_modified(entry["etag"])
+    response.headers.update(etag_headers(entry["etag"]))
+    return [doc for doc in entry["by_id"].values() if where is None or where(doc)]
+
+
 # Customers Routes
 @api_router.post("/customers", response_model=Customer)
 async def create_customer(input: CustomerCreate):
     customer_obj = Customer(**input.model_dump())
     doc = customer_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
     await db.customers.insert_one(doc)
+    await bump_master_data_version("customers")
     return customer_obj
 
 @api_router.get("/customers", response_model=List[Customer])
-async def get_customers():
-    customers = await db.customers.find({}, {"_id": 0}).to_list(1000)
-    for customer in customers:
-        if isinstance(customer['created_at'], str):
-            customer['created_at'] = datetime.fromisoformat(customer['created_at'])
-    return customers
+async def get_customers(request: Request, response: Response):
+    return await master_data_response("customers", request, response)
 
 @api_router.delete("/customers/{customer_id}")
 async def delete_customer(customer_id: str):
     result = await db.customers.delete_one({"id": customer_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Customer not found")
+    await bump_master_data_version("customers")
     return {"message": "Customer deleted successfully"}
 
 
@@ -875,23 +1253,20 @@ async def delete_customer(customer_id: str):
 async def create_technology(input: TechnologyCreate):
     tech_obj = Technology(**input.model_dump())
     doc = tech_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
     await db.technologies.insert_one(doc)
+    await bump_master_data_version("technologies")
     return tech_obj
 
 @api_router.get("/technologies", response_model=List[Technology])
-async def get_technologies():
-    technologies = await db.technologies.find({}, {"_id": 0}).to_list(1000)
-    for tech in technologies:
-        if isinstance(tech['created_at'], str):
-            tech['created_at'] = datetime.fromisoformat(tech['created_at'])
-    return technologies
+async def get_technologies(request: Request, response: Response):
+    return await master_data_response("technologies", request, response)
 
 @api_router.delete("/technologies/{tech_id}")
 async def delete_technology(tech_id: str):
     result = await db.technologies.delete_one({"id": tech_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Technology not found")
+    await bump_master_data_version("technologies")
     return {"message": "Technology deleted successfully"}
 
 
@@ -900,23 +1275,20 @@ async def delete_technology(tech_id: str):
 async def create_project_type(input: ProjectTypeCreate):
     type_obj = ProjectType(**input.model_dump())
     doc = type_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
     await db.project_types.insert_one(doc)
+    await bump_master_data_version("project_types")
     return type_obj
 
 @api_router.get("/project-types", response_model=List[ProjectType])
-async def get_project_types():
-    types = await db.project_types.find({}, {"_id": 0}).to_list(1000)
-    for ptype in types:
-        if isinstance(ptype['created_at'], str):
-            ptype['created_at'] = datetime.fromisoformat(ptype['created_at'])
-    return types
+async def get_project_types(request: Request, response: Response):
+    return await master_data_response("project_types", request, response)
 
 @api_router.delete("/project-types/{type_id}")
 async def delete_project_type(type_id: str):
     result = await db.project_types.delete_one({"id": type_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Project type not found")
+    await bump_master_data_version("project_types")
     return {"message": "Project type deleted successfully"}
 
 
@@ -925,34 +1297,40 @@ async def delete_project_type(type_id: str):
 async def create_base_location(input: BaseLocationCreate):
     location_obj = BaseLocation(**input.model_dump())
     doc = location_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
     await db.base_locations.insert_one(doc)
+    await bump_master_data_version("base_locations")
     return location_obj
 
 @api_router.get("/base-locations", response_model=List[BaseLocation])
-async def get_base_locations():
-    locations = await db.base_locations.find({}, {"_id": 0}).to_list(1000)
-    for location in locations:
-        if isinstance(location['created_at'], str):
-            location['created_at'] = datetime.fromisoformat(location['created_at'])
-    return locations
+async def get_base_locations(request: Request, response: Response):
+    return await master_data_response("base_locations", request, response)
 
 @api_router.delete("/base-locations/{location_id}")
 async def delete_base_location(location_id: str):
     result = await db.base_locations.delete_one({"id": location_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Base location not found")
+    await bump_master_data_version("base_locations")
     return {"message": "Base location deleted successfully"}
 
 
+# Bulk master data imports report one result per row: created, updated, duplicate or invalid
+def import_result(step: dict) -> dict:
+    return {k: v for k, v in step.items() if k in ("index", "status", "id", "detail")}
+
+
+def import_summary(results: List[dict], statuses=("created", "updated", "duplicate", "invalid")) -> dict:
+    counts = {status: 0 for status in statuses}
+    for result in results:
+        counts[result["status"]] += 1
+    return {**counts, "results": results}
+
+
 # Skills Routes
 @api_router.post("/skills", response_model=Skill)
 async def create_skill(input: SkillCreate):
     # Check for duplicate: same skill name + technology combination
-    existing = await db.skills.find_one({
-        "name": input.name,
-        "technology_id": input.technology_id
-    }, {"_id": 0})
+    existing = await master_data_cache.lookup("skills", input.name, input.technology_id)
     if existing:
         raise HTTPException(
             status_code=400, 
@@ -961,17 +1339,62 @@ async def create_skill(input: SkillCreate):
     
     skill_obj = Skill(**input.model_dump())
     doc = skill_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    await db.skills.insert_one(doc)
+    try:
+        await db.skills.insert_one(doc)
+    except DuplicateKeyError:
+        # Added concurrently since the cached check
+        raise HTTPException(status_code=400, detail=f"Skill '{input.name}' already exists for this technology")
+    await bump_master_data_version("skills")
     return skill_obj
 
+@api_router.post("/skills/bulk")
+async def bulk_import_skills(input: SkillBulkImport):
+    """Import a skills sheet in one request.
+    Technologies are resolved from the master data cache; existing skills are matched case-insensitively,
+    and the unique (name, technology_id) index rejects any added concurrently."""
+    if len(input.rows) > BULK_IMPORT_MAX_ROWS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_IMPORT_MAX_ROWS} rows can be imported at once")
+    technologies = {t["name"].strip().lower(): t for t in await master_data_cache.documents("technologies")}
+    seen = {(s["name"].strip().lower(), s["technology_id"]): None for s in await master_data_cache.documents("skills")}
+    
+    results, inserts = [], []
+    for index, row in enumerate(input.rows):
+        name = row.name.strip()
+        technology = technologies.get(row.technology_name.strip().lower())
+        if not name:
+            results.append({"index": index, "status": "invalid", "detail": "Skill name is required"})
+            continue
+        if technology is None:
+            results.append({"index": index, "status": "invalid", "detail": f"Unknown technology '{row.technology_name}'"})
+            continue
+        key = (name.lower(), technology["id"])
+        if key in seen:
+            detail = "Skill already exists" if seen[key] is None else f"Same skill as row {seen[key]}"
+            results.append({"index": index, "status": "duplicate", "detail": detail})
+            continue
+        seen[key] = index
+        skill = Skill(name=name, technology_id=technology["id"], technology_name=technology["name"])
+        result = {"index": index, "status": "created", "id": skill.id}
+        results.append(result)
+        inserts.append((result, skill.model_dump()))
+    
+    if inserts:
+        try:
+            await db.skills.insert_many([doc for _, doc in inserts], ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                if error.get("code") != 11000:
+                    raise
+                result = inserts[error["index"]][0]
+                result.update(status="duplicate", detail="Skill was added by another import")
+                result.pop("id")
+        await bump_master_data_version("skills")
+    
+    return import_summary(results, ("created", "duplicate", "invalid"))
+
 @api_router.get("/skills", response_model=List[Skill])
-async def get_skills():
-    skills = await db.skills.find({}, {"_id": 0}).to_list(1000)
-    for skill in skills:
-        if isinstance(skill['created_at'], str):
-            skill['created_at'] = datetime.fromisoformat(skill['created_at'])
-    return skills
+async def get_skills(request: Request, response: Response):
+    return await master_data_response("skills", request, response)
 
 @api_router.delete("/skills/{skill_id}")
 async def delete_skill(skill_id: str):
@@ -979,6 +1402,7 @@ async def delete_skill(skill_id: str):
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Skill not found")
     await db.proficiency_rates.delete_many({"skill_id": skill_id})
+    await bump_master_data_version("skills", "proficiency_rates")
     return {"message": "Skill deleted successfully"}
 
 
@@ -986,11 +1410,9 @@ async def delete_skill(skill_id: str):
 @api_router.post("/proficiency-rates", response_model=ProficiencyRate)
 async def create_proficiency_rate(input: ProficiencyRateCreate):
     # Check for duplicate: Technology + Skill + Base Location + Proficiency Level
-    existing = await db.proficiency_rates.find_one({
-        "skill_id": input.skill_id,
-        "base_location_id": input.base_location_id,
-        "proficiency_level": input.proficiency_level
-    }, {"_id": 0})
+    existing = await master_data_cache.lookup(
+        "proficiency_rates", input.skill_id, input.base_location_id, input.proficiency_level
+    )
     if existing:
         raise HTTPException(
             status_code=400, 
@@ -999,69 +1421,300 @@ async def create_proficiency_rate(input: ProficiencyRateCreate):
     
     rate_obj = ProficiencyRate(**input.model_dump())
     doc = rate_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    await db.proficiency_rates.insert_one(doc)
+    try:
+        await db.proficiency_rates.insert_one(doc)
+    except DuplicateKeyError:
+        # Added concurrently since the cached check
+        raise HTTPException(
+            status_code=400,
+            detail="Rate already exists for this Skill, Location, and Proficiency Level combination"
+        )
+    await bump_master_data_version("proficiency_rates")
     return rate_obj
 
 @api_router.get("/proficiency-rates", response_model=List[ProficiencyRate])
-async def get_proficiency_rates():
-    rates = await db.proficiency_rates.find({}, {"_id": 0}).to_list(1000)
-    for rate in rates:
-        if isinstance(rate['created_at'], str):
-            rate['created_at'] = datetime.fromisoformat(rate['created_at'])
-    return rates
+async def get_proficiency_rates(request: Request, response: Response):
+    return await master_data_response("proficiency_rates", request, response)
 
 @api_router.delete("/proficiency-rates/{rate_id}")
 async def delete_proficiency_rate(rate_id: str):
     result = await db.proficiency_rates.delete_one({"id": rate_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Proficiency rate not found")
+    await bump_master_data_version("proficiency_rates")
     return {"message": "Proficiency rate deleted successfully"}
 
 @api_router.put("/proficiency-rates/{rate_id}")
-async def update_proficiency_rate(rate_id: str, avg_monthly_salary: float):
-    """Update only the salary of a proficiency rate"""
+async def update_proficiency_rate(rate_id: str, avg_monthly_salary: float, dry_run: bool = False):
+    """Update only the salary of a proficiency rate (with dry_run, preview the project impact instead)"""
     if avg_monthly_salary <= 0:
         raise HTTPException(status_code=400, detail="Salary must be positive")
     
+    if dry_run:
+        rate = await db.proficiency_rates.find_one({"id": rate_id}, {"_id": 0})
+        if not rate:
+            raise HTTPException(status_code=404, detail="Proficiency rate not found")
+        return {
+            "dry_run": True,
+            "rate": {**rate, "avg_monthly_salary": avg_monthly_salary},
+            "impact": await preview_rate_changes({rate_key(rate): avg_monthly_salary})
+        }
+    
     result = await db.proficiency_rates.update_one(
         {"id": rate_id},
         {"$set": {"avg_monthly_salary": avg_monthly_salary}}
     )
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Proficiency rate not found")
+    await bump_master_data_version("proficiency_rates")
     
     updated = await db.proficiency_rates.find_one({"id": rate_id}, {"_id": 0})
     return updated
 
 
+# Bulk proficiency rate import.
+# Rows are resolved against the cached skills and base locations. Repeated rows within the sheet
+# are caught in memory and rates that already exist with one $in query; all writes then go out
+# in a single unordered bulk_write. Each row gets a result: created, updated, duplicate or invalid.
+def rate_key(rate: dict) -> tuple:
+    return (rate["skill_id"], rate["base_location_id"], rate["proficiency_level"])
+
+
+async def plan_rate_import(rows: List[ProficiencyRateImportRow], update_existing: bool) -> List[dict]:
+    """Resolve and classify import rows; valid rows are planned as "create" or "update" """
+    skills = {
+        (s["name"].strip().lower(), (s.get("technology_name") or "").strip().lower()): s
+        for s in await master_data_cache.documents("skills")
+    }
+    locations = {l["name"].strip().lower(): l for l in await master_data_cache.documents("base_locations")}
+    
+    plan = []
+    first_row = {}
+    for index, row in enumerate(rows):
+        skill = skills.get((row.skill_name.strip().lower(), row.technology_name.strip().lower()))
+        location = locations.get(row.base_location_name.strip().lower())
+        level = row.proficiency_level.strip()
+        error = None
+        if skill is None:
+            error = f"Unknown skill '{row.skill_name}' for technology '{row.technology_name}'"
+        elif location is None:
+            error = f"Unknown base location '{row.base_location_name}'"
+        elif level not in PROFICIENCY_LEVELS:
+            error = f"Unknown proficiency level '{row.proficiency_level}'"
+        elif row.avg_monthly_salary is None or row.avg_monthly_salary <= 0:
+            error = "Salary must be positive"
+        if error:
+            plan.append({"index": index, "status": "invalid", "detail": error})
+            continue
+        
+        rate = ProficiencyRate(
+            skill_id=skill["id"], skill_name=skill["name"],
+            technology_id=skill["technology_id"], technology_name=skill["technology_name"],
+            base_location_id=location["id"], base_location_name=location["name"],
+            proficiency_level=level, avg_monthly_salary=row.avg_monthly_salary
+        ).model_dump()
+        key = rate_key(rate)
+        if key in first_row:
+            plan.append({"index": index, "status": "duplicate", "detail": f"Same rate as row {first_row[key]}"})
+            continue
+        first_row[key] = index
+        plan.append({"index": index, "status": "create", "rate": rate})
+    
+    planned = [p for p in plan if p["status"] == "create"]
+    if planned:
+        existing = await db.proficiency_rates.find(
+            {
+                "skill_id": {"$in": list({p["rate"]["skill_id"] for p in planned})},
+                "base_location_id": {"$in": list({p["rate"]["base_location_id"] for p in planned})}
+            },
+            {"_id": 0}
+        ).to_list(None)
+        existing = {rate_key(e): e for e in existing}
+        for p in planned:
+            current = existing.get(rate_key(p["rate"]))
+            if current is None:
+                continue
+            p["existing"] = current
+            if update_existing:
+                p["status"] = "update"
+            else:
+                p.update(status="duplicate", detail="Rate already exists")
+    return plan
+
+
+@api_router.post("/proficiency-rates/bulk")
+async def bulk_import_proficiency_rates(input: ProficiencyRateBulkImport):
+    """Import a rate card in one request (see Bulk proficiency rate import)"""
+    if len(input.rows) > BULK_IMPORT_MAX_ROWS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_IMPORT_MAX_ROWS} rows can be imported at once")
+    plan = await plan_rate_import(input.rows, input.update_existing)
+    
+    if input.dry_run:
+        salaries = {}
+        for p in plan:
+            if p["status"] == "create":
+                p["status"] = "created"
+            elif p["status"] == "update":
+                p.update(status="updated", id=p["existing"]["id"])
+            else:
+                continue
+            salaries[rate_key(p["rate"])] = p["rate"]["avg_monthly_salary"]
+        return {
+            **import_summary([import_result(p) for p in plan]),
+            "dry_run": True,
+            "impact": await preview_rate_changes(salaries)
+        }
+    
+    writes = [p for p in plan if p["status"] == "create"] + [p for p in plan if p["status"] == "update"]
+    operations = []
+    for p in writes:
+        if p["status"] == "create":
+            # Upsert on the rate key so a rate added concurrently is not duplicated
+            operations.append(UpdateOne(
+                {"skill_id": p["rate"]["skill_id"], "base_location_id": p["rate"]["base_location_id"],
+                 "proficiency_level": p["rate"]["proficiency_level"]},
+                {"$setOnInsert": p["rate"]},
+                upsert=True
+            ))
+        else:
+            operations.append(UpdateOne(
+                {"id": p["existing"]["id"]}, {"$set": {"avg_monthly_salary": p["rate"]["avg_monthly_salary"]}}
+            ))
+    if operations:
+        failed = set()
+        try:
+            result = await db.proficiency_rates.bulk_write(operations, ordered=False)
+            upserted = set(result.upserted_ids)
+        except BulkWriteError as e:
+            # Upserts racing another import on the same rate key hit the unique index
+            if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                raise
+            failed = {error["index"] for error in e.details["writeErrors"]}
+            upserted = {u["index"] for u in e.details.get("upserted", [])}
+        for position, p in enumerate(writes):
+            if position in failed:
+                p.update(status="duplicate", detail="Rate was added by another import")
+            elif p["status"] == "update":
+                p.update(status="updated", id=p["existing"]["id"])
+            elif position in upserted:
+                p.update(status="created", id=p["rate"]["id"])
+            else:
+                p.update(status="duplicate", detail="Rate was added by another import")
+        await bump_master_data_version("proficiency_rates")
+    
+    return import_summary([import_result(p) for p in plan])
+
+
+# Rate card impact preview.
+# Allocations keep the salary they were priced at, so a rate change moves a project's figures only
+# once it is re-priced. A dry run values that for every draft and in-review project using the changed
+# rates. Cost and price are linear in salary, so only the matching allocation rows are flattened into
+# arrays and their deltas aggregated per project with numpy; current figures come from summarize_projects.
+RATE_IMPACT_STATUSES = ["draft", "in_review"]
+RATE_IMPACT_METRICS = ["totalCost", "sellingPrice", "finalPrice"]
+
+
+def rate_change_impact(projects: List[dict], salaries: Dict[tuple, float], top: int) -> dict:
+    """Cost and price movement of projects if allocations on the given rate keys took the new salaries;
+    module-level so it can run in the process pool"""
+    margins = []
+    row_project, row_mm, row_old, row_new, row_overhead, row_nego = [], [], [], [], [], []
+    for p_index, project in enumerate(projects):
+        margins.append(project.get("profit_margin_percentage") or 35)
+        for wave in project.get("waves") or []:
+            for alloc in wave.get("grid_allocations") or []:
+                salary = salaries.get((alloc.get("skill_id"), alloc.get("base_location_id"), alloc.get("proficiency_level")))
+                if salary is None:
+                    continue
+                row_project.append(p_index)
+                row_mm.append(sum((v or 0) for v in (alloc.get("phase_allocations") or {}).values()))
+                row_old.append(alloc.get("avg_monthly_salary") or 0)
+                row_new.append(salary)
+                row_overhead.append(alloc.get("overhead_percentage") or 0)
+                row_nego.append(wave.get("nego_buffer_percentage") or 0)
+    
+    n_projects = len(projects)
+    row_project = np.asarray(row_project, dtype=np.int64)
+    margin = np.asarray(margins, dtype=float)[row_project] if n_projects else np.zeros(0)
+    
+    # Same row formulas as summarize_projects, applied to the salary difference
+    cost = (np.asarray(row_new, dtype=float) - np.asarray(row_old, dtype=float)) * np.asarray(row_mm, dtype=float)
+    cost = cost * (1 + np.asarray(row_overhead, dtype=float) / 100)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        selling = np.where(margin < 100, cost / (1 - margin / 100), cost)
+    final = selling * (1 + np.asarray(row_nego, dtype=float) / 100)
+    
+    def per_project(values):
+        return np.bincount(row_project, weights=values, minlength=n_projects)
+    
+    change = {"totalCost": per_project(cost), "sellingPrice": per_project(selling), "finalPrice": per_project(final)}
+    rows_affected = np.bincount(row_project, minlength=n_projects)
+    affected = np.flatnonzero(rows_affected)
+    
+    summaries = summarize_projects([projects[i] for i in affected])
+    current = {key: np.asarray([s["overall"][key] for s in summaries], dtype=float) for key in RATE_IMPACT_METRICS}
+    ranked = np.argsort(-np.abs(change["finalPrice"][affected]), kind="stable")[:top]
+    
+    return {
+        "projects_affected": int(len(affected)),
+        "allocations_affected": int(len(row_project)),
+        "change": {key: float(values.sum()) for key, values in change.items()},
+        "top_projects": [
+            {
+                "project_id": projects[affected[r]].get("id", ""),
+                "project_number": projects[affected[r]].get("project_number", ""),
+                "version": projects[affected[r]].get("version", 1),
+                "name": projects[affected[r]].get("name", ""),
+                "status": projects[affected[r]].get("status", ""),
+                "allocations_affected": int(rows_affected[affected[r]]),
+                "current": {key: float(current[key][r]) for key in RATE_IMPACT_METRICS},
+                "projected": {key: float(current[key][r] + change[key][affected[r]]) for key in RATE_IMPACT_METRICS},
+                "change": {key: float(change[key][affected[r]]) for key in RATE_IMPACT_METRICS},
+            }
+            for r in ranked
+        ],
+    }
+
+
+async def preview_rate_changes(salaries: Dict[tuple, float]) -> dict:
+    """Impact of new salaries (keyed by rate_key) on draft and in-review projects"""
+    projects = []
+    if salaries:
+        projects = await db.projects.find(
+            {
+                "status": {"$in": RATE_IMPACT_STATUSES},
+                "waves.grid_allocations.skill_id": {"$in": list({key[0] for key in salaries})}
+            },
+            {"_id": 0, "id": 1, "project_number": 1, "version": 1, "name": 1, "status": 1,
+             "profit_margin_percentage": 1, **WAVES_PROJECTION}
+        ).to_list(None)
+        await hydrate_projects(projects)
+    if len(projects) > VALUATION_INLINE_LIMIT:
+        return await run_in_process(rate_change_impact, projects, salaries, RATE_IMPACT_TOP_PROJECTS)
+    return rate_change_impact(projects, salaries, RATE_IMPACT_TOP_PROJECTS)
+
+
 # Sales Manager Routes
 @api_router.post("/sales-managers", response_model=SalesManager)
 async def create_sales_manager(input: SalesManagerCreate):
     manager_obj = SalesManager(**input.model_dump())
     doc = manager_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
     await db.sales_managers.insert_one(doc)
+    await bump_master_data_version("sales_managers")
     return manager_obj
 
 
 @api_router.get("/sales-managers", response_model=List[SalesManager])
-async def get_sales_managers(active_only: bool = False):
-    query = {"is_active": True} if active_only else {}
-    managers = await db.sales_managers.find(query, {"_id": 0}).to_list(1000)
-    for manager in managers:
-        if isinstance(manager.get('created_at'), str):
-            manager['created_at'] = datetime.fromisoformat(manager['created_at'])
-    return managers
+async def get_sales_managers(request: Request, response: Response, active_only: bool = False):
+    where = (lambda manager: manager.get("is_active") is True) if active_only else None
+    return await master_data_response("sales_managers", request, response, where)
 
 
 @api_router.get("/sales-managers/{manager_id}", response_model=SalesManager)
 async def get_sales_manager(manager_id: str):
-    manager = await db.sales_managers.find_one({"id": manager_id}, {"_id": 0})
+    manager = await master_data_cache.get("sales_managers", manager_id)
     if not manager:
         raise HTTPException(status_code=404, detail="Sales Manager not found")
-    if isinstance(manager.get('created_at'), str):
-        manager['created_at'] = datetime.fromisoformat(manager['created_at'])
     return manager
 
 
@@ -1074,10 +1727,9 @@ async def update_sales_manager(manager_id: str, input: SalesManagerUpdate):
     update_data = input.model_dump(exclude_unset=True)
     if update_data:
         await db.sales_managers.update_one({"id": manager_id}, {"$set": update_data})
+        await bump_master_data_version("sales_managers")
     
     updated = await db.sales_managers.find_one({"id": manager_id}, {"_id": 0})
-    if isinstance(updated.get('created_at'), str):
-        updated['created_at'] = datetime.fromisoformat(updated['created_at'])
     return updated
 
 
@@ -1086,17 +1738,366 @@ async def delete_sales_manager(manager_id: str):
     result = await db.sales_managers.delete_one({"id": manager_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Sales Manager not found")
+    await bump_master_data_version("sales_managers")
     return {"message": "Sales Manager deleted successfully"}
 
 
+# Project version storage.
+# The latest version of a project is always a full document in db.projects; superseded versions
+# live in db.project_history (see Project history below). When a version is superseded its
+# waves are replaced by a structural delta against the previous version (waves_delta/waves_base_id),
+# with a full snapshot kept every VERSION_SNAPSHOT_INTERVAL versions to bound the replay chain.
+# Superseded versions are read-only, so reconstructed waves can be cached by version id.
+WAVES_PROJECTION = {"waves": 1, "waves_delta": 1, "waves_base_id": 1, "waves_delta_depth": 1}
+
+
+class LRUCache:
+    """Small in-process least-recently-used cache"""
+    
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items = OrderedDict()
+    
+    def get(self, key):
+        if key not in self._items:
+            return None
+        self._items.move_to_end(key)
+        return self._items[key]
+    
+    def put(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+
+# Reconstructed waves of delta-stored versions, keyed by version id
+version_cache = LRUCache(VERSION_CACHE_SIZE)
+
+
+def is_keyed_list(value) -> bool:
+    """A list of dicts with unique non-empty ids (waves, grid allocations)"""
+    if not isinstance(value, list) or not all(isinstance(e, dict) and e.get("id") for e in value):
+        return False
+    return len({e["id"] for e in value}) == len(value)
+
+
+def diff_structure(old, new, path: list = None) -> List[dict]:
+    """Structural diff of two JSON-like values as a list of patch operations.
+    Dicts are diffed per key and id-keyed lists per element id, so a changed cell
+    produces one small operation instead of a copy of its wave."""
+    path = path or []
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = [{"op": "remove", "path": path + [key]} for key in old if key not in new]
+        for key, value in new.items():
+            if key in old:
+                ops.extend(diff_structure(old[key], value, path + [key]))
+            else:
+                ops.append({"op": "set", "path": path + [key], "value": value})
+        return ops
+    if is_keyed_list(old) and is_keyed_list(new):
+        old_by_id = {e["id"]: e for e in old}
+        ops = []
+        if [e["id"] for e in old] != [e["id"] for e in new]:
+            ops.append({
+                "op": "reorder",
+                "path": path,
+                "ids": [e["id"] for e in new],
+                "added": [e for e in new if e["id"] not in old_by_id]
+            })
+        for element in new:
+            if element["id"] in old_by_id:
+                ops.extend(diff_structure(old_by_id[element["id"]], element, path + [{"id": element["id"]}]))
+        return ops
+    return [{"op": "set", "path": path, "value": new}]
+
+
+def _patch_step(container, segment):
+    """Resolve one path segment: a dict key, or {"id": ...} for an element of a keyed list"""
+    if isinstance(segment, dict):
+        return next(e for e in container if e.get("id") == segment["id"])
+    return container[segment]
+
+
+def apply_structure_patch(value, ops: List[dict]):
+    """Apply operations produced by diff_structure; value is modified in place and returned"""
+    for op in ops:
+        path = op["path"]
+        if op["op"] == "set" and not path:
+            value = copy.deepcopy(op["value"])
+            continue
+        parent = value
+        for segment in path[:-1]:
+            parent = _patch_step(parent, segment)
+        if op["op"] == "set":
+            key = path[-1]
+            if isinstance(key, dict):
+                key = next(i for i, e in enumerate(parent) if e.get("id") == key["id"])
+            parent[key] = copy.deepcopy(op["value"])
+        elif op["op"] == "remove":
+            del parent[path[-1]]
+        elif op["op"] == "reorder":
+            target = _patch_step(parent, path[-1]) if path else value
+            by_id = {e["id"]: e for e in target}
+            by_id.update({e["id"]: copy.deepcopy(e) for e in op["added"]})
+            target[:] = [by_id[element_id] for element_id in op["ids"]]
+        else:
+            raise ValueError(f"Unknown patch operation: {op['op']}")
+    return value
+
+
+async def hydrate_projects(projects: List[dict]) -> List[dict]:
+    """Fill in the waves of delta-stored versions in place.
+    Missing ancestors are fetched one chain level at a time with a single query each."""
+    pending = [p for p in projects if p.get("waves_base_id")]
+    if not pending:
+        return projects
+    
+    known = {p["id"]: p for p in projects if p.get("id")}
+    frontier = {p["waves_base_id"] for p in pending}
+    while frontier:
+        missing = [i for i in frontier if i not in known and version_cache.get(i) is None]
+        if not missing:
+            break
+        docs = await db.project_history.find(
+            {"id": {"$in": missing}},
+            {"_id": 0, "id": 1, **WAVES_PROJECTION}
+        ).to_list(None)
+        known.update({d["id"]: d for d in docs})
+        frontier = {d["waves_base_id"] for d in docs if d.get("waves_base_id")}
+    
+    def resolve(version_id: str) -> list:
+        chain = []
+        current_id = version_id
+        while True:
+            cached = version_cache.get(current_id)
+            if cached is not None:
+                waves = copy.deepcopy(cached)
+                break
+            doc = known.get(current_id)
+            if doc is None:
+                raise RuntimeError(f"Base version {current_id} of a delta-stored project is missing")
+            if not doc.get("waves_base_id"):
+                waves = copy.deepcopy(doc.get("waves") or [])
+                break
+            chain.append(doc)
+            current_id = doc["waves_base_id"]
+        for doc in reversed(chain):
+            waves = apply_structure_patch(waves, doc["waves_delta"])
+            version_cache.put(doc["id"], copy.deepcopy(waves))
+        return waves
+    
+    for project in pending:
+        project["waves"] = resolve(project["id"])
+    for project in projects:
+        for field in ("waves_delta", "waves_base_id", "waves_delta_depth"):
+            project.pop(field, None)
+    return projects
+
+
+async def compact_superseded_version(project: dict) -> bool:
+    """Replace a superseded version's waves with a delta against the previous version.
+    Returns False when the version is kept in full (first version, snapshot, or no safe base)."""
+    if project.get("waves_base_id") or not project.get("project_number"):
+        return False
+    base = await db.project_history.find_one(
+        {"project_number": project["project_number"], "version": {"$lt": project.get("version", 1)}},
+        {"_id": 0, "id": 1, "is_latest_version": 1, **WAVES_PROJECTION},
+        sort=[("version", -1)]
+    )
+    # Only immutable (superseded) versions can serve as a base
+    if not base or base.get("is_latest_version") is not False:
+        return False
+    depth = base.get("waves_delta_depth", 0) + 1 if base.get("waves_base_id") else 1
+    if depth >= VERSION_SNAPSHOT_INTERVAL:
+        return False
+    
+    waves = project.get("waves") or []
+    base_waves = (await hydrate_projects([base]))[0]["waves"]
+    result = await db.project_history.update_one(
+        {"id": project["id"], "is_latest_version": False, "waves_base_id": None},
+        {
+            "$set": {"waves_delta": diff_structure(base_waves, waves), "waves_base_id": base["id"], "waves_delta_depth": depth},
+            "$unset": {"waves": ""}
+        }
+    )
+    if result.modified_count:
+        version_cache.put(project["id"], copy.deepcopy(waves))
+    return bool(result.modified_count)
+
+
+async def detach_version_dependents(project_id: str):
+    """Store versions whose delta is based on project_id in full, so it can be deleted or moved"""
+    dependents = await db.project_history.find(
+        {"waves_base_id": project_id},
+        {"_id": 0, "id": 1, **WAVES_PROJECTION}
+    ).to_list(None)
+    for dependent in await hydrate_projects(dependents):
+        await db.project_history.update_one(
+            {"id": dependent["id"]},
+            {"$set": {"waves": dependent["waves"]}, "$unset": {"waves_delta": "", "waves_base_id": "", "waves_delta_depth": ""}}
+        )
+
+
+# Project history.
+# db.projects holds only the working set: latest, unarchived versions and templates, so its queries
+# need no version/archive filters. Superseded versions and archived projects are moved, in the same
+# document shape, to db.project_history. Lookups by id or project number read through to it;
+# history documents are read-only apart from archive/unarchive.
+def is_history_document(project: dict) -> bool:
+    return project.get("is_latest_version") is False or bool(project.get("is_archived"))
+
+
+async def find_project(project_id: str, projection: Optional[dict] = None) -> Optional[dict]:
+    """Find a project version by id in the working set, falling back to history"""
+    projection = projection or {"_id": 0}
+    project = await db.projects.find_one({"id": project_id}, projection)
+    if project is None:
+        project = await db.project_history.find_one({"id": project_id}, projection)
+    return project
+
+
+async def find_all_versions(query: dict, projection: dict, limit: Optional[int] = None) -> List[dict]:
+    """Documents matching query in both the working set and history"""
+    results = []
+    for collection in (db.projects, db.project_history):
+        results += await collection.find(query, projection).to_list(limit)
+    return results
+
+
+async def move_project(project_id: str, source, target) -> bool:
+    """Move one project document between db.projects and db.project_history.
+    The copy is written before the original is removed, so an interrupted move leaves
+    a duplicate for the next move to resolve rather than losing the document."""
+    project = await source.find_one({"id": project_id}, {"_id": 0})
+    if not project:
+        return False
+    await target.replace_one({"id": project_id}, project, upsert=True)
+    await source.delete_one({"id": project_id})
+    return True
+
+
+async def move_history_documents() -> int:
+    """Move superseded versions and archived projects still in db.projects to history"""
+    stale = await db.projects.find(
+        {"$or": [{"is_latest_version": False}, {"is_archived": True}]}, {"_id": 0, "id": 1}
+    ).to_list(None)
+    moved = 0
+    for project in stale:
+        moved += await move_project(project["id"], db.projects, db.project_history)
+    return moved
+
+
+# Estimate content hashes.
+# Each project document stores a hash per wave (wave_hashes, in wave order) and a content_hash of
+# the whole estimate built from its fields and the wave hashes. Saves that change nothing skip the
+# write, saves that change some waves rewrite only those, and new versions identical to an
+# existing version are flagged. Workflow fields (status, approvals, version notes) are not content.
+ESTIMATE_HASH_FIELDS = [
+    "name", "customer_id", "customer_name", "project_location", "project_location_name",
+    "project_locations", "project_location_names", "technology_id", "technology_name",
+    "technology_ids", "technology_names", "project_type_id", "project_type_name",
+    "project_type_ids", "project_type_names", "description", "profit_margin_percentage",
+    "sales_manager_id", "sales_manager_name"
+]
+ESTIMATE_HASH_PROJECTION = {field: 1 for field in ESTIMATE_HASH_FIELDS}
+
+
+def _canonical(value):
+    """Normalize a JSON-like value so equal content encodes identically (1 and 1.0 hash the same)"""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def canonical_hash(value) -> str:
+    """Stable content hash of a JSON-like value (independent of dict key order and int/float spelling)"""
+    encoded = json.dumps(_canonical(value), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def estimate_content_hash(project: dict, wave_hashes: List[dict]) -> str:
+    return canonical_hash({
+        **{field: project.get(field) for field in ESTIMATE_HASH_FIELDS},
+        "waves": [w["hash"] for w in wave_hashes]
+    })
+
+
+def estimate_hashes(project: dict) -> dict:
+    """wave_hashes and content_hash of a project document with its waves"""
+    wave_hashes = [{"id": w.get("id", ""), "hash": canonical_hash(w)} for w in project.get("waves") or []]
+    return {"wave_hashes": wave_hashes, "content_hash": estimate_content_hash(project, wave_hashes)}
+
+
+def with_estimate_hashes(project_obj: Project) -> Project:
+    """Stamp the content hashes on a project model about to be inserted"""
+    return project_obj.model_copy(update=estimate_hashes(project_obj.model_dump()))
+
+
+# Fast response path for project reads.
+# Waves and allocations are also written positionally (apply_wave_update, upsert_allocation,
+# add_wave) and older documents predate fields added to the models since, so stored documents are
+# not guaranteed to match the Project model. Instead of validating every nested value, read
+# endpoints shape the document to the models: at the top level and in each wave and allocation,
+# missing fields get their default and unknown fields are dropped. Values are passed through as
+# stored. Endpoints opt in by returning fast_project_response; response_model still documents them.
+class FastJSONResponse(ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        # UTC datetimes as ...Z and naive ones as UTC, matching Pydantic's output
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+
+
+def shape_to_model(document: dict, model) -> dict:
+    """Fill a model's missing defaults into a stored document and drop unknown fields"""
+    shaped = {}
+    for name, field in model.model_fields.items():
+        if name in document:
+            shaped[name] = document[name]
+        elif not field.is_required():
+            shaped[name] = field.get_default(call_default_factory=True)
+    return shaped
+
+
+def project_response_document(project: dict) -> dict:
+    """A stored project document in the shape of the Project model"""
+    shaped = shape_to_model(project, Project)
+    shaped["waves"] = [
+        {
+            **shape_to_model(wave, ProjectWave),
+            "grid_allocations": [
+                shape_to_model(allocation, WaveGridAllocation)
+                for allocation in wave.get("grid_allocations") or []
+            ],
+        }
+        for wave in shaped.get("waves") or []
+    ]
+    return shaped
+
+
+def fast_project_response(projects) -> FastJSONResponse:
+    """Serialize one project document or a list of them without model validation"""
+    if isinstance(projects, list):
+        return FastJSONResponse([project_response_document(p) for p in projects])
+    return FastJSONResponse(project_response_document(projects))
+
+
 # Projects Routes
 async def generate_project_number():
     """Generate a unique project number like PRJ-0001"""
-    last_project = await db.projects.find_one(
-        {"project_number": {"$regex": "^PRJ-"}},
-        {"project_number": 1},
-        sort=[("project_number", -1)]
-    )
+    last_numbers = [
+        await collection.find_one({"project_number": {"$regex": "^PRJ-"}}, {"project_number": 1}, sort=[("project_number", -1)])
+        for collection in (db.projects, db.project_history)
+    ]
+    last_project = max((p for p in last_numbers if p), key=lambda p: p.get("project_number", ""), default=None)
     if last_project and last_project.get("project_number"):
         try:
             last_num = int(last_project["project_number"].split("-")[1])
@@ -1122,11 +2123,10 @@ async def create_project(input: ProjectCreate, user: dict = Depends(require_auth
         project_data["created_by_id"] = current_user.get("id", "")
         project_data["created_by_name"] = current_user.get("name", "")
         project_data["created_by_email"] = current_user.get("email", "")
-    project_obj = Project(**project_data)
+    project_obj = with_estimate_hashes(Project(**project_data))
     doc = project_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    doc['updated_at'] = doc['updated_at'].isoformat()
     await db.projects.insert_one(doc)
+    valuation_refresher.schedule([project_obj.id])
     
     # Create audit log for project creation
     if current_user:
@@ -1146,93 +2146,180 @@ async def create_project(input: ProjectCreate, user: dict = Depends(require_auth
 
 @api_router.get("/projects", response_model=List[Project])
 async def get_projects(latest_only: bool = True):
-    # Handle legacy data: show projects where is_latest_version is True OR not set
-    # Exclude archived projects
-    if latest_only:
-        query = {
-            "$and": [
-                {"$or": [{"is_latest_version": True}, {"is_latest_version": {"$exists": False}}]},
-                {"$or": [{"is_archived": False}, {"is_archived": {"$exists": False}}]}
-            ]
-        }
-    else:
-        query = {"$or": [{"is_archived": False}, {"is_archived": {"$exists": False}}]}
-    projects = await db.projects.find(query, {"_id": 0}).to_list(1000)
-    for project in projects:
-        if isinstance(project.get('created_at'), str):
-            project['created_at'] = datetime.fromisoformat(project['created_at'])
-        if isinstance(project.get('updated_at'), str):
-            project['updated_at'] = datetime.fromisoformat(project['updated_at'])
-    return projects
+    # The working set holds exactly the latest, unarchived versions; older versions come from history
+    projects = await db.projects.find({}, {"_id": 0}).to_list(1000)
+    if not latest_only:
+        projects += await db.project_history.find({"is_archived": False}, {"_id": 0}).to_list(1000)
+    await hydrate_projects(projects)
+    return fast_project_response(projects)
 
 
 @api_router.get("/projects/archived")
 async def get_archived_projects():
     """Get all archived projects"""
-    projects = await db.projects.find(
+    projects = await db.project_history.find(
         {"is_archived": True, "is_latest_version": True},
         {"_id": 0}
     ).sort("archived_at", -1).to_list(500)
     
-    for p in projects:
-        if isinstance(p.get('created_at'), str):
-            p['created_at'] = datetime.fromisoformat(p['created_at'])
-        if isinstance(p.get('updated_at'), str):
-            p['updated_at'] = datetime.fromisoformat(p['updated_at'])
-    return projects
+    return fast_project_response(projects)
 
 
 @api_router.get("/projects/{project_id}", response_model=Project)
-async def get_project(project_id: str):
-    project = await db.projects.find_one({"id": project_id}, {"_id": 0})
+async def get_project(project_id: str, request: Request):
+    current = await find_project(project_id, PROJECT_ETAG_PROJECTION)
+    if not current:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if if_none_match(request, projects_etag([current])):
+        return not_modified(projects_etag([current]))
+    project = await find_project(project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    if isinstance(project.get('created_at'), str):
-        project['created_at'] = datetime.fromisoformat(project['created_at'])
-    if isinstance(project.get('updated_at'), str):
-        project['updated_at'] = datetime.fromisoformat(project['updated_at'])
-    return project
+    await hydrate_projects([project])
+    response = fast_project_response(project)
+    response.headers.update(etag_headers(projects_etag([project])))
+    return response
 
 @api_router.get("/projects/{project_id}/versions", response_model=List[Project])
-async def get_project_versions(project_id: str):
-    """Get all versions of a project"""
-    project = await db.projects.find_one({"id": project_id}, {"_id": 0})
+async def get_project_versions(project_id: str, request: Request, include_waves: bool = True):
+    """Get all versions of a project (pass include_waves=false for just the version list)"""
+    project = await find_project(project_id, {"_id": 0, "project_number": 1})
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    # Find the root project number
+    # All versions share the project number; a project without one is its only version
     project_number = project.get("project_number", "")
-    if not project_number:
-        return [project]
-    
-    # Get all versions with same project number
-    versions = await db.projects.find(
-        {"project_number": project_number},
-        {"_id": 0}
-    ).sort("version", -1).to_list(100)
-    
-    for v in versions:
-        if isinstance(v.get('created_at'), str):
-            v['created_at'] = datetime.fromisoformat(v['created_at'])
-        if isinstance(v.get('updated_at'), str):
-            v['updated_at'] = datetime.fromisoformat(v['updated_at'])
-    return versions
+    query = {"project_number": project_number} if project_number else {"id": project_id}
+    etag = projects_etag(await find_all_versions(query, PROJECT_ETAG_PROJECTION, 100))
+    if if_none_match(request, etag):
+        return not_modified(etag)
+    
+    projection = {"_id": 0} if include_waves else {"_id": 0, **{field: 0 for field in WAVES_PROJECTION}}
+    versions = await find_all_versions(query, projection, 100)
+    versions = sorted(versions, key=lambda v: v.get("version", 1), reverse=True)[:100]
+    await hydrate_projects(versions)
+    
+    response = fast_project_response(versions)
+    response.headers.update(etag_headers(projects_etag(versions)))
+    return response
+
+def revision_filter(expected_revision: Optional[int]) -> dict:
+    """Filter clause matching an editable (latest, unarchived) project at the given revision.
+    Until this worker has seen the project field backfill applied, legacy documents may lack
+    the flags and the revision, so missing fields are tolerated instead of failing as a conflict."""
+    if schema_state["version"] >= PROJECT_FIELDS_MIGRATION:
+        editable = {"is_latest_version": True, "is_archived": False}
+        revision = expected_revision
+    else:
+        editable = {"is_latest_version": {"$ne": False}, "is_archived": {"$ne": True}}
+        revision = {"$in": [0, None]} if expected_revision == 0 else expected_revision
+    if expected_revision is None:
+        return editable
+    return {**editable, "revision": revision}
+
+
+async def raise_revision_conflict(project_id: str, expected_revision: Optional[int]):
+    """Raise 404 if the project is gone, otherwise 409 because it was superseded, archived or its revision moved on"""
+    current = await find_project(project_id, {"_id": 0, "revision": 1, "is_latest_version": 1, "is_archived": 1})
+    if not current:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if current.get("is_latest_version") is False:
+        raise HTTPException(status_code=409, detail="Superseded project versions are read-only")
+    if current.get("is_archived"):
+        raise HTTPException(status_code=409, detail="Archived projects are read-only")
+    raise HTTPException(
+        status_code=409,
+        detail=f"Project was modified by someone else (expected revision {expected_revision}, current revision {current.get('revision', 0)})"
+    )
+
 
 @api_router.put("/projects/{project_id}", response_model=Project)
 async def update_project(project_id: str, input: ProjectUpdate, user: dict = Depends(get_current_user)):
-    existing = await db.projects.find_one({"id": project_id}, {"_id": 0})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
     update_data = input.model_dump(exclude_unset=True)
-    update_data['updated_at'] = datetime.now(timezone.utc).isoformat()
+    expected_revision = update_data.pop("revision", None)
+    if update_data.get("waves") is not None:
+        try:
+            update_data["waves"] = [ProjectWave(**wave).model_dump() for wave in update_data["waves"]]
+        except ValidationError:
+            raise HTTPException(status_code=400, detail="Invalid wave data")
+    
+    if expected_revision is None:
+        # No precondition: one conditional write. Its pre-image feeds the audit log and the hashes,
+        # which are cleared by the write and restored unless a later write has moved the revision on.
+        update_data['updated_at'] = datetime.now(timezone.utc)
+        existing = await db.projects.find_one_and_update(
+            {"id": project_id, **revision_filter(None)},
+            {"$set": update_data, "$inc": {"revision": 1}, "$unset": {"content_hash": "", "wave_hashes": ""}},
+            projection={"_id": 0},
+            return_document=ReturnDocument.BEFORE
+        )
+        if not existing:
+            await raise_revision_conflict(project_id, None)
+        updated = {**existing, **update_data, "revision": existing.get("revision", 0) + 1}
+        hashes = estimate_hashes(updated)
+        await db.projects.update_one(
+            {"id": project_id, "revision": updated["revision"], "content_hash": {"$exists": False}},
+            {"$set": hashes}
+        )
+        updated.update(hashes)
+    else:
+        # Read at the expected revision, then write conditionally on it. The content hash covers
+        # fields the request may not send, so the read is needed to hash what will be stored and
+        # to skip no-op saves and unchanged waves. Stored waves are only read when the request
+        # does not replace them (the response needs them) or the document predates hashing.
+        projection = {"_id": 0, "waves_delta": 0}
+        if update_data.get("waves") is not None:
+            projection["waves"] = 0
+        current = await db.projects.find_one({"id": project_id}, projection)
+        if not current or is_history_document(current) or current.get("revision", 0) != expected_revision:
+            await raise_revision_conflict(project_id, expected_revision)
+        if not current.get("content_hash"):
+            # Saved before content hashing: hash it from its waves once
+            if "waves" not in current:
+                stored = await db.projects.find_one({"id": project_id}, {"_id": 0, "waves": 1})
+                current["waves"] = (stored or {}).get("waves") or []
+            current.update(estimate_hashes(current))
+        
+        wave_hashes = current.get("wave_hashes") or []
+        changes_to_write = dict(update_data)
+        if update_data.get("waves") is not None:
+            new_wave_hashes = [{"id": w["id"], "hash": canonical_hash(w)} for w in update_data["waves"]]
+            if [w["id"] for w in new_wave_hashes] == [w.get("id") for w in wave_hashes]:
+                # Same waves in the same order: rewrite only the waves whose content changed
+                changes_to_write.pop("waves")
+                for index, (old, new) in enumerate(zip(wave_hashes, new_wave_hashes)):
+                    if old.get("hash") != new["hash"]:
+                        changes_to_write[f"waves.{index}"] = update_data["waves"][index]
+            wave_hashes = new_wave_hashes
+        content_hash = estimate_content_hash({**current, **update_data}, wave_hashes)
+        
+        if content_hash == current["content_hash"] and all(
+            current.get(key) == value for key, value in update_data.items()
+            if key not in ESTIMATE_HASH_FIELDS and key != "waves"
+        ):
+            # Nothing changed: skip the write, the audit log and the valuation refresh
+            return {**current, **update_data}
+        
+        update_data['updated_at'] = datetime.now(timezone.utc)
+        changes_to_write.update(updated_at=update_data['updated_at'], content_hash=content_hash, wave_hashes=wave_hashes)
+        # The document read is the pre-image of this write, so the hashes describe exactly what is stored
+        result = await db.projects.update_one(
+            {"id": project_id, **revision_filter(expected_revision)},
+            {"$set": changes_to_write, "$inc": {"revision": 1}}
+        )
+        if result.matched_count == 0:
+            await raise_revision_conflict(project_id, expected_revision)
+        existing = current
+        updated = {
+            **current, **update_data, "content_hash": content_hash, "wave_hashes": wave_hashes,
+            "revision": expected_revision + 1
+        }
+    valuation_refresher.schedule([project_id])
     
     # Detect changes for audit log
     fields_to_track = ["name", "description", "status", "profit_margin_percentage", "customer_id", "customer_name", "version_notes"]
     changes = detect_changes(existing, update_data, fields_to_track)
     
-    await db.projects.update_one({"id": project_id}, {"$set": update_data})
-    
     # Create audit log for update
     current_user = await db.users.find_one({"id": user["user_id"]}, {"_id": 0})
     if current_user and changes:
@@ -1248,29 +2335,25 @@ async def update_project(project_id: str, input: ProjectUpdate, user: dict = Dep
             changes=changes
         )
     
-    updated = await db.projects.find_one({"id": project_id}, {"_id": 0})
-    if isinstance(updated.get('created_at'), str):
-        updated['created_at'] = datetime.fromisoformat(updated['created_at'])
-    if isinstance(updated.get('updated_at'), str):
-        updated['updated_at'] = datetime.fromisoformat(updated['updated_at'])
     return updated
 
 
 @api_router.post("/projects/{project_id}/archive")
 async def archive_project(project_id: str, user: dict = Depends(get_current_user)):
-    """Archive a project"""
-    existing = await db.projects.find_one({"id": project_id}, {"_id": 0})
+    """Archive a project (moving it out of the working set)"""
+    existing = await find_project(project_id)
     if not existing:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    await db.projects.update_one(
-        {"id": project_id},
-        {"$set": {
-            "is_archived": True,
-            "archived_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        }}
-    )
+    archived = {
+        "is_archived": True,
+        "archived_at": datetime.now(timezone.utc),
+        "updated_at": datetime.now(timezone.utc)
+    }
+    # Flag first so in-place writes stop matching, then move to history
+    await db.projects.update_one({"id": project_id}, {"$set": archived})
+    await move_project(project_id, db.projects, db.project_history)
+    await db.project_history.update_one({"id": project_id}, {"$set": archived})
     
     # Create audit log
     current_user = await db.users.find_one({"id": user["user_id"]}, {"_id": 0})
@@ -1291,19 +2374,21 @@ async def archive_project(project_id: str, user: dict = Depends(get_current_user
 
 @api_router.post("/projects/{project_id}/unarchive")
 async def unarchive_project(project_id: str, user: dict = Depends(get_current_user)):
-    """Unarchive a project"""
-    existing = await db.projects.find_one({"id": project_id}, {"_id": 0})
+    """Unarchive a project (the latest version returns to the working set)"""
+    existing = await find_project(project_id)
     if not existing:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    await db.projects.update_one(
+    await db.project_history.update_one(
         {"id": project_id},
         {"$set": {
             "is_archived": False,
             "archived_at": None,
-            "updated_at": datetime.now(timezone.utc).isoformat()
+            "updated_at": datetime.now(timezone.utc)
         }}
     )
+    if existing.get("is_latest_version") is not False:
+        await move_project(project_id, db.project_history, db.projects)
     
     # Create audit log
     current_user = await db.users.find_one({"id": user["user_id"]}, {"_id": 0})
@@ -1325,29 +2410,29 @@ async def unarchive_project(project_id: str, user: dict = Depends(get_current_us
 @api_router.post("/projects/{project_id}/new-version", response_model=Project)
 async def create_new_version(project_id: str, input: ProjectUpdate, user: dict = Depends(get_current_user)):
     """Create a new version of an existing project"""
-    existing = await db.projects.find_one({"id": project_id}, {"_id": 0})
+    existing = await find_project(project_id)
     if not existing:
         raise HTTPException(status_code=404, detail="Project not found")
+    was_delta_stored = bool(existing.get("waves_base_id"))
+    await hydrate_projects([existing])
     
-    # Mark current as not latest
+    # Mark current as not latest (bumping the revision so pending saves to it conflict)
     await db.projects.update_one(
         {"id": project_id},
-        {"$set": {"is_latest_version": False, "updated_at": datetime.now(timezone.utc).isoformat()}}
+        {"$set": {"is_latest_version": False, "updated_at": datetime.now(timezone.utc)}, "$inc": {"revision": 1}}
     )
     
     # Get current max version for this project number
     project_number = existing.get("project_number", "")
-    max_version = await db.projects.find_one(
-        {"project_number": project_number},
-        {"version": 1},
-        sort=[("version", -1)]
-    )
-    new_version = (max_version.get("version", 1) if max_version else 1) + 1
+    versions = await find_all_versions({"project_number": project_number}, {"_id": 0, "version": 1})
+    new_version = max((v.get("version", 1) for v in versions), default=1) + 1
     
     # Create new version
     new_project_data = {**existing}
     new_project_data["id"] = str(uuid.uuid4())
     new_project_data["version"] = new_version
+    new_project_data["revision"] = 0
+    new_project_data["duplicate_of_version"] = None
     new_project_data["is_latest_version"] = True
     new_project_data["parent_project_id"] = project_id
     new_project_data["created_at"] = datetime.now(timezone.utc)
@@ -1368,17 +2453,32 @@ async def create_new_version(project_id: str, input: ProjectUpdate, user: dict =
     update_data.pop("approval_comments", None)
     update_data.pop("submitted_at", None)
     update_data.pop("approved_at", None)
+    update_data.pop("revision", None)
     
     for key, value in update_data.items():
         if value is not None:
             new_project_data[key] = value
     
-    project_obj = Project(**new_project_data)
+    project_obj = with_estimate_hashes(Project(**new_project_data))
+    duplicates = await find_all_versions(
+        {"project_number": project_number, "content_hash": project_obj.content_hash},
+        {"_id": 0, "version": 1}
+    )
+    if duplicates:
+        project_obj.duplicate_of_version = max(d.get("version", 1) for d in duplicates)
     doc = project_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    doc['updated_at'] = doc['updated_at'].isoformat()
     await db.projects.insert_one(doc)
     
+    valuation_refresher.schedule([project_obj.id])
+    
+    # The superseded version moves to history, keeping only a delta of its waves
+    await move_project(project_id, db.projects, db.project_history)
+    if not was_delta_stored:
+        try:
+            await compact_superseded_version({**existing, "is_latest_version": False})
+        except Exception as e:
+            logger.error(f"Failed to compact superseded version {project_id}: {e}")
+    
     # Create audit log for new version
     current_user = await db.users.find_one({"id": user["user_id"]}, {"_id": 0})
     if current_user:
@@ -1394,7 +2494,8 @@ async def create_new_version(project_id: str, input: ProjectUpdate, user: dict =
             metadata={
                 "new_version": new_version,
                 "previous_version": existing.get("version", 1),
-                "version_notes": update_data.get("version_notes", "")
+                "version_notes": update_data.get("version_notes", ""),
+                "duplicate_of_version": project_obj.duplicate_of_version
             }
         )
     
@@ -1403,9 +2504,10 @@ async def create_new_version(project_id: str, input: ProjectUpdate, user: dict =
 @api_router.post("/projects/{project_id}/clone", response_model=Project)
 async def clone_project(project_id: str, user: dict = Depends(require_auth)):
     """Clone a project as a new project with new project number"""
-    existing = await db.projects.find_one({"id": project_id}, {"_id": 0})
+    existing = await find_project(project_id)
     if not existing:
         raise HTTPException(status_code=404, detail="Project not found")
+    await hydrate_projects([existing])
     
     # Generate new project number
     new_project_number = await generate_project_number()
@@ -1418,6 +2520,8 @@ async def clone_project(project_id: str, user: dict = Depends(require_auth)):
     cloned_data["id"] = str(uuid.uuid4())
     cloned_data["project_number"] = new_project_number
     cloned_data["version"] = 1
+    cloned_data["revision"] = 0
+    cloned_data["duplicate_of_version"] = None
     cloned_data["is_latest_version"] = True
     cloned_data["parent_project_id"] = ""
     cloned_data["name"] = f"{existing.get('name', 'Project')} (Copy)"
@@ -1434,11 +2538,10 @@ async def clone_project(project_id: str, user: dict = Depends(require_auth)):
         cloned_data["created_by_name"] = current_user.get("name", "")
         cloned_data["created_by_email"] = current_user.get("email", "")
     
-    project_obj = Project(**cloned_data)
+    project_obj = with_estimate_hashes(Project(**cloned_data))
     doc = project_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    doc['updated_at'] = doc['updated_at'].isoformat()
     await db.projects.insert_one(doc)
+    valuation_refresher.schedule([project_obj.id])
     
     # Create audit log for clone
     if current_user:
@@ -1462,13 +2565,18 @@ async def clone_project(project_id: str, user: dict = Depends(require_auth)):
 
 @api_router.delete("/projects/{project_id}")
 async def delete_project(project_id: str, user: dict = Depends(get_current_user)):
-    existing = await db.projects.find_one({"id": project_id}, {"_id": 0})
+    existing = await find_project(project_id)
     if not existing:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    result = await db.projects.delete_one({"id": project_id})
-    if result.deleted_count == 0:
+    # Later versions stored as deltas against this one need their waves in full first
+    await detach_version_dependents(project_id)
+    deleted = 0
+    for collection in (db.projects, db.project_history):
+        deleted += (await collection.delete_one({"id": project_id})).deleted_count
+    if deleted == 0:
         raise HTTPException(status_code=404, detail="Project not found")
+    valuation_refresher.schedule([project_id])
     
     # Create audit log for delete
     current_user = await db.users.find_one({"id": user["user_id"]}, {"_id": 0})
@@ -1487,20 +2595,356 @@ async def delete_project(project_id: str, user: dict = Depends(get_current_user)
     return {"message": "Project deleted successfully"}
 
 
+# Wave and allocation endpoints - update one part of a project in place.
+# Pass ?revision=<n> to make the write conditional on the project's current revision.
+PHASE_KEY_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+async def apply_wave_update(
+    project_id: str, filter_extra: dict, update: dict,
+    array_filters: List[dict] = None, expected_revision: Optional[int] = None
+):
+    """Apply a positional update to a project, bump updated_at and the revision.
+    Returns (new revision or None if nothing matched, updated_at)."""
+    now = datetime.now(timezone.utc)
+    update.setdefault("$set", {})["updated_at"] = now
+    update["$inc"] = {"revision": 1}
+    # The hashes cannot be computed inside the positional write, so it clears them: a write that
+    # lands before the re-hash below finds no hash and hashes the stored waves itself
+    update.setdefault("$unset", {}).update(content_hash="", wave_hashes="")
+    updated = await db.projects.find_one_and_update(
+        {"id": project_id, **revision_filter(expected_revision), **filter_extra},
+        update,
+        projection={"_id": 0, "revision": 1, "waves": 1, **ESTIMATE_HASH_PROJECTION},
+        array_filters=array_filters,
+        return_document=ReturnDocument.AFTER
+    )
+    if not updated:
+        return None, now
+    # Re-hash the updated content unless a later write has already moved the revision on
+    await db.projects.update_one(
+        {"id": project_id, "revision": updated["revision"], "content_hash": {"$exists": False}},
+        {"$set": estimate_hashes(updated)}
+    )
+    valuation_refresher.schedule([project_id])
+    return updated["revision"], now
+
+
+async def raise_wave_not_found(project_id: str, wave_id: str, expected_revision: Optional[int] = None):
+    """Raise a 404 naming the part of the path (project, wave or allocation) that is missing,
+    or a 409 if the project moved past the expected revision"""
+    project = await db.projects.find_one(
+        {"id": project_id}, {"_id": 0, "waves.id": 1, "revision": 1, "is_latest_version": 1, "is_archived": 1}
+    )
+    if not project or is_history_document(project) or (
+        expected_revision is not None and project.get("revision", 0) != expected_revision
+    ):
+        await raise_revision_conflict(project_id, expected_revision)
+    if not any(w.get("id") == wave_id for w in project.get("waves", [])):
+        raise HTTPException(status_code=404, detail="Wave not found")
+    raise HTTPException(status_code=404, detail="Allocation not found")
+
+
+@api_router.post("/projects/{project_id}/waves")
+async def add_wave(project_id: str, input: ProjectWave, revision: Optional[int] = None, user: dict = Depends(require_auth)):
+    """Append a wave to a project (409 if the project already has a wave with this id)"""
+    wave = input.model_dump()
+    new_revision, updated_at = await apply_wave_update(
+        project_id, {"waves.id": {"$ne": wave["id"]}}, {"$push": {"waves": wave}}, expected_revision=revision
+    )
+    if new_revision is None:
+        existing = await db.projects.find_one(
+            {"id": project_id, **revision_filter(revision), "waves.id": wave["id"]}, {"_id": 1}
+        )
+        if existing:
+            raise HTTPException(status_code=409, detail="Wave already exists")
+        await raise_revision_conflict(project_id, revision)
+    return {"message": "Wave added", "wave": wave, "updated_at": updated_at, "revision": new_revision}
+
+
+@api_router.patch("/projects/{project_id}/waves/{wave_id}")
+async def update_wave(project_id: str, wave_id: str, input: WaveUpdate, revision: Optional[int] = None, user: dict = Depends(require_auth)):
+    """Update wave settings (name, duration, phases, logistics, nego buffer)"""
+    fields = input.model_dump(exclude_unset=True)
+    if not fields:
+        raise HTTPException(status_code=400, detail="No fields to update")
+    new_revision, updated_at = await apply_wave_update(
+        project_id,
+        {"waves.id": wave_id},
+        {"$set": {f"waves.$[w].{field}": value for field, value in fields.items()}},
+        [{"w.id": wave_id}],
+        expected_revision=revision
+    )
+    if new_revision is None:
+        await raise_wave_not_found(project_id, wave_id, revision)
+    return {"message": "Wave updated", "updated_at": updated_at, "revision": new_revision}
+
+
+@api_router.delete("/projects/{project_id}/waves/{wave_id}")
+async def delete_wave(project_id: str, wave_id: str, revision: Optional[int] = None, user: dict = Depends(require_auth)):
+    new_revision, updated_at = await apply_wave_update(
+        project_id,
+        {"waves.id": wave_id},
+        {"$pull": {"waves": {"id": wave_id}}},
+        expected_revision=revision
+    )
+    if new_revision is None:
+        await raise_wave_not_found(project_id, wave_id, revision)
+    return {"message": "Wave deleted", "updated_at": updated_at, "revision": new_revision}
+
+
+@api_router.put("/projects/{project_id}/waves/{wave_id}/allocations/{allocation_id}")
+async def upsert_allocation(
+    project_id: str, wave_id: str, allocation_id: str,
+    input: WaveGridAllocation, revision: Optional[int] = None, user: dict = Depends(require_auth)
+):
+    """Replace an allocation row, or append it to the wave if it does not exist yet"""
+    allocation = {**input.model_dump(), "id": allocation_id}
+    for _ in range(2):
+        new_revision, updated_at = await apply_wave_update(
+            project_id,
+            {"waves": {"$elemMatch": {"id": wave_id, "grid_allocations.id": allocation_id}}},
+            {"$set": {"waves.$[w].grid_allocations.$[a]": allocation}},
+            [{"w.id": wave_id}, {"a.id": allocation_id}],
+            expected_revision=revision
+        )
+        if new_revision is not None:
+            return {"message": "Allocation updated", "allocation": allocation, "updated_at": updated_at, "revision": new_revision}
+        
+        # Append only while the wave still lacks the row; if a concurrent PUT added it first, replace it instead
+        new_revision, updated_at = await apply_wave_update(
+            project_id,
+            {"waves": {"$elemMatch": {"id": wave_id, "grid_allocations.id": {"$ne": allocation_id}}}},
+            {"$push": {"waves.$[w].grid_allocations": allocation}},
+            [{"w.id": wave_id}],
+            expected_revision=revision
+        )
+        if new_revision is not None:
+            return {"message": "Allocation added", "allocation": allocation, "updated_at": updated_at, "revision": new_revision}
+    await raise_wave_not_found(project_id, wave_id, revision)
+
+
+@api_router.delete("/projects/{project_id}/waves/{wave_id}/allocations/{allocation_id}")
+async def delete_allocation(project_id: str, wave_id: str, allocation_id: str, revision: Optional[int] = None, user: dict = Depends(require_auth)):
+    new_revision, updated_at = await apply_wave_update(
+        project_id,
+        {"waves": {"$elemMatch": {"id": wave_id, "grid_allocations.id": allocation_id}}},
+        {"$pull": {"waves.$[w].grid_allocations": {"id": allocation_id}}},
+        [{"w.id": wave_id}],
+        expected_revision=revision
+    )
+    if new_revision is None:
+        await raise_wave_not_found(project_id, wave_id, revision)
+    return {"message": "Allocation deleted", "updated_at": updated_at, "revision": new_revision}
+
+
+@api_router.put("/projects/{project_id}/waves/{wave_id}/allocations/{allocation_id}/phases/{phase_key}")
+async def set_phase_allocation(
+    project_id: str, wave_id: str, allocation_id: str, phase_key: str,
+    input: PhaseAllocationUpdate, revision: Optional[int] = None, user: dict = Depends(require_auth)
+):
+    """Set the man-months of a single phase (grid cell) of an allocation row"""
+    if not PHASE_KEY_PATTERN.match(phase_key):
+        raise HTTPException(status_code=400, detail="Invalid phase key")
+    new_revision, updated_at = await apply_wave_update(
+        project_id,
+        {"waves": {"$elemMatch": {"id": wave_id, "grid_allocations.id": allocation_id}}},
+        {"$set": {f"waves.$[w].grid_allocations.$[a].phase_allocations.{phase_key}": input.value}},
+        [{"w.id": wave_id}, {"a.id": allocation_id}],
+        expected_revision=revision
+    )
+    if new_revision is None:
+        await raise_wave_not_found(project_id, wave_id, revision)
+    return {"message": "Phase allocation updated", "updated_at": updated_at, "revision": new_revision}
+
+
+# Estimator autosave - apply an ordered batch of grid operations in one atomic write
+SYNC_ROW_FIELDS = set(WaveGridAllocation.model_fields) - {"id", "phase_allocations"}
+
+
+def apply_sync_operation(waves: List[dict], operation: SyncOperation) -> Optional[str]:
+    """Apply one grid operation to the waves in place.
+    Returns None when applied, or the reason it was dropped (its target no longer exists).
+    Raises HTTPException(400) for malformed operations."""
+    wave = next((w for w in waves if w.get("id") == operation.wave_id), None)
+    if wave is None:
+        return "wave not found"
+    rows = wave.setdefault("grid_allocations", [])
+    
+    if operation.op == "set_cell":
+        row = next((a for a in rows if a.get("id") == operation.allocation_id), None)
+        if row is None:
+            return "allocation not found"
+        if operation.phase_key is not None:
+            if not PHASE_KEY_PATTERN.match(operation.phase_key):
+                raise HTTPException(status_code=400, detail=f"Invalid phase key: {operation.phase_key}")
+            try:
+                value = TypeAdapter(float).validate_python(operation.value)
+            except ValidationError:
+                raise HTTPException(status_code=400, detail="Phase allocation value must be a number")
+            row.setdefault("phase_allocations", {})[operation.phase_key] = value
+        elif operation.field in SYNC_ROW_FIELDS:
+            annotation = WaveGridAllocation.model_fields[operation.field].annotation
+            try:
+                row[operation.field] = TypeAdapter(annotation).validate_python(operation.value)
+            except ValidationError:
+                raise HTTPException(status_code=400, detail=f"Invalid value for {operation.field}")
+        else:
+            raise HTTPException(status_code=400, detail=f"Unknown allocation field: {operation.field}")
+    
+    elif operation.op == "insert_row":
+        try:
+            allocation = WaveGridAllocation(**(operation.allocation or {})).model_dump()
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid allocation: {e.errors()[0]['msg']}")
+        if not allocation["id"]:
+            allocation["id"] = str(uuid.uuid4())
+        # Re-sent inserts (e.g. a retried autosave) replace the existing row instead of duplicating it
+        rows[:] = [a for a in rows if a.get("id") != allocation["id"]]
+        rows.insert(operation.index if operation.index is not None else len(rows), allocation)
+    
+    elif operation.op == "delete_row":
+        remaining = [a for a in rows if a.get("id") != operation.allocation_id]
+        if len(remaining) == len(rows):
+            return "allocation not found"
+        rows[:] = remaining
+    
+    elif operation.op == "rename_wave":
+        if not operation.name:
+            raise HTTPException(status_code=400, detail="Wave name is required")
+        wave["name"] = operation.name
+    
+    elif operation.op == "set_logistics":
+        if not operation.logistics_config:
+            raise HTTPException(status_code=400, detail="logistics_config is required")
+        wave["logistics_config"] = {**(wave.get("logistics_config") or {}), **operation.logistics_config}
+    
+    else:
+        raise HTTPException(status_code=400, detail=f"Unknown operation: {operation.op}")
+    return None
+
+
+@api_router.post("/projects/{project_id}/sync")
+async def sync_project(project_id: str, input: ProjectSyncRequest, user: dict = Depends(require_auth)):
+    """Apply an ordered batch of estimator grid operations made since base_revision.
+    
+    Operations are applied in order to the current server state and written atomically
+    with a revision compare-and-swap. If other changes landed after base_revision the
+    batch is rebased onto them: operations whose target was removed are dropped and the
+    merged waves are returned so the client can adopt them.
+    """
+    if len(input.operations) > SYNC_MAX_OPERATIONS:
+        raise HTTPException(status_code=400, detail=f"At most {SYNC_MAX_OPERATIONS} operations per sync")
+    
+    for _ in range(SYNC_MAX_ATTEMPTS):
+        project = await db.projects.find_one(
+            {"id": project_id},
+            {"_id": 0, "waves": 1, "revision": 1, "is_latest_version": 1, "is_archived": 1, "content_hash": 1,
+             "status": 1, **ESTIMATE_HASH_PROJECTION}
+        )
+        if not project or is_history_document(project):
+            await raise_revision_conflict(project_id, None)
+        if project.get("status") in ("in_review", "approved"):
+            # Submitted while the editor was still autosaving; the estimator shows these read-only
+            raise HTTPException(status_code=409, detail=f"Project is {project['status']} and read-only")
+        current_revision = project.get("revision", 0)
+        if input.base_revision > current_revision:
+            raise HTTPException(status_code=409, detail=f"Unknown base revision {input.base_revision}")
+        rebased = current_revision != input.base_revision
+        
+        if not input.operations:
+            return {"revision": current_revision, "applied": 0, "dropped": [], "rebased": rebased,
+                    "waves": project.get("waves", []) if rebased else None}
+        
+        waves = project.get("waves", [])
+        dropped = []
+        for index, operation in enumerate(input.operations):
+            reason = apply_sync_operation(waves, operation)
+            if reason:
+                dropped.append({"index": index, "op": operation.op, "reason": reason})
+        
+        hashes = estimate_hashes({**project, "waves": waves})
+        if hashes["content_hash"] == project.get("content_hash"):
+            # The operations left the estimate as it was; nothing to write
+            return {"revision": current_revision, "applied": len(input.operations) - len(dropped), "dropped": dropped,
+                    "rebased": rebased, "updated_at": None, "waves": waves if rebased else None}
+        
+        now = datetime.now(timezone.utc)
+        updated = await db.projects.find_one_and_update(
+            {"id": project_id, **revision_filter(current_revision)},
+            {"$set": {"waves": waves, "updated_at": now, **hashes}, "$inc": {"revision": 1}},
+            projection={"_id": 0, "revision": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if updated:
+            valuation_refresher.schedule([project_id])
+            return {
+                "revision": updated["revision"],
+                "applied": len(input.operations) - len(dropped),
+                "dropped": dropped,
+                "rebased": rebased,
+                "updated_at": now,
+                "waves": waves if rebased else None
+            }
+        # Another write landed between the read and the compare-and-swap; rebase again
+    
+    raise HTTPException(status_code=409, detail="Project is being modified concurrently, please retry")
+
+
+# Estimator bootstrap
+async def load_project_for_response(project_id: str) -> Optional[dict]:
+    project = await find_project(project_id)
+    if not project:
+        return None
+    await hydrate_projects([project])
+    return project_response_document(project)
+
+
+@api_router.get("/estimator/bootstrap")
+async def get_estimator_bootstrap(project_id: Optional[str] = None, user: dict = Depends(get_current_user)):
+    """Everything the estimator page loads when it opens, in one response: every master data
+    collection (from the cache; sales managers active only), approvers and, when project_id is
+    given, the project. A missing project does not fail the master data: project is null and
+    project_error says why."""
+    loads = [master_data_cache.documents(name) for name in MASTER_DATA_COLLECTIONS] + [list_approvers()]
+    if project_id:
+        loads.append(load_project_for_response(project_id))
+    results = await asyncio.gather(*loads)
+    
+    data = dict(zip(MASTER_DATA_COLLECTIONS, results))
+    data["sales_managers"] = [m for m in data["sales_managers"] if m.get("is_active") is True]
+    data["approvers"] = results[len(MASTER_DATA_COLLECTIONS)]
+    data["project"] = results[-1] if project_id else None
+    if project_id and data["project"] is None:
+        data["project_error"] = "Project not found"
+    return FastJSONResponse(data)
+
+
 # Template endpoints
+# A template stays a template when it is archived or superseded, so templates are read
+# and flagged wherever the project version lives (working set or history).
+async def set_template_fields(project_id: str, fields: dict) -> bool:
+    """Set template fields on a project version in whichever collection holds it"""
+    matched = 0
+    for collection in (db.projects, db.project_history):
+        result = await collection.update_one(
+            {"id": project_id}, {"$set": {**fields, "updated_at": datetime.now(timezone.utc)}}
+        )
+        matched += result.matched_count
+    return matched > 0
+
+
 @api_router.get("/templates")
 async def get_templates():
-    """Get all project templates"""
-    templates = await db.projects.find(
-        {"is_template": True},
-        {"_id": 0}
-    ).sort("template_name", 1).to_list(100)
-    return templates
+    """Get all project templates, including archived and superseded ones kept in history"""
+    templates = await find_all_versions({"is_template": True}, {"_id": 0}, 100)
+    templates = sorted(templates, key=lambda t: t.get("template_name", ""))[:100]
+    return fast_project_response(await hydrate_projects(templates))
 
 @api_router.post("/projects/{project_id}/save-as-template")
 async def save_as_template(project_id: str, template_name: str):
     """Mark a project as a template"""
-    project = await db.projects.find_one({"id": project_id}, {"_id": 0})
+    project = await find_project(project_id, {"_id": 0, "id": 1})
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -1508,48 +2952,34 @@ async def save_as_template(project_id: str, template_name: str):
         raise HTTPException(status_code=400, detail="Template name is required")
     
     # Check if template name already exists
-    existing = await db.projects.find_one({"is_template": True, "template_name": template_name})
+    existing = await find_all_versions({"is_template": True, "template_name": template_name}, {"_id": 0, "id": 1}, 1)
     if existing:
         raise HTTPException(status_code=400, detail="Template with this name already exists")
     
-    await db.projects.update_one(
-        {"id": project_id},
-        {"$set": {"is_template": True, "template_name": template_name}}
-    )
+    await set_template_fields(project_id, {"is_template": True, "template_name": template_name})
     
     return {"message": f"Project saved as template: {template_name}"}
 
 @api_router.post("/projects/{project_id}/remove-template")
 async def remove_template(project_id: str):
     """Remove template flag from a project"""
-    result = await db.projects.update_one(
-        {"id": project_id},
-        {"$set": {"is_template": False, "template_name": ""}}
-    )
-    if result.matched_count == 0:
+    if not await set_template_fields(project_id, {"is_template": False, "template_name": ""}):
         raise HTTPException(status_code=404, detail="Project not found")
     return {"message": "Template removed"}
 
 @api_router.post("/projects/create-from-template/{template_id}")
 async def create_from_template(template_id: str, user: dict = Depends(require_auth)):
     """Create a new project from a template"""
-    template = await db.projects.find_one({"id": template_id, "is_template": True}, {"_id": 0})
-    if not template:
+    template = await find_project(template_id)
+    if not template or not template.get("is_template"):
         raise HTTPException(status_code=404, detail="Template not found")
+    await hydrate_projects([template])
     
     # Get current user info
     current_user = await db.users.find_one({"id": user["user_id"]}, {"_id": 0})
     
-    # Get next project number
-    last_project = await db.projects.find_one(
-        {"project_number": {"$regex": "^PRJ-"}},
-        sort=[("project_number", -1)]
-    )
-    if last_project and last_project.get("project_number"):
-        last_num = int(last_project["project_number"].split("-")[1])
-        new_project_number = f"PRJ-{str(last_num + 1).zfill(4)}"
-    else:
-        new_project_number = "PRJ-0001"
+    # Get next project number (archived projects in history keep theirs)
+    new_project_number = await generate_project_number()
     
     # Create new project from template
     new_project_data = {**template}
@@ -1557,6 +2987,7 @@ async def create_from_template(template_id: str, user: dict = Depends(require_au
     new_project_data["project_number"] = new_project_number
     new_project_data["version"] = 1
     new_project_data["version_notes"] = f"Created from template: {template.get('template_name', 'Unknown')}"
+    new_project_data["duplicate_of_version"] = None
     new_project_data["name"] = f"{template.get('name', 'Project')} (from template)"
     new_project_data["is_template"] = False
     new_project_data["template_name"] = ""
@@ -1583,34 +3014,52 @@ async def create_from_template(template_id: str, user: dict = Depends(require_au
         for alloc in wave.get("grid_allocations", []):
             alloc["id"] = str(uuid.uuid4())
     
-    project_obj = Project(**new_project_data)
+    project_obj = with_estimate_hashes(Project(**new_project_data))
     doc = project_obj.model_dump()
-    doc["created_at"] = doc["created_at"].isoformat() if isinstance(doc["created_at"], datetime) else doc["created_at"]
-    doc["updated_at"] = doc["updated_at"].isoformat() if isinstance(doc["updated_at"], datetime) else doc["updated_at"]
     
     await db.projects.insert_one(doc)
+    valuation_refresher.schedule([project_obj.id])
     return project_obj
 
 
+async def change_project_status(project_id: str, from_statuses: List[Optional[str]], update_data: dict) -> dict:
+    """Apply a workflow transition if the project is still in one of from_statuses, returning the pre-image.
+    The revision is bumped like any other in-place update, so editors still holding the old revision get a 409."""
+    project = await db.projects.find_one_and_update(
+        {"id": project_id, "status": {"$in": from_statuses}, **revision_filter(None)},
+        {"$set": update_data, "$inc": {"revision": 1}},
+        projection={"_id": 0, "waves": 0, "waves_delta": 0},
+        return_document=ReturnDocument.BEFORE
+    )
+    if not project:
+        current = await db.projects.find_one({"id": project_id}, {"_id": 0, "status": 1, "is_latest_version": 1, "is_archived": 1})
+        if not current:
+            raise HTTPException(status_code=404, detail="Project not found")
+        if current.get("status") in from_statuses:
+            await raise_revision_conflict(project_id, None)
+        raise HTTPException(
+            status_code=409,
+            detail=f"Project is {current.get('status') or 'draft'} and cannot be moved to {update_data['status']}"
+        )
+    valuation_refresher.schedule([project_id])
+    return project
+
+
 # Submit project for review
 @api_router.post("/projects/{project_id}/submit-for-review")
 async def submit_for_review(project_id: str, approver_email: str, user: dict = Depends(require_auth)):
-    project = await db.projects.find_one({"id": project_id}, {"_id": 0})
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
     if not approver_email:
         raise HTTPException(status_code=400, detail="Approver email is required")
     
-    old_status = project.get("status", "draft")
     update_data = {
         "status": "in_review",
         "approver_email": approver_email,
-        "submitted_at": datetime.now(timezone.utc).isoformat(),
-        "updated_at": datetime.now(timezone.utc).isoformat()
+        "submitted_at": datetime.now(timezone.utc),
+        "updated_at": datetime.now(timezone.utc)
     }
-    
-    await db.projects.update_one({"id": project_id}, {"$set": update_data})
+    # Projects saved before the status field existed count as drafts
+    project = await change_project_status(project_id, ["draft", None], update_data)
+    old_status = project.get("status", "draft")
     
     # Create audit log for status change
     current_user = await db.users.find_one({"id": user["user_id"]}, {"_id": 0})
@@ -1638,7 +3087,6 @@ async def submit_for_review(project_id: str, approver_email: str, user: dict = D
         project_number=project.get("project_number", "")
     )
     notif_doc = notification.model_dump()
-    notif_doc['created_at'] = notif_doc['created_at'].isoformat()
     await db.notifications.insert_one(notif_doc)
     
     # Send email notification to approver
@@ -1651,25 +3099,20 @@ async def submit_for_review(project_id: str, approver_email: str, user: dict = D
         )
         await send_email(approver_email, subject, html_body, text_body)
     
-    return {"message": "Project submitted for review", "status": "in_review"}
+    return {"message": "Project submitted for review", "status": "in_review", "revision": project.get("revision", 0) + 1}
 
 
 # Approve project
 @api_router.post("/projects/{project_id}/approve")
 async def approve_project(project_id: str, comments: str = "", user: dict = Depends(require_auth)):
-    project = await db.projects.find_one({"id": project_id}, {"_id": 0})
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    old_status = project.get("status", "in_review")
     update_data = {
         "status": "approved",
         "approval_comments": comments,
-        "approved_at": datetime.now(timezone.utc).isoformat(),
-        "updated_at": datetime.now(timezone.utc).isoformat()
+        "approved_at": datetime.now(timezone.utc),
+        "updated_at": datetime.now(timezone.utc)
     }
-    
-    await db.projects.update_one({"id": project_id}, {"$set": update_data})
+    project = await change_project_status(project_id, ["in_review"], update_data)
+    old_status = project.get("status", "in_review")
     
     # Create audit log for approval
     current_user = await db.users.find_one({"id": user["user_id"]}, {"_id": 0})
@@ -1697,7 +3140,6 @@ async def approve_project(project_id: str, comments: str = "", user: dict = Depe
         project_number=project.get("project_number", "")
     )
     notif_doc = notification.model_dump()
-    notif_doc['created_at'] = notif_doc['created_at'].isoformat()
     await db.notifications.insert_one(notif_doc)
     
     # Send email notification to project creator
@@ -1712,24 +3154,19 @@ async def approve_project(project_id: str, comments: str = "", user: dict = Depe
         )
         await send_email(creator_email, subject, html_body, text_body)
     
-    return {"message": "Project approved", "status": "approved"}
+    return {"message": "Project approved", "status": "approved", "revision": project.get("revision", 0) + 1}
 
 
 # Reject project
 @api_router.post("/projects/{project_id}/reject")
 async def reject_project(project_id: str, comments: str = "", user: dict = Depends(require_auth)):
-    project = await db.projects.find_one({"id": project_id}, {"_id": 0})
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    old_status = project.get("status", "in_review")
     update_data = {
         "status": "rejected",
         "approval_comments": comments,
-        "updated_at": datetime.now(timezone.utc).isoformat()
+        "updated_at": datetime.now(timezone.utc)
     }
-    
-    await db.projects.update_one({"id": project_id}, {"$set": update_data})
+    project = await change_project_status(project_id, ["in_review"], update_data)
+    old_status = project.get("status", "in_review")
     
     # Create audit log for rejection
     current_user = await db.users.find_one({"id": user["user_id"]}, {"_id": 0})
@@ -1757,7 +3194,6 @@ async def reject_project(project_id: str, comments: str = "", user: dict = Depen
         project_number=project.get("project_number", "")
     )
     notif_doc = notification.model_dump()
-    notif_doc['created_at'] = notif_doc['created_at'].isoformat()
     await db.notifications.insert_one(notif_doc)
     
     # Send email notification to project creator
@@ -1772,7 +3208,7 @@ async def reject_project(project_id: str, comments: str = "", user: dict = Depen
         )
         await send_email(creator_email, subject, html_body, text_body)
     
-    return {"message": "Project rejected", "status": "rejected"}
+    return {"message": "Project rejected", "status": "rejected", "revision": project.get("revision", 0) + 1}
 
 
 # Notifications endpoints
@@ -1785,9 +3221,6 @@ async def get_notifications(user_email: str = None, unread_only: bool = False):
         query["is_read"] = False
     
     notifications = await db.notifications.find(query, {"_id": 0}).sort("created_at", -1).to_list(100)
-    for notif in notifications:
-        if isinstance(notif.get('created_at'), str):
-            notif['created_at'] = datetime.fromisoformat(notif['created_at'])
     return notifications
 
 
@@ -1795,7 +3228,7 @@ async def get_notifications(user_email: str = None, unread_only: bool = False):
 async def mark_notification_read(notification_id: str):
     result = await db.notifications.update_one(
         {"id": notification_id},
-        {"$set": {"is_read": True}}
+        {"$set": {"is_read": True, "read_at": datetime.now(timezone.utc)}}
     )
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Notification not found")
@@ -1807,10 +3240,307 @@ async def mark_all_notifications_read(user_email: str = None):
     query = {}
     if user_email:
         query["user_email"] = user_email
-    await db.notifications.update_many(query, {"$set": {"is_read": True}})
+    query["is_read"] = {"$ne": True}
+    await db.notifications.update_many(query, {"$set": {"is_read": True, "read_at": datetime.now(timezone.utc)}})
     return {"message": "All notifications marked as read"}
 
 
+# Notification maintenance
+async def compact_notifications(retention_days: int = NOTIFICATION_RETENTION_DAYS) -> dict:
+    """Expire old read notifications and collapse repeated events per project.
+
+    Read notifications older than ``retention_days`` are deleted (the TTL index
+    on ``read_at`` does the same in the background; this also covers legacy
+    documents read before ``read_at`` existed). Repeated notifications of the
+    same type for the same user and project are collapsed into the newest one,
+    which keeps a ``repeat_count`` of the events it represents.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    expired = await db.notifications.delete_many({
+        "is_read": True,
+        "$or": [
+            {"read_at": {"$lt": cutoff}},
+            {"read_at": None, "created_at": {"$lt": cutoff}}
+        ]
+    })
+    
+    groups = await db.notifications.aggregate([
+        {"$sort": {"created_at": -1}},
+        {"$group": {
+            "_id": {"user_email": "$user_email", "project_id": "$project_id", "type": "$type"},
+            "ids": {"$push": "$id"},
+            "count": {"$sum": 1},
+            "repeat_count": {"$sum": {"$ifNull": ["$repeat_count", 1]}},
+            "has_unread": {"$max": {"$cond": [{"$eq": ["$is_read", True]}, 0, 1]}}
+        }},
+        {"$match": {"count": {"$gt": 1}}}
+    ]).to_list(None)
+    
+    operations = []
+    collapsed = 0
+    for group in groups:
+        keep_id, duplicate_ids = group["ids"][0], group["ids"][1:]
+        operations.append(UpdateOne(
+            {"id": keep_id},
+            {"$set": {"repeat_count": group["repeat_count"], "is_read": not group["has_unread"]}}
+        ))
+        operations.append(DeleteMany({"id": {"$in": duplicate_ids}}))
+        collapsed += len(duplicate_ids)
+    if operations:
+        await db.notifications.bulk_write(operations, ordered=False)
+    
+    result = {
+        "expired": expired.deleted_count,
+        "collapsed": collapsed,
+        "removed": expired.deleted_count + collapsed
+    }
+    logger.info(f"Notification compaction removed {result['removed']} documents "
+                f"({result['expired']} expired, {result['collapsed']} collapsed)")
+    return result
+
+
+@api_router.post("/admin/maintenance/compact-notifications")
+async def run_notification_compaction(user: dict = Depends(require_admin)):
+    """Run notification retention and compaction on demand - admin only"""
+    return await compact_notifications()
+
+
+async def compact_project_versions() -> dict:
+    """Convert superseded versions still stored in full into deltas (oldest first per project)"""
+    compacted = 0
+    kept = 0
+    cursor = db.project_history.find(
+        {"is_latest_version": False, "waves_base_id": None, "project_number": {"$nin": ["", None]}},
+        {"_id": 0, "id": 1, "project_number": 1, "version": 1, "is_latest_version": 1, "waves": 1}
+    ).sort([("project_number", ASCENDING), ("version", ASCENDING)])
+    async for project in cursor:
+        if await compact_superseded_version(project):
+            compacted += 1
+        else:
+            kept += 1
+    return {"compacted": compacted, "kept_full": kept}
+
+
+@api_router.post("/admin/maintenance/compact-versions")
+async def run_version_compaction(user: dict = Depends(require_admin)):
+    """Store existing superseded project versions as deltas - admin only"""
+    return await compact_project_versions()
+
+
+# Schema migrations - applied in order at startup and recorded in db.schema_migrations.
+# Migrations are idempotent; the unique index on version lets one worker claim each of them.
+# Once applied, project documents always carry the fields below, so queries on them are
+# plain equality predicates.
+PROJECT_FIELD_DEFAULTS = {
+    "version": 1, "revision": 0, "is_latest_version": True, "is_archived": False, "is_template": False,
+    "status": "draft", "project_locations": [], "project_location_names": [], "technology_ids": [],
+    "technology_names": [], "project_type_ids": [], "project_type_names": []
+}
+# Legacy single-value fields and the list fields that replaced them
+LEGACY_LIST_FIELDS = {
+    "project_location": "project_locations", "project_location_name": "project_location_names",
+    "technology_id": "technology_ids", "technology_name": "technology_names",
+    "project_type_id": "project_type_ids", "project_type_name": "project_type_names",
+}
+
+
+async def migrate_project_history() -> dict:
+    return {"moved": await move_history_documents()}
+
+
+async def backfill_project_defaults() -> dict:
+    """Set defaults on project documents missing a field (or holding null)"""
+    updated = 0
+    for collection in (db.projects, db.project_history):
+        for field, default in PROJECT_FIELD_DEFAULTS.items():
+            result = await collection.update_many({field: None}, {"$set": {field: default}})
+            updated += result.modified_count
+    return {"updated": updated}
+
+
+async def normalize_project_list_fields() -> dict:
+    """Copy legacy single-value location/technology/type fields into empty list fields"""
+    normalized = 0
+    for collection in (db.projects, db.project_history):
+        operations = []
+        async for project in collection.find(
+            {"$or": [{single: {"$nin": ["", None]}} for single in LEGACY_LIST_FIELDS]},
+            {"_id": 0, "id": 1, **{field: 1 for pair in LEGACY_LIST_FIELDS.items() for field in pair}}
+        ):
+            lists = {
+                plural: [project[single]]
+                for single, plural in LEGACY_LIST_FIELDS.items()
+                if project.get(single) and not project.get(plural)
+            }
+            if lists:
+                operations.append(UpdateOne({"id": project["id"]}, {"$set": lists}))
+        for start in range(0, len(operations), MIGRATION_BATCH_SIZE):
+            await collection.bulk_write(operations[start:start + MIGRATION_BATCH_SIZE], ordered=False)
+        normalized += len(operations)
+    return {"normalized": normalized}
+
+
+async def backfill_estimate_hashes() -> dict:
+    """Store content hashes on project documents saved before content hashing"""
+    hashed = 0
+    for collection in (db.projects, db.project_history):
+        ids = [p["id"] for p in await collection.find({"content_hash": None}, {"_id": 0, "id": 1}).to_list(None)]
+        for start in range(0, len(ids), MIGRATION_BATCH_SIZE):
+            projects = await collection.find(
+                {"id": {"$in": ids[start:start + MIGRATION_BATCH_SIZE]}},
+                {"_id": 0, "id": 1, **ESTIMATE_HASH_PROJECTION, **WAVES_PROJECTION}
+            ).to_list(None)
+            await hydrate_projects(projects)
+            if projects:
+                await collection.bulk_write(
+                    [UpdateOne({"id": p["id"]}, {"$set": estimate_hashes(p)}) for p in projects], ordered=False
+                )
+            hashed += len(projects)
+    return {"hashed": hashed}
+
+
+# Timestamp fields that older writes stored as ISO strings, per collection
+DATE_FIELDS = {
+    "projects": ["created_at", "updated_at", "archived_at", "submitted_at", "approved_at"],
+    "project_history": ["created_at", "updated_at", "archived_at", "submitted_at", "approved_at"],
+    "project_valuations": ["source_updated_at"],
+    "audit_logs": ["timestamp"],
+    "audit_logs_archive": ["timestamp"],
+    "notifications": ["created_at"],
+    "customers": ["created_at"],
+    "technologies": ["created_at"],
+    "project_types": ["created_at"],
+    "base_locations": ["created_at"],
+    "skills": ["created_at"],
+    "proficiency_rates": ["created_at"],
+    "sales_managers": ["created_at"],
+}
+
+
+async def convert_string_dates() -> dict:
+    """Convert ISO string timestamps to native dates. Unparseable values are left as they are
+    and reported per collection and field; readers of these fields skip them."""
+    converted = {}
+    unparseable = {}
+    for name, fields in DATE_FIELDS.items():
+        collection = db[name]
+        count = 0
+        for field in fields:
+            cursor = collection.find({field: {"$type": "string"}}, {"_id": 1, field: 1})
+            while True:
+                batch = await cursor.to_list(MIGRATION_BATCH_SIZE)
+                if not batch:
+                    break
+                operations = []
+                for doc in batch:
+                    try:
+                        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {field: parse_timestamp(doc[field])}}))
+                    except ValueError:
+                        key = f"{name}.{field}"
+                        unparseable[key] = unparseable.get(key, 0) + 1
+                if operations:
+                    await collection.bulk_write(operations, ordered=False)
+                    count += len(operations)
+        converted[name] = count
+    if unparseable:
+        logger.warning(f"Timestamps left as strings because they could not be parsed: {unparseable}")
+    return {**converted, "unparseable": unparseable}
+
+
+SCHEMA_MIGRATIONS = [
+    (1, "project_history", migrate_project_history),
+    (2, "project_field_defaults", backfill_project_defaults),
+    (3, "project_list_fields", normalize_project_list_fields),
+    (4, "estimate_hashes", backfill_estimate_hashes),
+    (5, "native_dates", convert_string_dates),
+]
+SCHEMA_VERSION = SCHEMA_MIGRATIONS[-1][0]
+# The migration after which project documents always carry their flags and revision
+PROJECT_FIELDS_MIGRATION = 2
+# Schema version this worker has seen applied (see revision_filter)
+schema_state = {"version": 0}
+_schema_task: Optional[asyncio.Task] = None
+
+
+async def run_schema_migrations() -> int:
+    """Apply pending migrations in order. Returns the schema version reached; stops at the
+    first migration that fails or is being applied by another worker."""
+    applied = {
+        m["version"] for m in await db.schema_migrations.find({"status": "applied"}, {"_id": 0, "version": 1}).to_list(None)
+    }
+    for version, name, migrate in SCHEMA_MIGRATIONS:
+        if version in applied:
+            continue
+        now = datetime.now(timezone.utc)
+        try:
+            # Claim a new, failed or abandoned migration; a fresh claim by another worker raises DuplicateKeyError
+            await db.schema_migrations.find_one_and_update(
+                {"version": version, "$or": [
+                    {"status": "failed"},
+                    {"status": "running", "started_at": {"$lt": now - timedelta(seconds=MIGRATION_LOCK_SECONDS)}}
+                ]},
+                {"$set": {"name": name, "status": "running", "started_at": now, "error": None}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            logger.info(f"Schema migration {version} ({name}) is being applied by another worker")
+            return version - 1
+        try:
+            result = await migrate()
+        except Exception as e:
+            await db.schema_migrations.update_one({"version": version}, {"$set": {"status": "failed", "error": str(e)}})
+            logger.error(f"Schema migration {version} ({name}) failed: {str(e)}")
+            return version - 1
+        await db.schema_migrations.update_one(
+            {"version": version},
+            {"$set": {"status": "applied", "applied_at": datetime.now(timezone.utc), "result": result}}
+        )
+        logger.info(f"Applied schema migration {version} ({name}): {result}")
+    return SCHEMA_VERSION
+
+
+async def complete_schema_migrations():
+    """Keep retrying until the schema reaches SCHEMA_VERSION - whether this worker applies the
+    remaining migrations or sees another worker finish them - backing off up to ten minutes"""
+    delay = MIGRATION_RETRY_SECONDS
+    while schema_state["version"] < SCHEMA_VERSION:
+        await asyncio.sleep(delay)
+        try:
+            schema_state["version"] = await run_schema_migrations()
+        except Exception as e:
+            logger.error(f"Failed to run schema migrations: {str(e)}")
+        if schema_state["version"] < SCHEMA_VERSION:
+            logger.error(f"Schema is at version {schema_state['version']} of {SCHEMA_VERSION}; retrying in {delay}s")
+        delay = min(delay * 2, 600)
+    logger.info(f"Schema migrations complete at version {SCHEMA_VERSION}")
+
+
+@api_router.get("/admin/maintenance/schema")
+async def get_schema_status(user: dict = Depends(require_admin)):
+    """Schema version and migration history - admin only"""
+    migrations = await db.schema_migrations.find({}, {"_id": 0}).sort("version", ASCENDING).to_list(None)
+    applied = [m["version"] for m in migrations if m.get("status") == "applied"]
+    return {
+        "schema_version": max(applied, default=0),
+        "target_version": SCHEMA_VERSION,
+        # This worker's view; below target it is retrying and edits use missing-field tolerant filters
+        "worker_schema_version": schema_state["version"],
+        "ready": schema_state["version"] >= SCHEMA_VERSION,
+        "failed": [m["version"] for m in migrations if m.get("status") == "failed"],
+        "migrations": migrations
+    }
+
+
+@api_router.get("/admin/maintenance/cache")
+async def get_cache_status(user: dict = Depends(require_admin)):
+    """This worker's master data cache and how it learns about other workers' writes - admin only"""
+    return {
+        "invalidation_mode": cache_listener.mode,
+        "poll_interval_seconds": CACHE_POLL_INTERVAL_SECONDS,
+        "collections": master_data_cache.status()
+    }
+
+
 # Audit Log endpoints
 @api_router.get("/audit-logs")
 async def get_audit_logs(
@@ -1838,14 +3568,9 @@ async def get_audit_logs(
         query["user_email"] = user_email
     
     # Date range filter
-    if date_from or date_to:
-        date_filter = {}
-        if date_from:
-            date_filter["$gte"] = f"{date_from}T00:00:00"
-        if date_to:
-            date_filter["$lte"] = f"{date_to}T23:59:59"
-        if date_filter:
-            query["timestamp"] = date_filter
+    date_filter = date_range_filter(date_from, date_to)
+    if date_filter:
+        query["timestamp"] = date_filter
     
     # Non-admins can only see their own logs or logs for projects they own
     if current_user and current_user.get("role") != "admin":
@@ -1856,30 +3581,28 @@ async def get_audit_logs(
     
     logs = await db.audit_logs.find(query, {"_id": 0}).sort("timestamp", -1).limit(limit).to_list(limit)
     
-    for log in logs:
-        if isinstance(log.get('timestamp'), str):
-            log['timestamp'] = datetime.fromisoformat(log['timestamp'])
-    
     return logs
 
 
 async def get_user_project_ids(user_id: str) -> List[str]:
     """Helper to get project IDs owned by a user"""
-    projects = await db.projects.find({"created_by_id": user_id}, {"id": 1}).to_list(1000)
+    projects = await find_all_versions({"created_by_id": user_id}, {"_id": 0, "id": 1}, 1000)
     return [p["id"] for p in projects]
 
 
 @api_router.get("/audit-logs/project/{project_id}")
 async def get_project_audit_logs(project_id: str, user: dict = Depends(get_current_user)):
-    """Get all audit logs for a specific project"""
+    """Get all audit logs for a specific project, including archived entries"""
     logs = await db.audit_logs.find(
         {"project_id": project_id},
         {"_id": 0}
     ).sort("timestamp", -1).to_list(500)
-    
-    for log in logs:
-        if isinstance(log.get('timestamp'), str):
-            log['timestamp'] = datetime.fromisoformat(log['timestamp'])
+    if len(logs) < 500:
+        archived = await db.audit_logs_archive.find(
+            {"project_id": project_id},
+            {"_id": 0}
+        ).sort("timestamp", -1).to_list(500 - len(logs))
+        logs.extend(archived)
     
     return logs
 
@@ -1900,7 +3623,7 @@ async def get_audit_summary(user: dict = Depends(require_admin)):
     ]).to_list(10)
     
     # Recent activity (last 7 days)
-    seven_days_ago = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
+    seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
     recent_count = await db.audit_logs.count_documents({"timestamp": {"$gte": seven_days_ago}})
     
     return {
@@ -1911,6 +3634,624 @@ async def get_audit_summary(user: dict = Depends(require_admin)):
     }
 
 
+async def archive_audit_logs(retention_days: int = AUDIT_RETENTION_DAYS, batch_size: int = 1000) -> dict:
+    """Move audit logs older than the retention window to audit_logs_archive"""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    archived = 0
+    while True:
+        batch = await db.audit_logs.find(
+            {"timestamp": {"$lt": cutoff}}
+        ).sort("timestamp", 1).limit(batch_size).to_list(batch_size)
+        if not batch:
+            break
+        await db.audit_logs_archive.bulk_write(
+            [UpdateOne({"_id": log["_id"]}, {"$setOnInsert": log}, upsert=True) for log in batch],
+            ordered=False
+        )
+        result = await db.audit_logs.delete_many({"_id": {"$in": [log["_id"] for log in batch]}})
+        archived += result.deleted_count
+    return {"archived": archived}
+
+
+# Project valuation helpers
+def calculate_project_value(project: dict) -> float:
+    """Estimated selling value of a project as used by the dashboard.
+
+    Salary plus overhead for every allocation row, plus wave logistics for
+    traveling resources, grossed up by the project profit margin.
+    """
+    project_value = 0
+    profit_margin = project.get("profit_margin_percentage", 35)
+    
+    for wave in project.get("waves", []):
+        config = wave.get("logistics_config", {})
+        wave_base_cost = 0
+        wave_logistics = 0
+        traveling_mm = 0
+        traveling_count = 0
+        
+        for alloc in wave.get("grid_allocations", []):
+            mm = sum(alloc.get("phase_allocations", {}).values())
+            salary_cost = alloc.get("avg_monthly_salary", 0) * mm
+            overhead = salary_cost * (alloc.get("overhead_percentage", 0) / 100)
+            wave_base_cost += salary_cost + overhead
+            if alloc.get("travel_required", False):
+                traveling_mm += mm
+                traveling_count += 1
+        
+        # Calculate wave logistics for traveling resources
+        if traveling_count > 0:
+            per_diem = traveling_mm * config.get("per_diem_daily", 50) * config.get("per_diem_days", 30)
+            accommodation = traveling_mm * config.get("accommodation_daily", 80) * config.get("accommodation_days", 30)
+            conveyance = traveling_mm * config.get("local_conveyance_daily", 15) * config.get("local_conveyance_days", 21)
+            flights = traveling_count * config.get("flight_cost_per_trip", 450) * config.get("num_trips", 6)
+            visa = traveling_count * config.get("visa_medical_per_trip", 400) * config.get("num_trips", 6)
+            subtotal = per_diem + accommodation + conveyance + flights + visa
+            contingency = subtotal * (config.get("contingency_percentage", 5) / 100)
+            wave_logistics = subtotal + contingency
+        
+        project_value += wave_base_cost + wave_logistics
+    
+    # Apply profit margin
+    if profit_margin < 100:
+        project_value = project_value / (1 - profit_margin / 100)
+    return project_value
+
+
+def price_projects(projects: List[dict]) -> List[float]:
+    """Value a batch of projects; module-level so it can run in the process pool"""
+    return [calculate_project_value(project) for project in projects]
+
+
+# Wave logistics defaults - mirror LOGISTICS_DEFAULTS in frontend/src/utils/calculations.js
+LOGISTICS_DEFAULTS = {
+    "per_diem_daily": 50,
+    "per_diem_days": 30,
+    "accommodation_daily": 80,
+    "accommodation_days": 30,
+    "local_conveyance_daily": 15,
+    "local_conveyance_days": 21,
+    "flight_cost_per_trip": 450,
+    "visa_medical_per_trip": 400,
+    "num_trips": 6,
+    "contingency_percentage": 5,
+}
+
+
+def summarize_projects(projects: List[dict]) -> List[dict]:
+    """Per-wave and overall summaries for many projects in one vectorized pass.
+
+    Produces the same figures as calculateWaveSummary / calculateOverallSummary
+    in frontend/src/utils/calculations.js (including its "falsy means default"
+    handling of logistics settings), keyed the same way; ``logistics.config``
+    reports the effective rates after defaults are applied. Allocation rows of
+    all projects are flattened into arrays and aggregated per wave and per
+    project with numpy, so cost scales with total rows rather than Python
+    loop overhead per formula.
+    """
+    margins = []
+    wave_project, wave_ids, wave_names, nego = [], [], [], []
+    config_rows = []
+    row_wave, row_mm, row_salary, row_overhead, row_onsite, row_travel = [], [], [], [], [], []
+    
+    for p_index, project in enumerate(projects):
+        margins.append(project.get("profit_margin_percentage") or 35)
+        for wave in project.get("waves") or []:
+            w_index = len(wave_project)
+            wave_project.append(p_index)
+            wave_ids.append(wave.get("id", ""))
+            wave_names.append(wave.get("name", ""))
+            nego.append(wave.get("nego_buffer_percentage") or 0)
+            config = wave.get("logistics_config") or LOGISTICS_DEFAULTS
+            config_rows.append([config.get(key) or default for key, default in LOGISTICS_DEFAULTS.items()])
+            for alloc in wave.get("grid_allocations") or []:
+                row_wave.append(w_index)
+                row_mm.append(sum((v or 0) for v in (alloc.get("phase_allocations") or {}).values()))
+                row_salary.append(alloc.get("avg_monthly_salary") or 0)
+                row_overhead.append(alloc.get("overhead_percentage") or 0)
+                row_onsite.append(bool(alloc.get("is_onsite")))
+                row_travel.append(bool(alloc.get("travel_required")))
+    
+    n_projects, n_waves = len(projects), len(wave_project)
+    margins = np.asarray(margins, dtype=float)
+    wave_project = np.asarray(wave_project, dtype=np.int64)
+    row_wave = np.asarray(row_wave, dtype=np.int64)
+    mm = np.asarray(row_mm, dtype=float)
+    onsite = np.asarray(row_onsite, dtype=bool)
+    travel = np.asarray(row_travel, dtype=bool)
+    
+    # Row level: Selling Price = (Salary + Overhead) / (1 - margin%)
+    base_salary = np.asarray(row_salary, dtype=float) * mm
+    overhead = base_salary * (np.asarray(row_overhead, dtype=float) / 100)
+    row_cost = base_salary + overhead
+    row_margin = margins[wave_project[row_wave]] if len(row_wave) else np.zeros(0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        selling = np.where(row_margin < 100, row_cost / (1 - row_margin / 100), row_cost)
+    
+    def per_wave(weights):
+        return np.bincount(row_wave, weights=weights, minlength=n_waves)
+    
+    totals = {
+        "totalMM": per_wave(mm),
+        "onsiteMM": per_wave(mm * onsite),
+        "offshoreMM": per_wave(mm * ~onsite),
+        "onsiteSalaryCost": per_wave(base_salary * onsite),
+        "offshoreSalaryCost": per_wave(base_salary * ~onsite),
+        "onsiteSellingPrice": per_wave(selling * onsite),
+        "offshoreSellingPrice": per_wave(selling * ~onsite),
+        "totalRowsSellingPrice": per_wave(selling),
+    }
+    base_total = per_wave(base_salary)
+    overhead_total = per_wave(overhead)
+    onsite_count = per_wave(onsite.astype(float))
+    traveling_mm = per_wave(mm * travel)
+    traveling_count = per_wave(travel.astype(float))
+    
+    # Wave logistics: MM-based items scale with traveling MM, trip-based with traveling heads
+    config = np.asarray(config_rows, dtype=float).reshape(n_waves, len(LOGISTICS_DEFAULTS))
+    cfg = {key: config[:, i] for i, key in enumerate(LOGISTICS_DEFAULTS)}
+    per_diem = traveling_mm * cfg["per_diem_daily"] * cfg["per_diem_days"]
+    accommodation = traveling_mm * cfg["accommodation_daily"] * cfg["accommodation_days"]
+    conveyance = traveling_mm * cfg["local_conveyance_daily"] * cfg["local_conveyance_days"]
+    flights = traveling_count * cfg["flight_cost_per_trip"] * cfg["num_trips"]
+    visa_medical = traveling_count * cfg["visa_medical_per_trip"] * cfg["num_trips"]
+    subtotal = per_diem + accommodation + conveyance + flights + visa_medical
+    contingency = subtotal * (cfg["contingency_percentage"] / 100)
+    logistics_total = subtotal + contingency
+    
+    wave_selling = totals["totalRowsSellingPrice"] + logistics_total
+    nego_pct = np.asarray(nego, dtype=float)
+    nego_amount = wave_selling * (nego_pct / 100)
+    totals.update({
+        "totalLogisticsCost": logistics_total,
+        "totalCost": base_total + overhead_total + logistics_total,
+        "totalCostToCompany": base_total + overhead_total,
+        "sellingPrice": wave_selling,
+        "negoBufferAmount": nego_amount,
+        "finalPrice": wave_selling + nego_amount,
+    })
+    
+    def per_project(values):
+        return np.bincount(wave_project, weights=values, minlength=n_projects)
+    
+    overall = {key: per_project(values) for key, values in totals.items()}
+    overall["negoBuffer"] = overall.pop("negoBufferAmount")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        overall["onsiteAvgPerMM"] = np.where(overall["onsiteMM"] > 0, overall["onsiteSellingPrice"] / overall["onsiteMM"], 0)
+        overall["offshoreAvgPerMM"] = np.where(overall["offshoreMM"] > 0, overall["offshoreSellingPrice"] / overall["offshoreMM"], 0)
+    
+    logistics_keys = {
+        "perDiemCost": per_diem, "accommodationCost": accommodation, "conveyanceCost": conveyance,
+        "flightCost": flights, "visaMedicalCost": visa_medical, "contingencyCost": contingency,
+        "totalLogistics": logistics_total, "totalOnsiteMM": totals["onsiteMM"],
+        "onsiteResourceCount": onsite_count, "totalTravelingMM": traveling_mm,
+        "travelingResourceCount": traveling_count,
+    }
+    count_keys = {"onsiteResourceCount", "travelingResourceCount"}
+    
+    results = [{"waves": [], "overall": {key: float(values[i]) for key, values in overall.items()}} for i in range(n_projects)]
+    for w in range(n_waves):
+        wave_summary = {key: float(values[w]) for key, values in totals.items()}
+        wave_summary.update({
+            "negoBufferPercentage": float(nego_pct[w]),
+            "onsiteResourceCount": int(onsite_count[w]),
+            "travelingResourceCount": int(traveling_count[w]),
+            "travelingMM": float(traveling_mm[w]),
+            "logistics": {
+                **{key: int(values[w]) if key in count_keys else float(values[w]) for key, values in logistics_keys.items()},
+                "config": {key: float(values[w]) for key, values in cfg.items()},
+            },
+        })
+        results[wave_project[w]]["waves"].append({"id": wave_ids[w], "name": wave_names[w], "summary": wave_summary})
+    return results
+
+
+# Project summaries keyed by (project id, updated_at) - an edit changes the key
+summary_cache = LRUCache(SUMMARY_CACHE_SIZE)
+
+
+class ProjectValuationRequest(BaseModel):
+    project_ids: List[str] = []
+    projects: List[Dict] = []  # Inline (unsaved) project payloads
+
+
+async def build_project_valuations(projects: List[dict]) -> List[dict]:
+    """Summarize projects, moving large batches off the event loop"""
+    if len(projects) > VALUATION_INLINE_LIMIT:
+        summaries = await run_in_process(summarize_projects, projects)
+    else:
+        summaries = summarize_projects(projects)
+    return [
+        {
+            "project_id": project.get("id", ""),
+            "project_number": project.get("project_number", ""),
+            "version": project.get("version", 1),
+            "name": project.get("name", ""),
+            "profit_margin_percentage": project.get("profit_margin_percentage") or 35,
+            **summary
+        }
+        for project, summary in zip(projects, summaries)
+    ]
+
+
+@api_router.post("/projects/valuations")
+async def get_project_valuations(input: ProjectValuationRequest):
+    """Per-wave and overall summaries for many projects, matching the estimator's calculations"""
+    if len(input.project_ids) + len(input.projects) > VALUATION_MAX_PROJECTS:
+        raise HTTPException(status_code=400, detail=f"At most {VALUATION_MAX_PROJECTS} projects per request")
+    
+    found = {}
+    if input.project_ids:
+        docs = await find_all_versions(
+            {"id": {"$in": input.project_ids}},
+            {"_id": 0, "id": 1, "project_number": 1, "version": 1, "name": 1, "profit_margin_percentage": 1, **WAVES_PROJECTION}
+        )
+        found = {doc["id"]: doc for doc in await hydrate_projects(docs)}
+    
+    projects = [found[pid] for pid in input.project_ids if pid in found] + input.projects
+    return {
+        "valuations": await build_project_valuations(projects),
+        "missing_ids": [pid for pid in input.project_ids if pid not in found]
+    }
+
+
+@api_router.get("/projects/{project_id}/summary")
+async def get_project_summary(project_id: str):
+    """Full wave and overall price breakdown of a project, cached until it is edited"""
+    stamp = await find_project(project_id, {"_id": 0, "updated_at": 1})
+    if not stamp:
+        raise HTTPException(status_code=404, detail="Project not found")
+    cache_key = (project_id, str(stamp.get("updated_at")))
+    cached = summary_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    project = await find_project(
+        project_id,
+        {"_id": 0, "id": 1, "project_number": 1, "version": 1, "name": 1,
+         "profit_margin_percentage": 1, "updated_at": 1, **WAVES_PROJECTION}
+    )
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    await hydrate_projects([project])
+    summary = (await build_project_valuations([project]))[0]
+    summary["updated_at"] = project.get("updated_at")
+    summary_cache.put((project_id, str(project.get("updated_at"))), summary)
+    return summary
+
+
+# Version diff - structural and valuation differences between two versions of a project
+PROJECT_DIFF_FIELDS = [
+    "name", "customer_name", "description", "profit_margin_percentage", "project_location_names",
+    "technology_names", "project_type_names", "sales_manager_name", "status", "version_notes"
+]
+WAVE_DIFF_FIELDS = ["name", "duration_months", "phase_names", "nego_buffer_percentage", "logistics_config"]
+VERSION_DIFF_METRICS = [
+    "totalMM", "onsiteMM", "offshoreMM", "totalLogisticsCost", "onsiteSellingPrice",
+    "offshoreSellingPrice", "totalCost", "sellingPrice", "negoBuffer", "finalPrice"
+]
+
+
+def field_changes(old: dict, new: dict, fields) -> List[dict]:
+    return [{"field": f, "from": old.get(f), "to": new.get(f)} for f in fields if old.get(f) != new.get(f)]
+
+
+def keyed_by_id(items: List[dict]) -> Dict[str, dict]:
+    """Index waves/allocations by id (position for legacy rows without one)"""
+    return {item.get("id") or f"#{i}": item for i, item in enumerate(items or [])}
+
+
+def metric_change(old: float, new: float) -> dict:
+    return {"from": old, "to": new, "diff": new - old}
+
+
+def diff_allocations(old_rows: List[dict], new_rows: List[dict], phase_names: List[str]) -> List[dict]:
+    """Allocation-level changes; rows are matched by id and identical rows are skipped by hash"""
+    old_by_id, new_by_id = keyed_by_id(old_rows), keyed_by_id(new_rows)
+    changes = []
+    for key, row in new_by_id.items():
+        previous = old_by_id.get(key)
+        if previous is not None and canonical_hash(previous) == canonical_hash(row):
+            continue
+        entry = {
+            "id": row.get("id", ""),
+            "skill_name": row.get("skill_name", ""),
+            "proficiency_level": row.get("proficiency_level", ""),
+            "base_location_name": row.get("base_location_name", ""),
+        }
+        if previous is None:
+            changes.append({**entry, "status": "added", "total_mm": sum((v or 0) for v in (row.get("phase_allocations") or {}).values())})
+            continue
+        fields = sorted((set(previous) | set(row)) - {"id", "phase_allocations"})
+        old_phases = previous.get("phase_allocations") or {}
+        new_phases = row.get("phase_allocations") or {}
+        phases = [
+            {
+                "phase": phase,
+                "label": phase_names[int(phase)] if phase.isdigit() and int(phase) < len(phase_names) else phase,
+                "from": old_phases.get(phase, 0),
+                "to": new_phases.get(phase, 0),
+            }
+            for phase in sorted(set(old_phases) | set(new_phases), key=lambda k: (not k.isdigit(), int(k) if k.isdigit() else k))
+            if old_phases.get(phase, 0) != new_phases.get(phase, 0)
+        ]
+        changes.append({**entry, "status": "changed", "fields": field_changes(previous, row, fields), "phases": phases})
+    for key, row in old_by_id.items():
+        if key not in new_by_id:
+            changes.append({
+                "id": row.get("id", ""),
+                "skill_name": row.get("skill_name", ""),
+                "proficiency_level": row.get("proficiency_level", ""),
+                "base_location_name": row.get("base_location_name", ""),
+                "status": "removed",
+                "total_mm": sum((v or 0) for v in (row.get("phase_allocations") or {}).values()),
+            })
+    return changes
+
+
+def version_metrics(project: dict, summary: dict) -> dict:
+    """Overall valuation figures plus resource counts for one version"""
+    metrics = {key: summary["overall"][key] for key in VERSION_DIFF_METRICS}
+    metrics["resourceCount"] = sum(len(w.get("grid_allocations") or []) for w in project.get("waves") or [])
+    metrics["travelingResourceCount"] = sum(w["summary"]["travelingResourceCount"] for w in summary["waves"])
+    metrics["travelingMM"] = sum(w["summary"]["travelingMM"] for w in summary["waves"])
+    return metrics
+
+
+def diff_versions(old: dict, new: dict) -> dict:
+    """Wave-, allocation- and phase-level differences plus valuation deltas between two versions"""
+    old_summary, new_summary = summarize_projects([old, new])
+    old_wave_summaries = {w["id"]: w["summary"] for w in old_summary["waves"]}
+    new_wave_summaries = {w["id"]: w["summary"] for w in new_summary["waves"]}
+    
+    old_waves, new_waves = keyed_by_id(old.get("waves")), keyed_by_id(new.get("waves"))
+    wave_changes = []
+    for key, wave in new_waves.items():
+        previous = old_waves.get(key)
+        if previous is not None and canonical_hash(previous) == canonical_hash(wave):
+            continue
+        new_wave_summary = new_wave_summaries.get(wave.get("id"), {})
+        old_wave_summary = old_wave_summaries.get(wave.get("id"), {}) if previous is not None else {}
+        wave_changes.append({
+            "id": wave.get("id", ""),
+            "name": wave.get("name", ""),
+            "status": "added" if previous is None else "changed",
+            "fields": field_changes(previous, wave, WAVE_DIFF_FIELDS) if previous is not None else [],
+            "allocations": diff_allocations(
+                (previous or {}).get("grid_allocations"), wave.get("grid_allocations"), wave.get("phase_names") or []
+            ),
+            "metrics": {
+                key: metric_change(old_wave_summary.get(key, 0.0), new_wave_summary.get(key, 0.0))
+                for key in ("totalMM", "totalLogisticsCost", "finalPrice")
+            },
+        })
+    for key, wave in old_waves.items():
+        if key not in new_waves:
+            old_wave_summary = old_wave_summaries.get(wave.get("id"), {})
+            wave_changes.append({
+                "id": wave.get("id", ""),
+                "name": wave.get("name", ""),
+                "status": "removed",
+                "fields": [],
+                "allocations": [],
+                "metrics": {
+                    key: metric_change(old_wave_summary.get(key, 0.0), 0.0)
+                    for key in ("totalMM", "totalLogisticsCost", "finalPrice")
+                },
+            })
+    
+    old_metrics, new_metrics = version_metrics(old, old_summary), version_metrics(new, new_summary)
+    
+    def version_info(project: dict) -> dict:
+        return {
+            "id": project.get("id"),
+            "version": project.get("version", 1),
+            "name": project.get("name", ""),
+            "customer_name": project.get("customer_name", ""),
+            "profit_margin_percentage": project.get("profit_margin_percentage"),
+            "version_notes": project.get("version_notes", ""),
+            "is_latest_version": project.get("is_latest_version", True),
+            "waves": [
+                {"id": w.get("id"), "name": w.get("name"), "duration_months": w.get("duration_months"),
+                 "resource_count": len(w.get("grid_allocations") or [])}
+                for w in project.get("waves") or []
+            ],
+        }
+    
+    return {
+        "project_number": new.get("project_number", ""),
+        "from": version_info(old),
+        "to": version_info(new),
+        "identical": canonical_hash(old.get("waves") or []) == canonical_hash(new.get("waves") or [])
+        and not field_changes(old, new, PROJECT_DIFF_FIELDS),
+        "fields": field_changes(old, new, PROJECT_DIFF_FIELDS),
+        "waves": wave_changes,
+        "metrics": {key: metric_change(old_metrics[key], new_metrics[key]) for key in new_metrics},
+    }
+
+
+@api_router.get("/projects/{project_id}/diff")
+async def get_project_diff(
+    project_id: str,
+    from_version: Optional[int] = Query(None, alias="from"),
+    to_version: Optional[int] = Query(None, alias="to")
+):
+    """Differences between two versions of a project, by version number.
+    Defaults compare the latest version with the one before it."""
+    project = await find_project(project_id, {"_id": 0, "project_number": 1, "version": 1})
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    project_number = project.get("project_number", "")
+    if not project_number:
+        if from_version not in (None, project.get("version", 1)) or to_version not in (None, project.get("version", 1)):
+            raise HTTPException(status_code=404, detail="Version not found")
+        doc = await find_project(project_id)
+        await hydrate_projects([doc])
+        return diff_versions(doc, doc)
+    
+    version_numbers = sorted(
+        (v["version"] for v in await find_all_versions({"project_number": project_number}, {"_id": 0, "version": 1})),
+        reverse=True
+    )
+    if to_version is None:
+        to_version = version_numbers[0]
+    if from_version is None:
+        from_version = next((v for v in version_numbers if v < to_version), to_version)
+    for number in (from_version, to_version):
+        if number not in version_numbers:
+            raise HTTPException(status_code=404, detail=f"Version {number} not found")
+    
+    docs = await find_all_versions(
+        {"project_number": project_number, "version": {"$in": [from_version, to_version]}},
+        {"_id": 0}
+    )
+    by_version = {d["version"]: d for d in await hydrate_projects(docs)}
+    return diff_versions(by_version[from_version], by_version[to_version])
+
+
+# Materialized valuations - one document per project version in project_valuations,
+# refreshed in the background shortly after each write and recomputed nightly by the
+# valuation_recompute job. Each record carries the revision it was computed from; older
+# computations never overwrite newer ones, and the version matrix repairs stale rows on read.
+VALUATION_SOURCE_PROJECTION = {
+    "_id": 0, "id": 1, "project_number": 1, "version": 1, "revision": 1, "profit_margin_percentage": 1,
+    "updated_at": 1, **WAVES_PROJECTION
+}
+VALUATION_MATRIX_METRICS = [
+    "totalMM", "onsiteMM", "offshoreMM", "resourceCount", "totalCost", "totalLogisticsCost",
+    "sellingPrice", "negoBuffer", "finalPrice", "marginAmount", "profitMarginPercentage"
+]
+
+
+def valuation_records(projects: List[dict]) -> List[dict]:
+    """Valuation documents for project versions; module-level so it can run in the process pool"""
+    records = []
+    for project, summary in zip(projects, summarize_projects(projects)):
+        overall = summary["overall"]
+        metrics = {key: overall[key] for key in VALUATION_MATRIX_METRICS if key in overall}
+        metrics["resourceCount"] = sum(len(w.get("grid_allocations") or []) for w in project.get("waves") or [])
+        metrics["marginAmount"] = overall["finalPrice"] - overall["totalCost"]
+        metrics["profitMarginPercentage"] = project.get("profit_margin_percentage") or 35
+        records.append({
+            "project_id": project["id"],
+            "project_number": project.get("project_number", ""),
+            "version": project.get("version", 1),
+            "value": calculate_project_value(project),
+            "metrics": metrics,
+            "source_updated_at": project.get("updated_at"),
+            "source_revision": project.get("revision", 0),
+        })
+    return records
+
+
+def valuation_upsert(record: dict, computed_at: datetime) -> UpdateOne:
+    """Upsert a valuation unless the stored one was computed from a later revision"""
+    return UpdateOne(
+        {"project_id": record["project_id"], "$or": [
+            {"source_revision": {"$lte": record["source_revision"]}},
+            {"source_revision": {"$exists": False}}
+        ]},
+        {"$set": {**record, "computed_at": computed_at}},
+        upsert=True
+    )
+
+
+async def write_valuations(operations: list):
+    """bulk_write valuation upserts; an upsert that lost to a newer revision surfaces as a
+    duplicate key on project_id and is skipped"""
+    try:
+        await db.project_valuations.bulk_write(operations, ordered=False)
+    except BulkWriteError as e:
+        if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+            raise
+
+
+async def refresh_project_valuations(project_ids: List[str]):
+    """Re-materialize the valuations of project versions (deleted ones are removed).
+    Failures are logged rather than raised; the nightly recompute repairs them."""
+    try:
+        projects = await find_all_versions({"id": {"$in": project_ids}}, VALUATION_SOURCE_PROJECTION)
+        records = valuation_records(await hydrate_projects(projects))
+        computed_at = datetime.now(timezone.utc)
+        operations = [valuation_upsert(r, computed_at) for r in records]
+        deleted = [pid for pid in project_ids if pid not in {p["id"] for p in projects}]
+        if deleted:
+            operations.append(DeleteMany({"project_id": {"$in": deleted}}))
+        if operations:
+            await write_valuations(operations)
+    except Exception as e:
+        logger.error(f"Failed to refresh valuations for {project_ids}: {str(e)}")
+
+
+class ValuationRefresher:
+    """Collects project ids written by requests and refreshes their valuations in the background,
+    VALUATION_REFRESH_DELAY_SECONDS after the first write, so bursts of small writes (grid cells,
+    autosave) cost one refresh and never delay the response"""
+    
+    def __init__(self):
+        self.pending: set = set()
+        self._task: Optional[asyncio.Task] = None
+    
+    def schedule(self, project_ids: List[str]):
+        self.pending.update(project_ids)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+    
+    async def _run(self):
+        while self.pending:
+            await asyncio.sleep(VALUATION_REFRESH_DELAY_SECONDS)
+            await self.flush()
+    
+    async def flush(self):
+        project_ids, self.pending = list(self.pending), set()
+        if project_ids:
+            await refresh_project_valuations(project_ids)
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+
+valuation_refresher = ValuationRefresher()
+
+
+@api_router.get("/projects/number/{project_number}/version-matrix")
+async def get_version_matrix(project_number: str):
+    """Version x metric matrix for every version of a project number, read from materialized valuations"""
+    versions = await find_all_versions({"project_number": project_number}, {"_id": 0, "id": 1, "revision": 1})
+    if not versions:
+        raise HTTPException(status_code=404, detail="No valuations found for this project number")
+    
+    async def read_rows():
+        return await db.project_valuations.find(
+            {"project_number": project_number},
+            {"_id": 0, "project_id": 1, "version": 1, "metrics": 1, "computed_at": 1, "source_revision": 1}
+        ).sort("version", ASCENDING).to_list(None)
+    
+    # Valuations are refreshed in the background; repair rows a recent write has not reached yet
+    rows = await read_rows()
+    stored = {r["project_id"]: r.get("source_revision") for r in rows}
+    current = {v["id"]: v.get("revision", 0) for v in versions}
+    stale = [pid for pid, revision in current.items() if stored.get(pid, -1) != revision]
+    if stale or len(stored) != len(current):
+        await refresh_project_valuations(stale + [pid for pid in stored if pid not in current])
+        rows = await read_rows()
+    rows = [r for r in rows if r["project_id"] in current]
+    return {
+        "project_number": project_number,
+        "metrics": VALUATION_MATRIX_METRICS,
+        "versions": [
+            {"version": r["version"], "project_id": r["project_id"], "computed_at": r.get("computed_at")}
+            for r in rows
+        ],
+        # One row per version, one column per metric (None until the version has been valued)
+        "matrix": [[(r.get("metrics") or {}).get(key) for key in VALUATION_MATRIX_METRICS] for r in rows],
+    }
+
+
 # Dashboard analytics endpoint
 @api_router.get("/dashboard/analytics")
 async def get_dashboard_analytics(
@@ -1924,15 +4265,10 @@ async def get_dashboard_analytics(
     # Build query based on filters
     query = {}
     
-    # Date range filter - stored dates are ISO strings, so compare as strings
-    if date_from or date_to:
-        date_filter = {}
-        if date_from:
-            date_filter["$gte"] = f"{date_from}T00:00:00"
-        if date_to:
-            date_filter["$lte"] = f"{date_to}T23:59:59"
-        if date_filter:
-            query["created_at"] = date_filter
+    # Date range filter
+    date_filter = date_range_filter(date_from, date_to)
+    if date_filter:
+        query["created_at"] = date_filter
     
     # Customer filter
     if customer_id:
@@ -1956,8 +4292,8 @@ async def get_dashboard_analytics(
         if sm_list:
             query["sales_manager_id"] = {"$in": sm_list}
     
-    # Get filtered projects
-    projects = await db.projects.find(query, {"_id": 0}).to_list(1000)
+    # Get filtered projects (every version, including history)
+    projects = await hydrate_projects(await find_all_versions(query, {"_id": 0}, 1000))
     
     # Calculate metrics
     total_projects = len(projects)
@@ -1971,46 +4307,7 @@ async def get_dashboard_analytics(
         status = project.get("status", "draft")
         projects_by_status[status] = projects_by_status.get(status, 0) + 1
         
-        # Calculate project value
-        project_value = 0
-        waves = project.get("waves", [])
-        profit_margin = project.get("profit_margin_percentage", 35)
-        
-        for wave in waves:
-            config = wave.get("logistics_config", {})
-            allocations = wave.get("grid_allocations", [])
-            
-            wave_base_cost = 0
-            wave_logistics = 0
-            traveling_mm = 0
-            traveling_count = 0
-            
-            for alloc in allocations:
-                mm = sum(alloc.get("phase_allocations", {}).values())
-                salary_cost = alloc.get("avg_monthly_salary", 0) * mm
-                overhead = salary_cost * (alloc.get("overhead_percentage", 0) / 100)
-                wave_base_cost += salary_cost + overhead
-                
-                if alloc.get("travel_required", False):
-                    traveling_mm += mm
-                    traveling_count += 1
-            
-            # Calculate wave logistics for traveling resources
-            if traveling_count > 0:
-                per_diem = traveling_mm * config.get("per_diem_daily", 50) * config.get("per_diem_days", 30)
-                accommodation = traveling_mm * config.get("accommodation_daily", 80) * config.get("accommodation_days", 30)
-                conveyance = traveling_mm * config.get("local_conveyance_daily", 15) * config.get("local_conveyance_days", 21)
-                flights = traveling_count * config.get("flight_cost_per_trip", 450) * config.get("num_trips", 6)
-                visa = traveling_count * config.get("visa_medical_per_trip", 400) * config.get("num_trips", 6)
-                subtotal = per_diem + accommodation + conveyance + flights + visa
-                contingency = subtotal * (config.get("contingency_percentage", 5) / 100)
-                wave_logistics = subtotal + contingency
-            
-            project_value += wave_base_cost + wave_logistics
-        
-        # Apply profit margin
-        if profit_margin < 100:
-            project_value = project_value / (1 - profit_margin / 100)
+        project_value = calculate_project_value(project)
         
         total_revenue += project_value
         
@@ -2023,9 +4320,13 @@ async def get_dashboard_analytics(
         
         # Group by month
         created_at = project.get("created_at")
+        if isinstance(created_at, str):
+            # Left as a string by the native_dates migration because it could not be parsed
+            try:
+                created_at = parse_timestamp(created_at)
+            except ValueError:
+                created_at = None
         if created_at:
-            if isinstance(created_at, str):
-                created_at = datetime.fromisoformat(created_at)
             month_key = created_at.strftime("%Y-%m")
             if month_key not in projects_by_month:
                 projects_by_month[month_key] = {"count": 0, "revenue": 0}
@@ -2052,43 +4353,8 @@ async def get_dashboard_analytics(
     sales_manager_stats = {}
     
     for project in projects:
-        project_value = 0
-        waves = project.get("waves", [])
-        profit_margin = project.get("profit_margin_percentage", 35)
         project_number = project.get("project_number", "")
-        
-        # Recalculate project value for KPIs
-        for wave in waves:
-            config = wave.get("logistics_config", {})
-            allocations = wave.get("grid_allocations", [])
-            wave_base_cost = 0
-            wave_logistics = 0
-            traveling_mm = 0
-            traveling_count = 0
-            
-            for alloc in allocations:
-                mm = sum(alloc.get("phase_allocations", {}).values())
-                salary_cost = alloc.get("avg_monthly_salary", 0) * mm
-                overhead = salary_cost * (alloc.get("overhead_percentage", 0) / 100)
-                wave_base_cost += salary_cost + overhead
-                if alloc.get("travel_required", False):
-                    traveling_mm += mm
-                    traveling_count += 1
-            
-            if traveling_count > 0:
-                per_diem = traveling_mm * config.get("per_diem_daily", 50) * config.get("per_diem_days", 30)
-                accommodation = traveling_mm * config.get("accommodation_daily", 80) * config.get("accommodation_days", 30)
-                conveyance = traveling_mm * config.get("local_conveyance_daily", 15) * config.get("local_conveyance_days", 21)
-                flights = traveling_count * config.get("flight_cost_per_trip", 450) * config.get("num_trips", 6)
-                visa = traveling_count * config.get("visa_medical_per_trip", 400) * config.get("num_trips", 6)
-                subtotal = per_diem + accommodation + conveyance + flights + visa
-                contingency = subtotal * (config.get("contingency_percentage", 5) / 100)
-                wave_logistics = subtotal + contingency
-            
-            project_value += wave_base_cost + wave_logistics
-        
-        if profit_margin < 100:
-            project_value = project_value / (1 - profit_margin / 100)
+        project_value = calculate_project_value(project)
         
         # Technology: group by sorted combination
         tech_names = sorted([t for t in project.get("technology_names", []) if t])
@@ -2166,35 +4432,7 @@ async def get_dashboard_analytics(
         status = project.get("status", "draft")
         sm_leaderboard[sm_name][status] = sm_leaderboard[sm_name].get(status, 0) + 1
         # Recalculate value for this project
-        p_value = 0
-        p_waves = project.get("waves", [])
-        p_margin = project.get("profit_margin_percentage", 35)
-        for wave in p_waves:
-            cfg = wave.get("logistics_config", {})
-            allocs = wave.get("grid_allocations", [])
-            w_base = 0
-            w_log = 0
-            t_mm = 0
-            t_cnt = 0
-            for alloc in allocs:
-                mm = sum(alloc.get("phase_allocations", {}).values())
-                sc = alloc.get("avg_monthly_salary", 0) * mm
-                oh = sc * (alloc.get("overhead_percentage", 0) / 100)
-                w_base += sc + oh
-                if alloc.get("travel_required", False):
-                    t_mm += mm
-                    t_cnt += 1
-            if t_cnt > 0:
-                pd = t_mm * cfg.get("per_diem_daily", 50) * cfg.get("per_diem_days", 30)
-                ac = t_mm * cfg.get("accommodation_daily", 80) * cfg.get("accommodation_days", 30)
-                cv = t_mm * cfg.get("local_conveyance_daily", 15) * cfg.get("local_conveyance_days", 21)
-                fl = t_cnt * cfg.get("flight_cost_per_trip", 450) * cfg.get("num_trips", 6)
-                vi = t_cnt * cfg.get("visa_medical_per_trip", 400) * cfg.get("num_trips", 6)
-                sub = pd + ac + cv + fl + vi
-                w_log = sub + sub * (cfg.get("contingency_percentage", 5) / 100)
-            p_value += w_base + w_log
-        if p_margin < 100:
-            p_value = p_value / (1 - p_margin / 100)
+        p_value = calculate_project_value(project)
         sm_leaderboard[sm_name]["value"] += p_value
     
     leaderboard_data = sorted(
@@ -2229,8 +4467,11 @@ async def compare_periods(
 ):
     """Compare two date periods for quarterly performance reviews."""
     async def calc_period(date_from, date_to):
-        query = {"created_at": {"$gte": f"{date_from}T00:00:00", "$lte": f"{date_to}T23:59:59"}}
-        projects = await db.projects.find(query, {"_id": 0}).to_list(1000)
+        query = {}
+        date_filter = date_range_filter(date_from, date_to)
+        if date_filter:
+            query["created_at"] = date_filter
+        projects = await hydrate_projects(await find_all_versions(query, {"_id": 0}, 1000))
         total_projects = len(projects)
         total_value = 0
         approved = 0
@@ -2243,29 +4484,7 @@ async def compare_periods(
             elif status == "rejected": rejected += 1
             elif status == "in_review": in_review += 1
             else: draft += 1
-            pv = 0
-            pm = project.get("profit_margin_percentage", 35)
-            for wave in project.get("waves", []):
-                cfg = wave.get("logistics_config", {})
-                wb = 0; wl = 0; tm = 0; tc = 0
-                for alloc in wave.get("grid_allocations", []):
-                    mm = sum(alloc.get("phase_allocations", {}).values())
-                    sc = alloc.get("avg_monthly_salary", 0) * mm
-                    oh = sc * (alloc.get("overhead_percentage", 0) / 100)
-                    wb += sc + oh
-                    if alloc.get("travel_required", False):
-                        tm += mm; tc += 1
-                if tc > 0:
-                    pd = tm * cfg.get("per_diem_daily", 50) * cfg.get("per_diem_days", 30)
-                    ac = tm * cfg.get("accommodation_daily", 80) * cfg.get("accommodation_days", 30)
-                    cv = tm * cfg.get("local_conveyance_daily", 15) * cfg.get("local_conveyance_days", 21)
-                    fl = tc * cfg.get("flight_cost_per_trip", 450) * cfg.get("num_trips", 6)
-                    vi = tc * cfg.get("visa_medical_per_trip", 400) * cfg.get("num_trips", 6)
-                    sub = pd + ac + cv + fl + vi
-                    wl = sub + sub * (cfg.get("contingency_percentage", 5) / 100)
-                pv += wb + wl
-            if pm < 100:
-                pv = pv / (1 - pm / 100)
+            pv = calculate_project_value(project)
             total_value += pv
         approval_rate = round((approved / total_projects) * 100, 1) if total_projects > 0 else 0
         return {
@@ -2298,8 +4517,655 @@ async def compare_periods(
     }
 
 
+# Background job scheduler
+class CronSchedule:
+    """Minimal five-field cron expression: minute hour day-of-month month day-of-week.
+
+    Supports ``*``, ``*/n``, ``a-b``, ``a-b/n`` and comma-separated lists.
+    Day-of-week uses 0 (or 7) for Sunday. As in cron, when both day fields
+    are restricted a time matches if either of them does.
+    """
+    FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+    
+    def __init__(self, expression: str):
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: '{expression}'")
+        self.expression = expression
+        fields = [self._parse_field(part, low, high) for part, (low, high) in zip(parts, self.FIELD_RANGES)]
+        self.minutes, self.hours, self.days, self.months, weekdays = fields
+        self.weekdays = {0 if d == 7 else d for d in weekdays}
+        self.day_restricted = parts[2] != "*"
+        self.weekday_restricted = parts[4] != "*"
+    
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> set:
+        values = set()
+        for item in field.split(","):
+            step = 1
+            if "/" in item:
+                item, step_str = item.split("/", 1)
+                step = int(step_str)
+                if step < 1:
+                    raise ValueError(f"Invalid cron step: '{field}'")
+            if item == "*":
+                start, end = low, high
+            elif "-" in item:
+                start, end = (int(v) for v in item.split("-", 1))
+            else:
+                start = end = int(item)
+            if start < low or end > high or start > end:
+                raise ValueError(f"Cron field '{field}' out of range {low}-{high}")
+            values.update(range(start, end + 1, step))
+        return values
+    
+    def _day_matches(self, dt: datetime) -> bool:
+        day_ok = dt.day in self.days
+        weekday_ok = (dt.isoweekday() % 7) in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+    
+    def next_after(self, dt: datetime) -> datetime:
+        """Return the first matching minute strictly after ``dt``"""
+        candidate = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year = candidate.year + (1 if candidate.month == 12 else 0)
+                month = 1 if candidate.month == 12 else candidate.month + 1
+                candidate = candidate.replace(year=year, month=month, day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never fires: '{self.expression}'")
+
+
+class JobScheduler:
+    """Runs registered maintenance jobs on cron schedules inside the app.
+
+    Every worker runs the scheduler loop, but a per-job leader lock in the
+    ``scheduler_locks`` collection ensures each scheduled slot executes on
+    exactly one worker. Each execution is recorded in ``job_runs``.
+    """
+    
+    def __init__(self):
+        self.worker_id = f"{os.uname().nodename}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.jobs: Dict[str, dict] = {}
+        self._loop_task: Optional[asyncio.Task] = None
+        self._running: Dict[str, asyncio.Task] = {}
+    
+    def register(self, name: str, schedule: str, func, description: str = ""):
+        self.jobs[name] = {
+            "name": name,
+            "schedule": CronSchedule(schedule),
+            "func": func,
+            "description": description,
+            "next_run": None,
+        }
+    
+    async def _acquire_lock(self, name: str, slot: datetime) -> bool:
+        now = datetime.now(timezone.utc)
+        try:
+            await db.scheduler_locks.find_one_and_update(
+                {
+                    "_id": name,
+                    "last_slot": {"$ne": slot},
+                    # A held lock blocks every caller, this worker included, so a manual
+                    # trigger cannot re-enter a run that is still in progress
+                    "locked_until": {"$lt": now}
+                },
+                {"$set": {
+                    "owner": self.worker_id,
+                    "locked_until": now + timedelta(seconds=SCHEDULER_LOCK_TTL_SECONDS),
+                    "last_slot": slot
+                }},
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            # Another worker holds the lock or already ran this slot
+            return False
+    
+    async def _release_lock(self, name: str):
+        await db.scheduler_locks.update_one(
+            {"_id": name, "owner": self.worker_id},
+            {"$set": {"locked_until": datetime.now(timezone.utc)}}
+        )
+    
+    async def run_job(self, name: str, slot: Optional[datetime] = None, triggered_by: str = "schedule") -> Optional[dict]:
+        """Run a job under its leader lock and record the run; returns the run record"""
+        job = self.jobs[name]
+        # Manual runs get their own slot so a re-run right after a finished one is not mistaken for it
+        slot = slot or datetime.now(timezone.utc)
+        if not await self._acquire_lock(name, slot):
+            return None
+        
+        run = {
+            "id": str(uuid.uuid4()),
+            "job_name": name,
+            "worker_id": self.worker_id,
+            "triggered_by": triggered_by,
+            "scheduled_for": slot,
+            "started_at": datetime.now(timezone.utc),
+            "status": "running",
+        }
+        await db.job_runs.insert_one({**run})
+        started = time.perf_counter()
+        try:
+            result = await job["func"]()
+            run.update(status="success", result=result)
+        except Exception as e:
+            logger.exception(f"Scheduled job '{name}' failed")
+            run.update(status="failed", error=str(e))
+        finally:
+            run["finished_at"] = datetime.now(timezone.utc)
+            run["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            await db.job_runs.update_one(
+                {"id": run["id"]},
+                {"$set": {k: v for k, v in run.items() if k not in ("id", "job_name")}}
+            )
+            await self._release_lock(name)
+        logger.info(f"Scheduled job '{name}' {run['status']} in {run['duration_ms']}ms")
+        return run
+    
+    async def _loop(self):
+        now = datetime.now(timezone.utc)
+        for job in self.jobs.values():
+            job["next_run"] = job["schedule"].next_after(now)
+        while True:
+            now = datetime.now(timezone.utc)
+            for name, job in self.jobs.items():
+                if job["next_run"] > now:
+                    continue
+                slot = job["next_run"]
+                job["next_run"] = job["schedule"].next_after(now)
+                if name in self._running and not self._running[name].done():
+                    logger.warning(f"Skipping scheduled job '{name}': previous run still in progress")
+                    continue
+                self._running[name] = asyncio.create_task(self.run_job(name, slot))
+            next_due = min((job["next_run"] for job in self.jobs.values()), default=now + timedelta(minutes=1))
+            await asyncio.sleep(min(max((next_due - now).total_seconds(), 1), 60))
+    
+    def start(self):
+        if self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._loop())
+    
+    async def stop(self):
+        tasks = [t for t in [self._loop_task, *self._running.values()] if t]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+        self._running.clear()
+
+
+scheduler = JobScheduler()
+scheduler.register(
+    "notification_compaction", NOTIFICATION_COMPACTION_SCHEDULE, compact_notifications,
+    "Expire old read notifications and collapse repeated events"
+)
+scheduler.register(
+    "audit_archiving", AUDIT_ARCHIVE_SCHEDULE, archive_audit_logs,
+    "Move audit logs past the retention window to audit_logs_archive"
+)
+
+
+@api_router.get("/admin/scheduler/jobs")
+async def get_scheduled_jobs(user: dict = Depends(require_admin)):
+    """List scheduled jobs with their next run and timing metrics - admin only"""
+    stats = await db.job_runs.aggregate([
+        {"$match": {"status": {"$in": ["success", "failed"]}}},
+        {"$sort": {"started_at": 1}},
+        {"$group": {
+            "_id": "$job_name",
+            "runs": {"$sum": 1},
+            "failures": {"$sum": {"$cond": [{"$eq": ["$status", "failed"]}, 1, 0]}},
+            "avg_duration_ms": {"$avg": "$duration_ms"},
+            "max_duration_ms": {"$max": "$duration_ms"},
+            "last_run_at": {"$last": "$started_at"},
+            "last_status": {"$last": "$status"},
+            "last_duration_ms": {"$last": "$duration_ms"}
+        }}
+    ]).to_list(100)
+    stats_by_job = {item.pop("_id"): item for item in stats}
+    
+    return [
+        {
+            "name": name,
+            "description": job["description"],
+            "schedule": job["schedule"].expression,
+            "next_run": job["next_run"] or job["schedule"].next_after(datetime.now(timezone.utc)),
+            **stats_by_job.get(name, {"runs": 0, "failures": 0})
+        }
+        for name, job in scheduler.jobs.items()
+    ]
+
+
+@api_router.get("/admin/scheduler/runs")
+async def get_job_runs(job_name: Optional[str] = None, limit: int = 50, user: dict = Depends(require_admin)):
+    """Get recent job run history - admin only"""
+    query = {"job_name": job_name} if job_name else {}
+    return await db.job_runs.find(query, {"_id": 0}).sort("started_at", -1).limit(limit).to_list(limit)
+
+
+@api_router.post("/admin/scheduler/jobs/{job_name}/run")
+async def trigger_scheduled_job(job_name: str, user: dict = Depends(require_admin)):
+    """Run a scheduled job immediately - admin only"""
+    if job_name not in scheduler.jobs:
+        raise HTTPException(status_code=404, detail="Job not found")
+    run = await scheduler.run_job(job_name, triggered_by="manual")
+    if run is None:
+        raise HTTPException(status_code=409, detail="Job is already running")
+    return run
+
+
+# Async jobs for heavy reports and exports
+class JobSubmit(BaseModel):
+    job_type: str
+    params: Dict = {}
+
+
+class Job(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    job_type: str
+    params: Dict = {}
+    status: str = "queued"  # queued, running, succeeded, failed
+    progress: float = 0  # 0-100
+    progress_message: str = ""
+    error: str = ""
+    result_id: str = ""
+    created_by: str = ""
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_job_semaphore: Optional[asyncio.Semaphore] = None
+_job_tasks: set = set()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Shared process pool for CPU-bound work, created on first use.
+
+    Uses the spawn start method so workers never inherit the event loop or
+    the Mongo client's background threads.
+    """
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=JOB_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _process_pool
+
+
+async def run_in_process(func, *args):
+    """Run a picklable module-level function in the process pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_process_pool(), func, *args)
+
+
+async def export_projects_job(params: dict, report_progress) -> dict:
+    """Export project headers with their estimated value"""
+    # Latest versions: the whole working set, plus archived latest versions from history if asked
+    sources = [(db.projects, {})]
+    if params.get("include_archived", False):
+        sources.append((db.project_history, {"is_archived": True, "is_latest_version": True}))
+    total = sum([await collection.count_documents(query) for collection, query in sources])
+    batch_size = int(params.get("batch_size", 200))
+    
+    rows = []
+    batch = []
+    
+    async def flush():
+        values = await run_in_process(price_projects, await hydrate_projects(batch))
+        for project, value in zip(batch, values):
+            rows.append({
+                "id": project["id"],
+                "project_number": project.get("project_number", ""),
+                "version": project.get("version", 1),
+                "name": project.get("name", ""),
+                "customer_name": project.get("customer_name", ""),
+                "status": project.get("status", "draft"),
+                "sales_manager_name": project.get("sales_manager_name", ""),
+                "created_by_name": project.get("created_by_name", ""),
+                "created_at": project.get("created_at"),
+                "value": value
+            })
+        batch.clear()
+        await report_progress(len(rows) / total * 100 if total else 100, f"Priced {len(rows)} of {total} projects")
+    
+    for collection, query in sources:
+        async for project in collection.find(query, {"_id": 0}):
+            batch.append(project)
+            if len(batch) >= batch_size:
+                await flush()
+    if batch:
+        await flush()
+    return {"total_projects": len(rows), "total_value": sum(r["value"] for r in rows), "projects": rows}
+
+
+def value_project_shard(projects: List[dict]) -> List[dict]:
+    """Value one shard of project documents in a worker process"""
+    return valuation_records(projects)
+
+
+async def revalue_portfolio(report_progress=None, shard_size: int = VALUATION_SHARD_SIZE) -> dict:
+    """Recompute the valuation of every project version into project_valuations.
+
+    Project ids are streamed from a cursor and grouped into shards. Each shard
+    is loaded, priced in the process pool and written back with a single
+    bulk_write; up to one shard per pool worker is in flight at a time so
+    throughput scales with the number of cores.
+    """
+    total = await db.projects.count_documents({}) + await db.project_history.count_documents({})
+    in_flight = asyncio.Semaphore(JOB_PROCESS_WORKERS)
+    tasks = []
+    valued = 0
+    
+    async def process_shard(collection, project_ids: List[str]):
+        nonlocal valued
+        try:
+            projects = await collection.find(
+                {"id": {"$in": project_ids}},
+                VALUATION_SOURCE_PROJECTION
+            ).to_list(None)
+            valuations = await run_in_process(value_project_shard, await hydrate_projects(projects))
+            computed_at = datetime.now(timezone.utc)
+            if valuations:
+                await write_valuations([valuation_upsert(v, computed_at) for v in valuations])
+            valued += len(valuations)
+            if report_progress:
+                await report_progress(valued / total * 100 if total else 100, f"Valued {valued} of {total} projects")
+        finally:
+            in_flight.release()
+    
+    started = time.perf_counter()
+    for collection in (db.projects, db.project_history):
+        shard = []
+        async for project in collection.find({}, {"_id": 0, "id": 1}).batch_size(shard_size):
+            shard.append(project["id"])
+            if len(shard) >= shard_size:
+                await in_flight.acquire()
+                tasks.append(asyncio.create_task(process_shard(collection, shard)))
+                shard = []
+        if shard:
+            await in_flight.acquire()
+            tasks.append(asyncio.create_task(process_shard(collection, shard)))
+    await asyncio.gather(*tasks)
+    
+    return {
+        "projects_valued": valued,
+        "shards": len(tasks),
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1)
+    }
+
+
+async def portfolio_valuation_job(params: dict, report_progress) -> dict:
+    return await revalue_portfolio(report_progress, int(params.get("shard_size", VALUATION_SHARD_SIZE)))
+
+
+JOB_TYPES = {
+    "projects_export": export_projects_job,
+    "portfolio_valuation": portfolio_valuation_job,
+}
+
+scheduler.register(
+    "valuation_recompute", VALUATION_RECOMPUTE_SCHEDULE, revalue_portfolio,
+    "Recompute materialized valuations for every project version"
+)
+
+
+async def store_job_result(job_id: str, result) -> str:
+    """Store a job result as a header in job_results plus fixed-size chunks in job_result_chunks,
+    so large exports stay under the 16MB document limit; both expire together"""
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(hours=JOB_RESULT_TTL_HOURS)
+    result_id = str(uuid.uuid4())
+    data = json.dumps(result, default=str).encode("utf-8")
+    chunks = [data[i:i + JOB_RESULT_CHUNK_BYTES] for i in range(0, len(data), JOB_RESULT_CHUNK_BYTES)] or [b""]
+    await db.job_result_chunks.insert_many([
+        {"result_id": result_id, "seq": seq, "data": chunk, "expires_at": expires_at}
+        for seq, chunk in enumerate(chunks)
+    ])
+    await db.job_results.insert_one({
+        "id": result_id,
+        "job_id": job_id,
+        "size": len(data),
+        "chunks": len(chunks),
+        "created_at": now,
+        "expires_at": expires_at
+    })
+    return result_id
+
+
+async def execute_job(job_id: str):
+    """Run a queued job, tracking status and progress, and store its result"""
+    global _job_semaphore
+    if _job_semaphore is None:
+        _job_semaphore = asyncio.Semaphore(JOB_MAX_CONCURRENCY)
+    
+    async with _job_semaphore:
+        now = datetime.now(timezone.utc)
+        job = await db.jobs.find_one_and_update(
+            {"id": job_id, "status": "queued"},
+            {"$set": {"status": "running", "started_at": now, "heartbeat_at": now}},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
+        )
+        if not job:
+            return
+        
+        async def report_progress(progress: float, message: str = ""):
+            await db.jobs.update_one(
+                {"id": job_id},
+                {"$set": {"progress": round(min(progress, 100), 1), "progress_message": message}}
+            )
+        
+        async def heartbeat():
+            # Lets recover_jobs tell a job still running elsewhere from one lost in a crash
+            while True:
+                await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+                await db.jobs.update_one({"id": job_id}, {"$set": {"heartbeat_at": datetime.now(timezone.utc)}})
+        
+        beating = asyncio.create_task(heartbeat())
+        try:
+            result = await JOB_TYPES[job["job_type"]](job.get("params", {}), report_progress)
+            result_id = await store_job_result(job_id, result)
+            await db.jobs.update_one(
+                {"id": job_id},
+                {"$set": {"status": "succeeded", "progress": 100, "result_id": result_id,
+                          "finished_at": datetime.now(timezone.utc)}}
+            )
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back so the next startup runs it again
+            await asyncio.shield(db.jobs.update_one(
+                {"id": job_id, "status": "running"},
+                {"$set": {"status": "queued", "progress": 0, "progress_message": ""}}
+            ))
+            raise
+        except Exception as e:
+            logger.exception(f"Job {job_id} ({job['job_type']}) failed")
+            await db.jobs.update_one(
+                {"id": job_id},
+                {"$set": {"status": "failed", "error": str(e), "finished_at": datetime.now(timezone.utc)}}
+            )
+        finally:
+            beating.cancel()
+
+
+def launch_job(job_id: str):
+    task = asyncio.create_task(execute_job(job_id))
+    _job_tasks.add(task)
+    task.add_done_callback(_job_tasks.discard)
+
+
+async def recover_jobs() -> dict:
+    """Fail jobs whose worker stopped heartbeating (a crash) and relaunch queued jobs whose task
+    was lost; execute_job claims atomically, so relaunching a job another worker holds is harmless"""
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(seconds=JOB_HEARTBEAT_SECONDS * 3)
+    failed = await db.jobs.update_many(
+        {"status": "running", "$or": [
+            {"heartbeat_at": {"$lt": cutoff}},
+            {"heartbeat_at": {"$exists": False}, "started_at": {"$lt": cutoff}}
+        ]},
+        {"$set": {"status": "failed", "error": "Interrupted by a server restart", "finished_at": now}}
+    )
+    queued = await db.jobs.find({"status": "queued"}, {"_id": 0, "id": 1}).to_list(None)
+    for job in queued:
+        launch_job(job["id"])
+    return {"failed": failed.modified_count, "requeued": len(queued)}
+
+
+@api_router.post("/jobs", response_model=Job)
+async def submit_job(input: JobSubmit, user: dict = Depends(require_auth)):
+    """Submit a background job; poll GET /jobs/{id} for progress"""
+    if input.job_type not in JOB_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown job type. Must be one of: {', '.join(sorted(JOB_TYPES))}"
+        )
+    job = Job(job_type=input.job_type, params=input.params, created_by=user["user_id"])
+    await db.jobs.insert_one(job.model_dump())
+    launch_job(job.id)
+    return job
+
+
+@api_router.get("/jobs", response_model=List[Job])
+async def get_jobs(limit: int = 50, user: dict = Depends(require_auth)):
+    """List the current user's recent jobs"""
+    return await db.jobs.find(
+        {"created_by": user["user_id"]}, {"_id": 0}
+    ).sort("created_at", -1).limit(limit).to_list(limit)
+
+
+@api_router.get("/jobs/{job_id}", response_model=Job)
+async def get_job(job_id: str, user: dict = Depends(require_auth)):
+    job = await db.jobs.find_one({"id": job_id, "created_by": user["user_id"]}, {"_id": 0})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@api_router.get("/jobs/{job_id}/result")
+async def download_job_result(job_id: str, user: dict = Depends(require_auth)):
+    """Download a finished job's result as a JSON attachment"""
+    job = await db.jobs.find_one({"id": job_id, "created_by": user["user_id"]}, {"_id": 0})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    result = await db.job_results.find_one({"id": job["result_id"]}, {"_id": 0})
+    headers = {"Content-Disposition": f'attachment; filename="{job["job_type"]}-{job_id}.json"'}
+    if result and "data" in result:
+        # Stored before results were chunked
+        return Response(content=result["data"], media_type="application/json", headers=headers)
+    if not result or await db.job_result_chunks.count_documents({"result_id": result["id"]}) != result["chunks"]:
+        raise HTTPException(status_code=410, detail="Job result has expired")
+    
+    async def stream_chunks():
+        cursor = db.job_result_chunks.find({"result_id": result["id"]}, {"_id": 0, "data": 1}).sort("seq", ASCENDING)
+        async for chunk in cursor.batch_size(1):
+            yield bytes(chunk["data"])
+    
+    return StreamingResponse(stream_chunks(), media_type="application/json", headers=headers)
+
+
+# Response compression.
+# Project, version and template payloads repeat the same skill, location and logistics values on
+# every allocation row, so they compress very well. Buffered responses of at least
+# COMPRESSION_MINIMUM_SIZE bytes are compressed with the best encoding the client accepts;
+# streamed responses and responses that already carry a Content-Encoding pass through.
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br or gzip from an Accept-Encoding header by q-value (br wins ties), or None"""
+    supported = ["br", "gzip"] if brotli is not None else ["gzip"]
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name == "*":
+            for encoding in supported:
+                weights.setdefault(encoding, quality)
+        elif name in supported:
+            weights[name] = quality
+    accepted = [e for e in supported if weights.get(e, 0) > 0]
+    if not accepted:
+        return None
+    return max(accepted, key=lambda e: weights[e])
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = COMPRESSION_MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        start_message = None
+        
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # Hold the headers until the first body chunk shows whether to compress
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+            start, start_message = start_message, None
+            headers = MutableHeaders(raw=start["headers"])
+            body = message.get("body", b"")
+            if message.get("more_body") or len(body) < self.minimum_size or "content-encoding" in headers:
+                await send(start)
+                await send(message)
+                return
+            body = compress_body(body, encoding)
+            headers["Content-Encoding"] = encoding
+            if "etag" in headers and not headers["etag"].startswith("W/"):
+                # The compressed body is a different representation; If-None-Match compares weakly
+                headers["ETag"] = "W/" + headers["etag"]
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+        
+        await self.app(scope, receive, send_compressed)
+
+
 app.include_router(api_router)
 
+app.add_middleware(CompressionMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -2314,6 +5180,97 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+async def ensure_indexes():
+    """Create indexes the application relies on (idempotent)"""
+    await db.notifications.create_index([("user_email", ASCENDING), ("created_at", DESCENDING)])
+    # Read notifications expire automatically once past the retention window
+    ttl_seconds = NOTIFICATION_RETENTION_DAYS * 86400
+    try:
+        await db.notifications.create_index("read_at", name="read_at_ttl", expireAfterSeconds=ttl_seconds)
+    except OperationFailure:
+        # Retention changed since the index was created - update it in place
+        await db.command("collMod", "notifications", index={"name": "read_at_ttl", "expireAfterSeconds": ttl_seconds})
+    await db.job_runs.create_index([("job_name", ASCENDING), ("started_at", DESCENDING)])
+    await db.job_runs.create_index("started_at", expireAfterSeconds=JOB_RUN_HISTORY_DAYS * 86400)
+    await db.audit_logs_archive.create_index("project_id")
+    await db.jobs.create_index("id", unique=True)
+    await db.jobs.create_index([("created_by", ASCENDING), ("created_at", DESCENDING)])
+    await db.job_results.create_index("id", unique=True)
+    await db.job_results.create_index("expires_at", expireAfterSeconds=0)
+    await db.job_result_chunks.create_index([("result_id", ASCENDING), ("seq", ASCENDING)], unique=True)
+    await db.job_result_chunks.create_index("expires_at", expireAfterSeconds=0)
+    await db.jobs.create_index("status")
+    await db.project_valuations.create_index("project_id", unique=True)
+    await db.project_valuations.create_index([("project_number", ASCENDING), ("version", ASCENDING)])
+    await db.schema_migrations.create_index("version", unique=True)
+    await db.master_data_versions.create_index("collection", unique=True)
+    await db.projects.create_index([("project_number", ASCENDING), ("version", DESCENDING)])
+    # Project history: read-through by id and project number, delta bases and dependents, archive listing
+    await db.project_history.create_index("id", unique=True)
+    await db.project_history.create_index([("project_number", ASCENDING), ("version", DESCENDING)])
+    await db.project_history.create_index("waves_base_id", sparse=True)
+    await db.project_history.create_index(
+        [("is_archived", ASCENDING), ("is_latest_version", ASCENDING), ("archived_at", DESCENDING)]
+    )
+    await db.projects.create_index("id", unique=True)
+    try:
+        await db.skills.create_index([("name", ASCENDING), ("technology_id", ASCENDING)], unique=True)
+    except OperationFailure as e:
+        # Skills duplicated before the index existed have to be merged by hand first
+        logger.warning(f"Skills unique index not created: {str(e)}")
+    try:
+        await db.proficiency_rates.create_index(
+            [("skill_id", ASCENDING), ("base_location_id", ASCENDING), ("proficiency_level", ASCENDING)], unique=True
+        )
+    except OperationFailure as e:
+        # Same for rates entered twice for one skill, location and level
+        logger.warning(f"Proficiency rates unique index not created: {str(e)}")
+
+
+@app.on_event("startup")
+async def startup_background_tasks():
+    global _schema_task
+    try:
+        await ensure_indexes()
+    except Exception as e:
+        logger.error(f"Failed to ensure indexes: {str(e)}")
+    try:
+        schema_state["version"] = await run_schema_migrations()
+    except Exception as e:
+        logger.error(f"Failed to run schema migrations: {str(e)}")
+    if schema_state["version"] < SCHEMA_VERSION:
+        logger.error(
+            f"Schema is at version {schema_state['version']} of {SCHEMA_VERSION}; "
+            f"see /api/admin/maintenance/schema. Retrying in the background"
+        )
+        _schema_task = asyncio.create_task(complete_schema_migrations())
+    try:
+        await master_data_cache.load_all()
+    except Exception as e:
+        logger.error(f"Failed to load master data cache: {str(e)}")
+    cache_listener.start()
+    try:
+        recovered = await recover_jobs()
+        if any(recovered.values()):
+            logger.info(f"Recovered background jobs: {recovered}")
+    except Exception as e:
+        logger.error(f"Failed to recover background jobs: {str(e)}")
+    if SCHEDULER_ENABLED:
+        scheduler.start()
+
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await scheduler.stop()
+    await cache_listener.stop()
+    await valuation_refresher.stop()
+    if _schema_task is not None:
+        _schema_task.cancel()
+        await asyncio.gather(_schema_task, return_exceptions=True)
+    for task in list(_job_tasks):
+        task.cancel()
+    await asyncio.gather(*_job_tasks, return_exceptions=True)
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
     client.close()
\ No newline at end of file
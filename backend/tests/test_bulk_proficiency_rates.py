@@ -0,0 +1,78 @@
+"""
+Bulk Proficiency Rate Import Tests:
+- POST /api/proficiency-rates/bulk resolves skills and locations by name
+- Rows repeated in the sheet and rates that already exist are reported as duplicates
+- Unknown names, levels and non-positive salaries are reported as invalid
+- update_existing re-prices existing rates
+"""
+
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+
+@pytest.fixture
+def master_data():
+    """A technology, skill and base location to import rates against"""
+    technology = requests.post(f"{BASE_URL}/api/technologies", json={"name": "TEST_BulkTech"}).json()
+    skill = requests.post(f"{BASE_URL}/api/skills", json={
+        "name": "TEST_BulkSkill", "technology_id": technology["id"], "technology_name": technology["name"]
+    }).json()
+    location = requests.post(f"{BASE_URL}/api/base-locations", json={"name": "TEST_BulkLocation", "overhead_percentage": 20}).json()
+    yield skill, location
+    for rate in requests.get(f"{BASE_URL}/api/proficiency-rates").json():
+        if rate["skill_id"] == skill["id"]:
+            requests.delete(f"{BASE_URL}/api/proficiency-rates/{rate['id']}")
+    requests.delete(f"{BASE_URL}/api/skills/{skill['id']}")
+    requests.delete(f"{BASE_URL}/api/base-locations/{location['id']}")
+    requests.delete(f"{BASE_URL}/api/technologies/{technology['id']}")
+
+
+def row(level, salary=5000, **overrides):
+    return {
+        "technology_name": "test_bulktech",
+        "skill_name": "test_bulkskill",
+        "base_location_name": "TEST_BulkLocation",
+        "proficiency_level": level,
+        "avg_monthly_salary": salary,
+        **overrides
+    }
+
+
+class TestBulkProficiencyRates:
+    """POST /api/proficiency-rates/bulk"""
+
+    def test_rows_classified(self, master_data):
+        skill, _ = master_data
+        rows = [
+            row("Senior"),
+            row("Senior", 6000),
+            row("Bogus"),
+            row("Lead", 0),
+            row("Lead", skill_name="TEST_Missing"),
+        ]
+        response = requests.post(f"{BASE_URL}/api/proficiency-rates/bulk", json={"rows": rows})
+        assert response.status_code == 200, response.text
+        data = response.json()
+        assert (data["created"], data["duplicate"], data["invalid"]) == (1, 1, 3)
+        assert [r["status"] for r in data["results"]] == ["created", "duplicate", "invalid", "invalid", "invalid"]
+
+        created = [r for r in requests.get(f"{BASE_URL}/api/proficiency-rates").json() if r["id"] == data["results"][0]["id"]]
+        assert created[0]["skill_id"] == skill["id"] and created[0]["avg_monthly_salary"] == 5000
+        print("PASS: Rows created, duplicated and rejected in one request")
+
+    def test_existing_rates(self, master_data):
+        requests.post(f"{BASE_URL}/api/proficiency-rates/bulk", json={"rows": [row("Mid")]})
+
+        data = requests.post(f"{BASE_URL}/api/proficiency-rates/bulk", json={"rows": [row("Mid", 7000)]}).json()
+        assert data["results"][0] == {"index": 0, "status": "duplicate", "detail": "Rate already exists"}
+
+        data = requests.post(
+            f"{BASE_URL}/api/proficiency-rates/bulk", json={"rows": [row("Mid", 7000)], "update_existing": True}
+        ).json()
+        assert data["updated"] == 1
+        rates = {r["id"]: r for r in requests.get(f"{BASE_URL}/api/proficiency-rates").json()}
+        assert rates[data["results"][0]["id"]]["avg_monthly_salary"] == 7000
+        print("PASS: Existing rates reported as duplicates or re-priced")
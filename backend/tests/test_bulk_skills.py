@@ -0,0 +1,53 @@
+"""
+Bulk Skill Import Tests:
+- POST /api/skills/bulk resolves technologies by name
+- Existing skills and rows repeated in the sheet are reported as duplicates
+- Unknown technologies and blank names are reported as invalid
+"""
+
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+
+@pytest.fixture
+def technology():
+    technology = requests.post(f"{BASE_URL}/api/technologies", json={"name": "TEST_BulkSkillTech"}).json()
+    yield technology
+    for skill in requests.get(f"{BASE_URL}/api/skills").json():
+        if skill["technology_id"] == technology["id"]:
+            requests.delete(f"{BASE_URL}/api/skills/{skill['id']}")
+    requests.delete(f"{BASE_URL}/api/technologies/{technology['id']}")
+
+
+class TestBulkSkills:
+    """POST /api/skills/bulk"""
+
+    def test_rows_classified(self, technology):
+        requests.post(f"{BASE_URL}/api/skills", json={
+            "name": "TEST_Existing", "technology_id": technology["id"], "technology_name": technology["name"]
+        })
+        rows = [
+            {"technology_name": "test_bulkskilltech", "name": "TEST_Existing"},
+            {"technology_name": "TEST_BulkSkillTech", "name": "TEST_New"},
+            {"technology_name": "TEST_BulkSkillTech", "name": "test_new"},
+            {"technology_name": "TEST_MissingTech", "name": "TEST_Orphan"},
+            {"technology_name": "TEST_BulkSkillTech", "name": " "},
+        ]
+        response = requests.post(f"{BASE_URL}/api/skills/bulk", json={"rows": rows})
+        assert response.status_code == 200, response.text
+        data = response.json()
+        assert (data["created"], data["duplicate"], data["invalid"]) == (1, 2, 2)
+        assert [r["status"] for r in data["results"]] == ["duplicate", "created", "duplicate", "invalid", "invalid"]
+
+        skills = [s for s in requests.get(f"{BASE_URL}/api/skills").json() if s["technology_id"] == technology["id"]]
+        assert sorted(s["name"] for s in skills) == ["TEST_Existing", "TEST_New"]
+        print("PASS: Skills created, duplicated and rejected in one request")
+
+    def test_too_many_rows_rejected(self):
+        rows = [{"technology_name": "TEST_BulkSkillTech", "name": f"TEST_{i}"} for i in range(5001)]
+        response = requests.post(f"{BASE_URL}/api/skills/bulk", json={"rows": rows})
+        assert response.status_code == 400
+        print("PASS: Oversized import rejected")
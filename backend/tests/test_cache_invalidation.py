@@ -0,0 +1,53 @@
+"""
+Cache Invalidation Tests:
+- GET /api/admin/maintenance/cache reports how this worker follows master data writes
+- A write moves the cached collection to the new ETag
+"""
+
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    """Get authentication headers"""
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={
+        "email": "admin@emergent.com",
+        "password": "password"
+    })
+    if response.status_code == 200:
+        return {"Authorization": f"Bearer {response.json().get('token')}"}
+    pytest.skip("Authentication failed - skipping authenticated tests")
+
+
+class TestCacheInvalidation:
+    """GET /api/admin/maintenance/cache"""
+
+    def test_cache_status_requires_auth(self):
+        response = requests.get(f"{BASE_URL}/api/admin/maintenance/cache")
+        assert response.status_code == 401, f"Expected 401, got {response.status_code}"
+        print("PASS: Cache status requires authentication")
+
+    def test_invalidation_mode(self, auth_headers):
+        data = requests.get(f"{BASE_URL}/api/admin/maintenance/cache", headers=auth_headers).json()
+        assert data["invalidation_mode"] in ("change_stream", "polling")
+        assert data["poll_interval_seconds"] > 0
+        print(f"PASS: Cache invalidation mode is {data['invalidation_mode']}")
+
+    def test_write_refreshes_cached_collection(self, auth_headers):
+        created = requests.post(
+            f"{BASE_URL}/api/technologies", json={"name": "TEST_CacheTechnology"}
+        ).json()
+        try:
+            etag = requests.get(f"{BASE_URL}/api/technologies").headers["ETag"]
+            status = requests.get(f"{BASE_URL}/api/admin/maintenance/cache", headers=auth_headers).json()
+            # A request may land on another worker; when this one has the collection cached it must be current
+            cached = status["collections"].get("technologies")
+            if cached:
+                assert cached["etag"] == etag.removeprefix("W/")
+        finally:
+            requests.delete(f"{BASE_URL}/api/technologies/{created['id']}")
+        print("PASS: Cached technologies follow the write")
@@ -0,0 +1,107 @@
+"""
+Estimate Content Hashing Tests:
+- Projects carry a content hash and one hash per wave
+- Saving unchanged content does not write (revision and updated_at stay the same)
+- Changing one wave changes only that wave's hash
+- A new version identical to an earlier one is flagged
+"""
+
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+
+def allocation(allocation_id, phases):
+    return {
+        "id": allocation_id,
+        "skill_id": "TEST_skill",
+        "skill_name": "TEST Dev",
+        "proficiency_level": "Senior",
+        "avg_monthly_salary": 5000,
+        "base_location_id": "TEST_location",
+        "base_location_name": "TEST Location",
+        "overhead_percentage": 20,
+        "phase_allocations": phases
+    }
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    """Get authentication headers"""
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={
+        "email": "admin@emergent.com",
+        "password": "password"
+    })
+    if response.status_code == 200:
+        return {"Authorization": f"Bearer {response.json().get('token')}"}
+    pytest.skip("Authentication failed - skipping authenticated tests")
+
+
+@pytest.fixture
+def project(auth_headers):
+    """Project with two waves"""
+    waves = [
+        {"id": "TEST_wave_1", "name": "Wave 1", "duration_months": 2, "grid_allocations": [allocation("TEST_a1", {"0": 1})]},
+        {"id": "TEST_wave_2", "name": "Wave 2", "duration_months": 1, "grid_allocations": [allocation("TEST_a2", {"0": 1})]},
+    ]
+    created = requests.post(f"{BASE_URL}/api/projects", json={"name": "TEST_ContentHash", "waves": waves}, headers=auth_headers).json()
+    ids = [created["id"]]
+    yield created, ids
+    for project_id in reversed(ids):
+        requests.delete(f"{BASE_URL}/api/projects/{project_id}", headers=auth_headers)
+
+
+class TestContentHashing:
+    """content_hash / wave_hashes on projects"""
+
+    def test_hashes_stored_on_create(self, project):
+        created, _ = project
+        assert len(created["content_hash"]) == 64
+        assert [w["id"] for w in created["wave_hashes"]] == ["TEST_wave_1", "TEST_wave_2"]
+        print("PASS: Content and wave hashes stored on create")
+
+    def test_unchanged_save_is_skipped(self, project, auth_headers):
+        created, _ = project
+        stored = requests.get(f"{BASE_URL}/api/projects/{created['id']}").json()
+        response = requests.put(
+            f"{BASE_URL}/api/projects/{created['id']}",
+            json={"name": created["name"], "waves": created["waves"], "revision": 0},
+            headers=auth_headers
+        )
+        assert response.status_code == 200, response.text
+        data = response.json()
+        assert data["revision"] == 0
+        assert data["updated_at"] == stored["updated_at"]
+        assert data["content_hash"] == created["content_hash"]
+        print("PASS: Unchanged save skipped")
+
+    def test_changed_wave_rehashed(self, project, auth_headers):
+        created, _ = project
+        waves = created["waves"]
+        waves[1]["name"] = "Wave 2 renamed"
+        data = requests.put(
+            f"{BASE_URL}/api/projects/{created['id']}", json={"waves": waves, "revision": 0}, headers=auth_headers
+        ).json()
+        assert data["revision"] == 1
+        assert data["content_hash"] != created["content_hash"]
+        assert data["wave_hashes"][0] == created["wave_hashes"][0]
+        assert data["wave_hashes"][1] != created["wave_hashes"][1]
+        assert requests.get(f"{BASE_URL}/api/projects/{created['id']}").json()["waves"][1]["name"] == "Wave 2 renamed"
+        print("PASS: Only the changed wave is rehashed")
+
+    def test_identical_new_version_flagged(self, project, auth_headers):
+        created, ids = project
+        same = requests.post(
+            f"{BASE_URL}/api/projects/{created['id']}/new-version", json={"version_notes": "TEST no changes"}, headers=auth_headers
+        ).json()
+        ids.append(same["id"])
+        assert same["duplicate_of_version"] == 1
+
+        changed = requests.post(
+            f"{BASE_URL}/api/projects/{same['id']}/new-version", json={"profit_margin_percentage": 20}, headers=auth_headers
+        ).json()
+        ids.append(changed["id"])
+        assert changed["duplicate_of_version"] is None
+        print("PASS: Identical new version flagged")
@@ -0,0 +1,95 @@
+"""
+Fast Project Response Tests:
+- Project reads return every Project field, with model defaults for fields not stored
+- Waves and allocations are shaped to their models the same way
+- Timestamps are serialized as UTC ISO strings, as with response_model
+- include_waves=false still returns an empty waves list
+"""
+
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+WAVE_FIELDS = {"id", "name", "duration_months", "phase_names", "logistics_config", "nego_buffer_percentage", "grid_allocations"}
+ALLOCATION_FIELDS = {"id", "skill_id", "proficiency_level", "avg_monthly_salary", "phase_allocations", "num_trips"}
+
+PROJECT_FIELDS = {
+    "id", "project_number", "version", "revision", "content_hash", "wave_hashes", "name", "waves",
+    "is_latest_version", "is_archived", "status", "submitted_at", "created_at", "updated_at"
+}
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    """Get authentication headers"""
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={
+        "email": "admin@emergent.com",
+        "password": "password"
+    })
+    if response.status_code == 200:
+        return {"Authorization": f"Bearer {response.json().get('token')}"}
+    pytest.skip("Authentication failed - skipping authenticated tests")
+
+
+@pytest.fixture(scope="module")
+def project(auth_headers):
+    """Project with one wave"""
+    waves = [{"id": "TEST_wave_1", "name": "Wave 1", "duration_months": 1, "grid_allocations": []}]
+    created = requests.post(f"{BASE_URL}/api/projects", json={"name": "TEST_FastResponse", "waves": waves}, headers=auth_headers).json()
+    yield created
+    requests.delete(f"{BASE_URL}/api/projects/{created['id']}", headers=auth_headers)
+
+
+class TestFastProjectResponses:
+    """Project read endpoints on the fast response path"""
+
+    def test_project_shape(self, project):
+        response = requests.get(f"{BASE_URL}/api/projects/{project['id']}")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/json")
+        data = response.json()
+        assert PROJECT_FIELDS <= set(data)
+        assert "_id" not in data
+        assert data["submitted_at"] is None
+        assert data["created_at"].endswith("Z")
+        assert data["waves"][0]["name"] == "Wave 1"
+        print("PASS: Project detail has the Project model shape")
+
+    def test_list_shape(self, project):
+        projects = requests.get(f"{BASE_URL}/api/projects").json()
+        listed = next(p for p in projects if p["id"] == project["id"])
+        assert PROJECT_FIELDS <= set(listed)
+        print(f"PASS: {len(projects)} listed projects have the Project model shape")
+
+    def test_nested_shape(self, auth_headers):
+        waves = [{"id": "TEST_wave_1", "name": "Wave 1", "duration_months": 1}]
+        project = requests.post(f"{BASE_URL}/api/projects", json={"name": "TEST_FastNested", "waves": waves}, headers=auth_headers).json()
+        allocation = {
+            "skill_id": "TEST_skill", "skill_name": "Test Skill", "proficiency_level": "Senior",
+            "avg_monthly_salary": 5000, "base_location_id": "TEST_loc", "base_location_name": "Test Location",
+            "overhead_percentage": 10
+        }
+        response = requests.put(
+            f"{BASE_URL}/api/projects/{project['id']}/waves/TEST_wave_1/allocations/TEST_alloc_1",
+            json=allocation, headers=auth_headers
+        )
+        assert response.status_code == 200
+        wave = requests.get(f"{BASE_URL}/api/projects/{project['id']}").json()["waves"][0]
+        assert WAVE_FIELDS <= set(wave)
+        assert ALLOCATION_FIELDS <= set(wave["grid_allocations"][0])
+        assert wave["grid_allocations"][0]["num_trips"] == 0
+        requests.delete(f"{BASE_URL}/api/projects/{project['id']}", headers=auth_headers)
+        print("PASS: Waves and allocations have their model shape")
+
+    def test_versions_without_waves(self, project):
+        versions = requests.get(f"{BASE_URL}/api/projects/{project['id']}/versions", params={"include_waves": "false"}).json()
+        assert versions[0]["waves"] == []
+        assert versions[0]["wave_hashes"] == project["wave_hashes"]
+        print("PASS: Versions without waves return an empty waves list")
+
+    def test_missing_project_404(self):
+        response = requests.get(f"{BASE_URL}/api/projects/TEST_missing")
+        assert response.status_code == 404
+        print("PASS: Missing project returns 404")
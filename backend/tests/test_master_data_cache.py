@@ -0,0 +1,75 @@
+"""
+Master Data Cache Tests:
+- Creates, updates and deletes are visible on the next read
+- Duplicate skills and proficiency rates are rejected via the cached indexes
+- Sales manager filters and lookups are served from the cache
+"""
+
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+
+@pytest.fixture
+def rate():
+    payload = {
+        "skill_id": "TEST_cache_skill",
+        "skill_name": "TEST Cache Skill",
+        "technology_id": "TEST_tech",
+        "technology_name": "TEST Tech",
+        "base_location_id": "TEST_location",
+        "base_location_name": "TEST Location",
+        "proficiency_level": "Senior",
+        "avg_monthly_salary": 5000
+    }
+    created = requests.post(f"{BASE_URL}/api/proficiency-rates", json=payload).json()
+    yield payload, created
+    requests.delete(f"{BASE_URL}/api/proficiency-rates/{created['id']}")
+
+
+class TestMasterDataCache:
+    """Reads served from the in-process cache"""
+
+    def test_write_visible_on_next_read(self, rate):
+        _, created = rate
+        rates = {r["id"]: r for r in requests.get(f"{BASE_URL}/api/proficiency-rates").json()}
+        assert rates[created["id"]]["avg_monthly_salary"] == 5000
+
+        requests.put(f"{BASE_URL}/api/proficiency-rates/{created['id']}", params={"avg_monthly_salary": 6000})
+        rates = {r["id"]: r for r in requests.get(f"{BASE_URL}/api/proficiency-rates").json()}
+        assert rates[created["id"]]["avg_monthly_salary"] == 6000
+
+        requests.delete(f"{BASE_URL}/api/proficiency-rates/{created['id']}")
+        assert created["id"] not in [r["id"] for r in requests.get(f"{BASE_URL}/api/proficiency-rates").json()]
+        print("PASS: Create, update and delete visible on the next read")
+
+    def test_duplicate_rate_rejected(self, rate):
+        payload, _ = rate
+        response = requests.post(f"{BASE_URL}/api/proficiency-rates", json=payload)
+        assert response.status_code == 400
+        print("PASS: Duplicate proficiency rate rejected")
+
+    def test_duplicate_skill_rejected(self):
+        payload = {"name": "TEST_CacheSkill", "technology_id": "TEST_tech", "technology_name": "TEST Tech"}
+        created = requests.post(f"{BASE_URL}/api/skills", json=payload).json()
+        try:
+            assert requests.post(f"{BASE_URL}/api/skills", json=payload).status_code == 400
+        finally:
+            requests.delete(f"{BASE_URL}/api/skills/{created['id']}")
+        print("PASS: Duplicate skill rejected")
+
+    def test_sales_manager_filters(self):
+        created = requests.post(f"{BASE_URL}/api/sales-managers", json={"name": "TEST_CacheManager", "is_active": False}).json()
+        try:
+            active = [m["id"] for m in requests.get(f"{BASE_URL}/api/sales-managers", params={"active_only": "true"}).json()]
+            assert created["id"] not in active
+            assert requests.get(f"{BASE_URL}/api/sales-managers/{created['id']}").json()["name"] == "TEST_CacheManager"
+
+            requests.put(f"{BASE_URL}/api/sales-managers/{created['id']}", json={"is_active": True})
+            active = [m["id"] for m in requests.get(f"{BASE_URL}/api/sales-managers", params={"active_only": "true"}).json()]
+            assert created["id"] in active
+        finally:
+            requests.delete(f"{BASE_URL}/api/sales-managers/{created['id']}")
+        print("PASS: Sales manager filters served from the cache")
@@ -0,0 +1,131 @@
+"""
+Optimistic Concurrency Tests:
+- Project updates bump the revision
+- A stale revision is rejected with 409 instead of overwriting newer changes
+- Wave endpoints honour the ?revision= precondition
+- Workflow transitions (submit, approve, reject) bump the revision and check the current status
+"""
+
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    """Get authentication headers"""
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={
+        "email": "admin@emergent.com",
+        "password": "password"
+    })
+    if response.status_code == 200:
+        return {"Authorization": f"Bearer {response.json().get('token')}"}
+    pytest.skip("Authentication failed - skipping authenticated tests")
+
+
+@pytest.fixture
+def project(auth_headers):
+    """Create a throwaway project with one wave"""
+    response = requests.post(f"{BASE_URL}/api/projects", json={
+        "name": "TEST_Concurrency_Project",
+        "waves": [{"id": "TEST_wave_1", "name": "Wave 1", "duration_months": 3, "grid_allocations": []}]
+    }, headers=auth_headers)
+    assert response.status_code == 200, f"Failed to create project: {response.text}"
+    project = response.json()
+    yield project
+    requests.delete(f"{BASE_URL}/api/projects/{project['id']}", headers=auth_headers)
+
+
+class TestProjectRevision:
+    """PUT /api/projects/{id} with a revision precondition"""
+
+    def test_new_project_starts_at_revision_zero(self, project):
+        assert project["revision"] == 0
+        print("PASS: New project starts at revision 0")
+
+    def test_update_bumps_revision(self, project, auth_headers):
+        response = requests.put(
+            f"{BASE_URL}/api/projects/{project['id']}",
+            json={"name": "TEST_Concurrency_Renamed", "revision": 0},
+            headers=auth_headers
+        )
+        assert response.status_code == 200, response.text
+        data = response.json()
+        assert data["revision"] == 1
+        assert data["name"] == "TEST_Concurrency_Renamed"
+        print("PASS: Update bumps revision")
+
+    def test_stale_revision_conflicts(self, project, auth_headers):
+        url = f"{BASE_URL}/api/projects/{project['id']}"
+        first = requests.put(url, json={"name": "TEST_Editor_A", "revision": 0}, headers=auth_headers)
+        assert first.status_code == 200
+        second = requests.put(url, json={"name": "TEST_Editor_B", "revision": 0}, headers=auth_headers)
+        assert second.status_code == 409, f"Expected 409, got {second.status_code}"
+
+        current = requests.get(url).json()
+        assert current["name"] == "TEST_Editor_A", "Stale write must not overwrite the newer change"
+        print("PASS: Stale revision rejected with 409")
+
+    def test_missing_project_is_404(self, auth_headers):
+        response = requests.put(
+            f"{BASE_URL}/api/projects/TEST_missing_project",
+            json={"name": "x", "revision": 0},
+            headers=auth_headers
+        )
+        assert response.status_code == 404
+        print("PASS: Missing project returns 404")
+
+
+class TestWaveRevision:
+    """Wave endpoints with ?revision="""
+
+    def test_wave_update_with_stale_revision(self, project, auth_headers):
+        url = f"{BASE_URL}/api/projects/{project['id']}/waves/TEST_wave_1"
+        first = requests.patch(f"{url}?revision=0", json={"name": "Wave A"}, headers=auth_headers)
+        assert first.status_code == 200, first.text
+        assert first.json()["revision"] == 1
+
+        stale = requests.patch(f"{url}?revision=0", json={"name": "Wave B"}, headers=auth_headers)
+        assert stale.status_code == 409
+        print("PASS: Wave update honours revision precondition")
+
+
+class TestStatusTransitions:
+    """Submit, approve and reject are in-place updates too"""
+
+    def test_save_after_submit_conflicts(self, project, auth_headers):
+        url = f"{BASE_URL}/api/projects/{project['id']}"
+        submit = requests.post(f"{url}/submit-for-review?approver_email=test@example.com", headers=auth_headers)
+        assert submit.status_code == 200, submit.text
+
+        stale = requests.put(url, json={"status": "draft", "name": "TEST_Stale_Save", "revision": 0}, headers=auth_headers)
+        assert stale.status_code == 409, f"Expected 409, got {stale.status_code}"
+        current = requests.get(url).json()
+        assert current["status"] == "in_review"
+        assert current["revision"] == 1
+        print("PASS: Save at the revision before submit rejected with 409")
+
+        sync = requests.post(f"{url}/sync", json={
+            "base_revision": 0,
+            "operations": [{"op": "rename_wave", "wave_id": "TEST_wave_1", "name": "TEST_Stale_Wave"}]
+        }, headers=auth_headers)
+        assert sync.status_code == 409, f"Expected 409, got {sync.status_code}"
+        assert requests.get(url).json()["waves"][0]["name"] == "Wave 1"
+        print("PASS: Autosave after submit rejected with 409")
+
+    def test_transition_from_wrong_status_conflicts(self, project, auth_headers):
+        url = f"{BASE_URL}/api/projects/{project['id']}"
+        approve = requests.post(f"{url}/approve?comments=ok", headers=auth_headers)
+        assert approve.status_code == 409, "A draft cannot be approved"
+
+        requests.post(f"{url}/submit-for-review?approver_email=test@example.com", headers=auth_headers)
+        again = requests.post(f"{url}/submit-for-review?approver_email=test@example.com", headers=auth_headers)
+        assert again.status_code == 409, "A project in review cannot be submitted again"
+
+        reject = requests.post(f"{url}/reject?comments=no", headers=auth_headers)
+        assert reject.status_code == 200
+        assert requests.post(f"{url}/approve?comments=ok", headers=auth_headers).status_code == 409
+        assert requests.get(url).json()["status"] == "rejected"
+        print("PASS: Transitions only apply from the expected status")
@@ -0,0 +1,103 @@
+"""
+Project History Tests:
+- Superseded versions and archived projects are read through from project_history
+- Archived projects are listed, readable and read-only until unarchived
+- Versions list still returns every version
+- Archived templates are still listed, instantiated and can be un-flagged
+"""
+
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    """Get authentication headers"""
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={
+        "email": "admin@emergent.com",
+        "password": "password"
+    })
+    if response.status_code == 200:
+        return {"Authorization": f"Bearer {response.json().get('token')}"}
+    pytest.skip("Authentication failed - skipping authenticated tests")
+
+
+@pytest.fixture
+def versioned_project(auth_headers):
+    """v1 superseded by v2"""
+    v1 = requests.post(f"{BASE_URL}/api/projects", json={"name": "TEST_History"}, headers=auth_headers).json()
+    v2 = requests.post(
+        f"{BASE_URL}/api/projects/{v1['id']}/new-version", json={"version_notes": "TEST v2"}, headers=auth_headers
+    ).json()
+    yield v1, v2
+    for project in (v2, v1):
+        requests.delete(f"{BASE_URL}/api/projects/{project['id']}", headers=auth_headers)
+
+
+class TestProjectHistory:
+    """Read-through from project_history"""
+
+    def test_superseded_version_read_through(self, versioned_project):
+        v1, v2 = versioned_project
+        response = requests.get(f"{BASE_URL}/api/projects/{v1['id']}")
+        assert response.status_code == 200
+        assert response.json()["is_latest_version"] is False
+
+        versions = requests.get(f"{BASE_URL}/api/projects/{v2['id']}/versions").json()
+        assert [v["version"] for v in versions] == [2, 1]
+
+        listed = [p["id"] for p in requests.get(f"{BASE_URL}/api/projects").json()]
+        assert v2["id"] in listed and v1["id"] not in listed
+        print("PASS: Superseded version read through from history")
+
+    def test_superseded_version_read_only(self, versioned_project, auth_headers):
+        v1, _ = versioned_project
+        response = requests.put(f"{BASE_URL}/api/projects/{v1['id']}", json={"name": "TEST_Changed"}, headers=auth_headers)
+        assert response.status_code == 409
+        print("PASS: Superseded version is read-only")
+
+    def test_archive_round_trip(self, versioned_project, auth_headers):
+        _, v2 = versioned_project
+        assert requests.post(f"{BASE_URL}/api/projects/{v2['id']}/archive", headers=auth_headers).status_code == 200
+
+        archived = [p["id"] for p in requests.get(f"{BASE_URL}/api/projects/archived").json()]
+        assert v2["id"] in archived
+        assert v2["id"] not in [p["id"] for p in requests.get(f"{BASE_URL}/api/projects").json()]
+        assert requests.get(f"{BASE_URL}/api/projects/{v2['id']}").json()["is_archived"] is True
+
+        response = requests.put(f"{BASE_URL}/api/projects/{v2['id']}", json={"name": "TEST_Changed"}, headers=auth_headers)
+        assert response.status_code == 409
+
+        assert requests.post(f"{BASE_URL}/api/projects/{v2['id']}/unarchive", headers=auth_headers).status_code == 200
+        assert v2["id"] in [p["id"] for p in requests.get(f"{BASE_URL}/api/projects").json()]
+        response = requests.put(f"{BASE_URL}/api/projects/{v2['id']}", json={"name": "TEST_Changed"}, headers=auth_headers)
+        assert response.status_code == 200
+        print("PASS: Archive and unarchive move the project out of and back into the working set")
+
+    def test_archived_template_still_usable(self, auth_headers):
+        project = requests.post(f"{BASE_URL}/api/projects", json={"name": "TEST_TemplateHistory"}, headers=auth_headers).json()
+        created_ids = [project["id"]]
+        try:
+            response = requests.post(
+                f"{BASE_URL}/api/projects/{project['id']}/save-as-template", params={"template_name": "TEST_ArchivedTemplate"}
+            )
+            assert response.status_code == 200, response.text
+            assert requests.post(f"{BASE_URL}/api/projects/{project['id']}/archive", headers=auth_headers).status_code == 200
+
+            templates = [t["id"] for t in requests.get(f"{BASE_URL}/api/templates").json()]
+            assert project["id"] in templates
+
+            response = requests.post(f"{BASE_URL}/api/projects/create-from-template/{project['id']}", headers=auth_headers)
+            assert response.status_code == 200, response.text
+            created_ids.append(response.json()["id"])
+            assert response.json()["is_template"] is False
+
+            assert requests.post(f"{BASE_URL}/api/projects/{project['id']}/remove-template").status_code == 200
+            assert project["id"] not in [t["id"] for t in requests.get(f"{BASE_URL}/api/templates").json()]
+        finally:
+            for project_id in created_ids:
+                requests.delete(f"{BASE_URL}/api/projects/{project_id}", headers=auth_headers)
+        print("PASS: Archived template listed, instantiated and removed")
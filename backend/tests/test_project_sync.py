@@ -0,0 +1,120 @@
+"""
+Estimator Delta-Sync Tests:
+- A batch of grid operations is applied atomically and bumps the revision
+- A stale base revision is rebased onto the current state
+- Malformed batches are rejected without partial writes
+"""
+
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+ALLOCATION = {
+    "id": "TEST_alloc_1",
+    "skill_id": "TEST_skill",
+    "skill_name": "TEST Skill",
+    "proficiency_level": "Senior",
+    "avg_monthly_salary": 5000,
+    "base_location_id": "TEST_location",
+    "base_location_name": "TEST Location",
+    "overhead_percentage": 20,
+    "phase_allocations": {"0": 1}
+}
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    """Get authentication headers"""
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={
+        "email": "admin@emergent.com",
+        "password": "password"
+    })
+    if response.status_code == 200:
+        return {"Authorization": f"Bearer {response.json().get('token')}"}
+    pytest.skip("Authentication failed - skipping authenticated tests")
+
+
+@pytest.fixture
+def project(auth_headers):
+    """Create a throwaway project with one wave and one resource"""
+    response = requests.post(f"{BASE_URL}/api/projects", json={
+        "name": "TEST_Sync_Project",
+        "waves": [{"id": "TEST_wave_1", "name": "Wave 1", "duration_months": 3, "grid_allocations": [ALLOCATION]}]
+    }, headers=auth_headers)
+    assert response.status_code == 200, f"Failed to create project: {response.text}"
+    project = response.json()
+    yield project
+    requests.delete(f"{BASE_URL}/api/projects/{project['id']}", headers=auth_headers)
+
+
+class TestProjectSync:
+    """POST /api/projects/{id}/sync"""
+
+    def test_batch_applied_in_order(self, project, auth_headers):
+        operations = [
+            {"op": "set_cell", "wave_id": "TEST_wave_1", "allocation_id": "TEST_alloc_1", "phase_key": "1", "value": 0.5},
+            {"op": "set_cell", "wave_id": "TEST_wave_1", "allocation_id": "TEST_alloc_1", "field": "is_onsite", "value": True},
+            {"op": "insert_row", "wave_id": "TEST_wave_1", "allocation": {**ALLOCATION, "id": "TEST_alloc_2"}},
+            {"op": "rename_wave", "wave_id": "TEST_wave_1", "name": "Wave 1 Renamed"},
+            {"op": "set_logistics", "wave_id": "TEST_wave_1", "logistics_config": {"num_trips": 3}},
+        ]
+        response = requests.post(
+            f"{BASE_URL}/api/projects/{project['id']}/sync",
+            json={"base_revision": 0, "operations": operations},
+            headers=auth_headers
+        )
+        assert response.status_code == 200, response.text
+        data = response.json()
+        assert data["revision"] == 1
+        assert data["applied"] == 5
+        assert data["rebased"] is False
+
+        wave = requests.get(f"{BASE_URL}/api/projects/{project['id']}").json()["waves"][0]
+        assert wave["name"] == "Wave 1 Renamed"
+        assert wave["logistics_config"]["num_trips"] == 3
+        assert [a["id"] for a in wave["grid_allocations"]] == ["TEST_alloc_1", "TEST_alloc_2"]
+        assert wave["grid_allocations"][0]["phase_allocations"] == {"0": 1, "1": 0.5}
+        assert wave["grid_allocations"][0]["is_onsite"] is True
+        print("PASS: Sync batch applied in order")
+
+    def test_stale_batch_is_rebased(self, project, auth_headers):
+        url = f"{BASE_URL}/api/projects/{project['id']}/sync"
+        delete_row = {"op": "delete_row", "wave_id": "TEST_wave_1", "allocation_id": "TEST_alloc_1"}
+        first = requests.post(url, json={"base_revision": 0, "operations": [delete_row]}, headers=auth_headers)
+        assert first.status_code == 200
+
+        stale = requests.post(url, json={"base_revision": 0, "operations": [
+            {"op": "set_cell", "wave_id": "TEST_wave_1", "allocation_id": "TEST_alloc_1", "phase_key": "0", "value": 2},
+            {"op": "rename_wave", "wave_id": "TEST_wave_1", "name": "Rebased"},
+        ]}, headers=auth_headers)
+        assert stale.status_code == 200, stale.text
+        data = stale.json()
+        assert data["rebased"] is True
+        assert data["revision"] == 2
+        assert data["applied"] == 1
+        assert data["dropped"] == [{"index": 0, "op": "set_cell", "reason": "allocation not found"}]
+        assert data["waves"][0]["name"] == "Rebased"
+        print("PASS: Stale batch rebased onto current state")
+
+    def test_invalid_batch_is_rejected_atomically(self, project, auth_headers):
+        response = requests.post(f"{BASE_URL}/api/projects/{project['id']}/sync", json={"base_revision": 0, "operations": [
+            {"op": "rename_wave", "wave_id": "TEST_wave_1", "name": "Should not persist"},
+            {"op": "set_cell", "wave_id": "TEST_wave_1", "allocation_id": "TEST_alloc_1", "field": "avg_monthly_salary", "value": "abc"},
+        ]}, headers=auth_headers)
+        assert response.status_code == 400
+
+        current = requests.get(f"{BASE_URL}/api/projects/{project['id']}").json()
+        assert current["revision"] == 0
+        assert current["waves"][0]["name"] == "Wave 1"
+        print("PASS: Invalid batch rejected without partial writes")
+
+    def test_future_base_revision_conflicts(self, project, auth_headers):
+        response = requests.post(
+            f"{BASE_URL}/api/projects/{project['id']}/sync",
+            json={"base_revision": 99, "operations": []},
+            headers=auth_headers
+        )
+        assert response.status_code == 409
+        print("PASS: Unknown base revision returns 409")
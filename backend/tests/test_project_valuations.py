@@ -0,0 +1,110 @@
+"""
+Project Valuation Tests:
+- POST /api/projects/valuations prices saved and inline projects
+- Figures follow calculateWaveSummary / calculateOverallSummary
+"""
+
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+INLINE_PROJECT = {
+    "name": "TEST_Inline_Valuation",
+    "profit_margin_percentage": 20,
+    "waves": [{
+        "id": "wave-1",
+        "name": "Wave 1",
+        "nego_buffer_percentage": 5,
+        "logistics_config": {
+            "per_diem_daily": 50, "per_diem_days": 30,
+            "accommodation_daily": 80, "accommodation_days": 30,
+            "local_conveyance_daily": 15, "local_conveyance_days": 21,
+            "flight_cost_per_trip": 450, "visa_medical_per_trip": 400,
+            "num_trips": 6, "contingency_percentage": 5
+        },
+        "grid_allocations": [
+            {"id": "a1", "avg_monthly_salary": 1000, "overhead_percentage": 10,
+             "is_onsite": True, "travel_required": True, "phase_allocations": {"0": 1, "1": 1}},
+            {"id": "a2", "avg_monthly_salary": 2000, "overhead_percentage": 0,
+             "is_onsite": False, "travel_required": False, "phase_allocations": {"0": 2}}
+        ]
+    }]
+}
+
+
+class TestProjectValuations:
+    """POST /api/projects/valuations"""
+
+    def test_inline_project_summary(self):
+        """Inline payload is priced like the estimator does"""
+        response = requests.post(f"{BASE_URL}/api/projects/valuations", json={"projects": [INLINE_PROJECT]})
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
+        valuation = response.json()["valuations"][0]
+        wave = valuation["waves"][0]["summary"]
+
+        # Rows: (2000 * 1.1) / 0.8 = 2750 onsite, 4000 / 0.8 = 5000 offshore
+        assert wave["totalMM"] == pytest.approx(4)
+        assert wave["onsiteSellingPrice"] == pytest.approx(2750)
+        assert wave["offshoreSellingPrice"] == pytest.approx(5000)
+        # Logistics: 2 traveling MM, 1 traveling resource
+        subtotal = 2 * 50 * 30 + 2 * 80 * 30 + 2 * 15 * 21 + 1 * 450 * 6 + 1 * 400 * 6
+        assert wave["totalLogisticsCost"] == pytest.approx(subtotal * 1.05)
+        assert wave["sellingPrice"] == pytest.approx(7750 + subtotal * 1.05)
+        assert wave["finalPrice"] == pytest.approx(wave["sellingPrice"] * 1.05)
+        assert valuation["overall"]["finalPrice"] == pytest.approx(wave["finalPrice"])
+        print("PASS: Inline valuation matches estimator formulas")
+
+    def test_missing_ids_reported(self):
+        """Unknown project ids are returned in missing_ids"""
+        response = requests.post(f"{BASE_URL}/api/projects/valuations", json={"project_ids": ["TEST_missing_id"]})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["missing_ids"] == ["TEST_missing_id"]
+        assert data["valuations"] == []
+        print("PASS: Missing ids reported")
+
+    def test_saved_projects_priced(self):
+        """Saved projects are fetched and priced in one request"""
+        projects = requests.get(f"{BASE_URL}/api/projects").json()[:5]
+        if not projects:
+            pytest.skip("No projects available")
+        ids = [p["id"] for p in projects]
+        response = requests.post(f"{BASE_URL}/api/projects/valuations", json={"project_ids": ids})
+        assert response.status_code == 200
+        data = response.json()
+        assert [v["project_id"] for v in data["valuations"]] == ids
+        for valuation in data["valuations"]:
+            assert "overall" in valuation and "waves" in valuation
+        print(f"PASS: Priced {len(ids)} saved projects")
+
+
+class TestProjectSummary:
+    """GET /api/projects/{id}/summary"""
+
+    def test_summary_not_found(self):
+        """Unknown project returns 404"""
+        response = requests.get(f"{BASE_URL}/api/projects/TEST_missing_id/summary")
+        assert response.status_code == 404
+        print("PASS: Summary 404 for unknown project")
+
+    def test_summary_matches_batch_valuation(self):
+        """Summary endpoint agrees with the batch valuation endpoint and is stable on repeat"""
+        projects = requests.get(f"{BASE_URL}/api/projects").json()
+        if not projects:
+            pytest.skip("No projects available")
+        project_id = projects[0]["id"]
+
+        first = requests.get(f"{BASE_URL}/api/projects/{project_id}/summary")
+        assert first.status_code == 200
+        summary = first.json()
+        for key in ("waves", "overall", "updated_at"):
+            assert key in summary, f"Summary missing '{key}'"
+
+        batch = requests.post(f"{BASE_URL}/api/projects/valuations", json={"project_ids": [project_id]}).json()
+        assert summary["overall"] == batch["valuations"][0]["overall"]
+
+        second = requests.get(f"{BASE_URL}/api/projects/{project_id}/summary").json()
+        assert second == summary, "Repeat view should return the cached summary"
+        print(f"PASS: Summary for {project_id} matches batch valuation")
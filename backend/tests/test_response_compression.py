@@ -0,0 +1,73 @@
+"""
+Response Compression Tests:
+- Large JSON responses are gzip-compressed when the client accepts gzip
+- Clients that do not accept an encoding get the identity response
+- Small responses are not compressed
+"""
+
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+
+def allocation(index):
+    return {
+        "id": f"TEST_a{index}",
+        "skill_id": "TEST_skill",
+        "skill_name": "TEST SAP Consultant",
+        "proficiency_level": "Senior",
+        "avg_monthly_salary": 5000,
+        "base_location_id": "TEST_location",
+        "base_location_name": "TEST Location",
+        "overhead_percentage": 20,
+        "phase_allocations": {"0": 1, "1": 1}
+    }
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    """Get authentication headers"""
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={
+        "email": "admin@emergent.com",
+        "password": "password"
+    })
+    if response.status_code == 200:
+        return {"Authorization": f"Bearer {response.json().get('token')}"}
+    pytest.skip("Authentication failed - skipping authenticated tests")
+
+
+@pytest.fixture(scope="module")
+def large_project(auth_headers):
+    """Project with 50 allocation rows"""
+    waves = [{"id": "TEST_wave_1", "name": "Wave 1", "duration_months": 2, "grid_allocations": [allocation(i) for i in range(50)]}]
+    created = requests.post(f"{BASE_URL}/api/projects", json={"name": "TEST_Compression", "waves": waves}, headers=auth_headers).json()
+    yield created
+    requests.delete(f"{BASE_URL}/api/projects/{created['id']}", headers=auth_headers)
+
+
+class TestResponseCompression:
+    """CompressionMiddleware"""
+
+    def test_gzip_when_accepted(self, large_project):
+        response = requests.get(f"{BASE_URL}/api/projects/{large_project['id']}", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers.get("Content-Encoding") == "gzip"
+        assert "Accept-Encoding" in response.headers.get("Vary", "")
+        assert len(response.json()["waves"][0]["grid_allocations"]) == 50
+        print(f"PASS: Project detail gzip-compressed to {response.headers.get('Content-Length')} bytes")
+
+    def test_identity_when_not_accepted(self, large_project):
+        for accept in ("identity", "gzip;q=0"):
+            response = requests.get(f"{BASE_URL}/api/projects/{large_project['id']}", headers={"Accept-Encoding": accept})
+            assert response.status_code == 200
+            assert "Content-Encoding" not in response.headers
+            assert response.json()["id"] == large_project["id"]
+        print("PASS: Identity response when no supported encoding is accepted")
+
+    def test_small_response_not_compressed(self, auth_headers):
+        response = requests.get(f"{BASE_URL}/api/auth/me", headers={**auth_headers, "Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert "Content-Encoding" not in response.headers
+        print("PASS: Small responses are sent uncompressed")
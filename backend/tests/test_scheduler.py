@@ -0,0 +1,74 @@
+"""
+Background Scheduler Tests:
+- GET /api/admin/scheduler/jobs lists registered jobs with schedules and run metrics
+- POST /api/admin/scheduler/jobs/{job_name}/run runs a job now and records it in job runs
+- Project audit logs are still listed after the audit archiving job runs
+"""
+
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    """Get authentication headers"""
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={
+        "email": "admin@emergent.com",
+        "password": "password"
+    })
+    if response.status_code == 200:
+        return {"Authorization": f"Bearer {response.json().get('token')}"}
+    pytest.skip("Authentication failed - skipping authenticated tests")
+
+
+class TestScheduler:
+    """/api/admin/scheduler"""
+
+    def test_jobs_require_auth(self):
+        response = requests.get(f"{BASE_URL}/api/admin/scheduler/jobs")
+        assert response.status_code == 401, f"Expected 401, got {response.status_code}"
+        print("PASS: Scheduler jobs require authentication")
+
+    def test_jobs_listed(self, auth_headers):
+        response = requests.get(f"{BASE_URL}/api/admin/scheduler/jobs", headers=auth_headers)
+        assert response.status_code == 200, response.text
+        jobs = {job["name"]: job for job in response.json()}
+        assert {"notification_compaction", "audit_archiving"} <= set(jobs)
+        for job in jobs.values():
+            assert len(job["schedule"].split()) == 5
+            assert job["next_run"]
+            assert job["runs"] >= job["failures"] >= 0
+        print(f"PASS: {len(jobs)} scheduled jobs listed")
+
+    def test_manual_run_recorded(self, auth_headers):
+        response = requests.post(f"{BASE_URL}/api/admin/scheduler/jobs/audit_archiving/run", headers=auth_headers)
+        assert response.status_code == 200, response.text
+        run = response.json()
+        assert run["status"] == "success" and run["triggered_by"] == "manual"
+        assert "archived" in run["result"]
+
+        runs = requests.get(
+            f"{BASE_URL}/api/admin/scheduler/runs", params={"job_name": "audit_archiving"}, headers=auth_headers
+        ).json()
+        assert run["id"] in [r["id"] for r in runs]
+        print("PASS: Manual run executed and recorded")
+
+    def test_unknown_job_404(self, auth_headers):
+        response = requests.post(f"{BASE_URL}/api/admin/scheduler/jobs/TEST_missing/run", headers=auth_headers)
+        assert response.status_code == 404
+        print("PASS: Unknown job returns 404")
+
+    def test_audit_logs_read_through_after_archiving(self, auth_headers):
+        project = requests.post(f"{BASE_URL}/api/projects", json={"name": "TEST_AuditArchive"}, headers=auth_headers).json()
+        try:
+            before = requests.get(f"{BASE_URL}/api/audit-logs/project/{project['id']}", headers=auth_headers).json()
+            assert before
+            requests.post(f"{BASE_URL}/api/admin/scheduler/jobs/audit_archiving/run", headers=auth_headers)
+            after = requests.get(f"{BASE_URL}/api/audit-logs/project/{project['id']}", headers=auth_headers).json()
+            assert sorted(log["id"] for log in after) == sorted(log["id"] for log in before)
+        finally:
+            requests.delete(f"{BASE_URL}/api/projects/{project['id']}", headers=auth_headers)
+        print("PASS: Project audit logs listed across live and archived entries")
@@ -0,0 +1,53 @@
+"""
+Schema Migration Tests:
+- GET /api/admin/maintenance/schema reports the applied schema version
+- Every migration has been applied at startup
+- Projects carry the backfilled flags and list fields
+"""
+
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    """Get authentication headers"""
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={
+        "email": "admin@emergent.com",
+        "password": "password"
+    })
+    if response.status_code == 200:
+        return {"Authorization": f"Bearer {response.json().get('token')}"}
+    pytest.skip("Authentication failed - skipping authenticated tests")
+
+
+class TestSchemaMigrations:
+    """GET /api/admin/maintenance/schema"""
+
+    def test_schema_requires_auth(self):
+        response = requests.get(f"{BASE_URL}/api/admin/maintenance/schema")
+        assert response.status_code == 401, f"Expected 401, got {response.status_code}"
+        print("PASS: Schema status requires authentication")
+
+    def test_all_migrations_applied(self, auth_headers):
+        response = requests.get(f"{BASE_URL}/api/admin/maintenance/schema", headers=auth_headers)
+        assert response.status_code == 200, response.text
+        data = response.json()
+        assert data["schema_version"] == data["target_version"]
+        assert data["ready"] is True and data["failed"] == []
+        versions = [m["version"] for m in data["migrations"]]
+        assert versions == sorted(versions)
+        assert all(m["status"] == "applied" for m in data["migrations"])
+        print(f"PASS: Schema at version {data['schema_version']}")
+
+    def test_projects_have_backfilled_fields(self):
+        projects = requests.get(f"{BASE_URL}/api/projects").json()
+        for project in projects:
+            assert project["is_latest_version"] is True
+            assert project["is_archived"] is False
+            for field in ("project_locations", "technology_ids", "project_type_ids"):
+                assert isinstance(project[field], list)
+        print(f"PASS: {len(projects)} projects carry backfilled fields")
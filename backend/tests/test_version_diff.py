@@ -0,0 +1,107 @@
+"""
+Version Diff Tests:
+- GET /api/projects/{id}/diff reports wave, allocation and phase changes
+- Valuation deltas are included
+- Identical versions report no changes
+"""
+
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+
+def allocation(allocation_id, skill_name, phases):
+    return {
+        "id": allocation_id,
+        "skill_id": "TEST_skill",
+        "skill_name": skill_name,
+        "proficiency_level": "Senior",
+        "avg_monthly_salary": 5000,
+        "base_location_id": "TEST_location",
+        "base_location_name": "TEST Location",
+        "overhead_percentage": 20,
+        "phase_allocations": phases
+    }
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    """Get authentication headers"""
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={
+        "email": "admin@emergent.com",
+        "password": "password"
+    })
+    if response.status_code == 200:
+        return {"Authorization": f"Bearer {response.json().get('token')}"}
+    pytest.skip("Authentication failed - skipping authenticated tests")
+
+
+@pytest.fixture(scope="module")
+def two_versions(auth_headers):
+    """v1 with two resources; v2 edits one cell, removes one row and adds another"""
+    waves = [{
+        "id": "TEST_wave_1", "name": "Wave 1", "duration_months": 2, "phase_names": ["Month 1", "Month 2"],
+        "grid_allocations": [allocation("TEST_a1", "TEST Dev", {"0": 1, "1": 1}), allocation("TEST_a2", "TEST QA", {"0": 1})]
+    }]
+    v1 = requests.post(f"{BASE_URL}/api/projects", json={"name": "TEST_VersionDiff", "waves": waves}, headers=auth_headers).json()
+
+    waves[0]["grid_allocations"] = [
+        allocation("TEST_a1", "TEST Dev", {"0": 1, "1": 2}),
+        allocation("TEST_a3", "TEST Architect", {"0": 0.5})
+    ]
+    v2 = requests.post(
+        f"{BASE_URL}/api/projects/{v1['id']}/new-version",
+        json={"waves": waves, "version_notes": "TEST diff"},
+        headers=auth_headers
+    ).json()
+    yield v1, v2
+    for project in (v2, v1):
+        requests.delete(f"{BASE_URL}/api/projects/{project['id']}", headers=auth_headers)
+
+
+class TestVersionDiff:
+    """GET /api/projects/{id}/diff"""
+
+    def test_default_compares_latest_with_previous(self, two_versions):
+        v1, v2 = two_versions
+        response = requests.get(f"{BASE_URL}/api/projects/{v1['id']}/diff")
+        assert response.status_code == 200, response.text
+        data = response.json()
+        assert data["from"]["version"] == 1 and data["to"]["version"] == 2
+        assert data["identical"] is False
+        print("PASS: Default diff compares latest with previous")
+
+    def test_allocation_and_phase_changes(self, two_versions):
+        v1, _ = two_versions
+        data = requests.get(f"{BASE_URL}/api/projects/{v1['id']}/diff?from=1&to=2").json()
+        assert len(data["waves"]) == 1
+        allocations = {a["id"]: a for a in data["waves"][0]["allocations"]}
+        assert allocations["TEST_a1"]["status"] == "changed"
+        assert allocations["TEST_a1"]["phases"] == [{"phase": "1", "label": "Month 2", "from": 1, "to": 2}]
+        assert allocations["TEST_a2"]["status"] == "removed"
+        assert allocations["TEST_a3"]["status"] == "added"
+        print("PASS: Allocation and phase changes reported")
+
+    def test_valuation_deltas(self, two_versions):
+        v1, _ = two_versions
+        metrics = requests.get(f"{BASE_URL}/api/projects/{v1['id']}/diff?from=1&to=2").json()["metrics"]
+        assert metrics["totalMM"]["from"] == 3
+        assert metrics["totalMM"]["to"] == 3.5
+        assert metrics["totalMM"]["diff"] == 0.5
+        assert metrics["finalPrice"]["diff"] > 0
+        print("PASS: Valuation deltas included")
+
+    def test_same_version_is_identical(self, two_versions):
+        v1, _ = two_versions
+        data = requests.get(f"{BASE_URL}/api/projects/{v1['id']}/diff?from=2&to=2").json()
+        assert data["identical"] is True
+        assert data["waves"] == []
+        print("PASS: Same version is identical")
+
+    def test_unknown_version_404(self, two_versions):
+        v1, _ = two_versions
+        response = requests.get(f"{BASE_URL}/api/projects/{v1['id']}/diff?from=1&to=99")
+        assert response.status_code == 404
+        print("PASS: Unknown version returns 404")
@@ -0,0 +1,97 @@
+"""
+Version Matrix Tests:
+- GET /api/projects/number/{project_number}/version-matrix returns one row per version
+- Valuations are materialized on write (create, new version, update, delete)
+- Unknown project numbers return 404
+"""
+
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+
+def allocation(allocation_id, phases):
+    return {
+        "id": allocation_id,
+        "skill_id": "TEST_skill",
+        "skill_name": "TEST Dev",
+        "proficiency_level": "Senior",
+        "avg_monthly_salary": 5000,
+        "base_location_id": "TEST_location",
+        "base_location_name": "TEST Location",
+        "overhead_percentage": 20,
+        "phase_allocations": phases
+    }
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    """Get authentication headers"""
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={
+        "email": "admin@emergent.com",
+        "password": "password"
+    })
+    if response.status_code == 200:
+        return {"Authorization": f"Bearer {response.json().get('token')}"}
+    pytest.skip("Authentication failed - skipping authenticated tests")
+
+
+@pytest.fixture(scope="module")
+def two_versions(auth_headers):
+    """v1 with 2 MM; v2 adds a resource for another 1 MM at a lower margin"""
+    waves = [{
+        "id": "TEST_wave_1", "name": "Wave 1", "duration_months": 2,
+        "grid_allocations": [allocation("TEST_a1", {"0": 1, "1": 1})]
+    }]
+    v1 = requests.post(f"{BASE_URL}/api/projects", json={"name": "TEST_VersionMatrix", "waves": waves}, headers=auth_headers).json()
+
+    waves[0]["grid_allocations"].append(allocation("TEST_a2", {"0": 1}))
+    v2 = requests.post(
+        f"{BASE_URL}/api/projects/{v1['id']}/new-version",
+        json={"waves": waves, "profit_margin_percentage": 30},
+        headers=auth_headers
+    ).json()
+    yield v1, v2
+    for project in (v2, v1):
+        requests.delete(f"{BASE_URL}/api/projects/{project['id']}", headers=auth_headers)
+
+
+def matrix_rows(project_number):
+    data = requests.get(f"{BASE_URL}/api/projects/number/{project_number}/version-matrix").json()
+    return data, [dict(zip(data["metrics"], row)) for row in data["matrix"]]
+
+
+class TestVersionMatrix:
+    """GET /api/projects/number/{project_number}/version-matrix"""
+
+    def test_one_row_per_version(self, two_versions):
+        v1, v2 = two_versions
+        data, rows = matrix_rows(v1["project_number"])
+        assert [v["version"] for v in data["versions"]] == [1, 2]
+        assert [v["project_id"] for v in data["versions"]] == [v1["id"], v2["id"]]
+        assert len(rows) == 2
+        print("PASS: One matrix row per version")
+
+    def test_metrics_materialized_on_write(self, two_versions):
+        v1, _ = two_versions
+        _, rows = matrix_rows(v1["project_number"])
+        assert rows[0]["totalMM"] == 2 and rows[1]["totalMM"] == 3
+        assert rows[0]["resourceCount"] == 1 and rows[1]["resourceCount"] == 2
+        assert rows[1]["profitMarginPercentage"] == 30
+        for row in rows:
+            assert abs(row["marginAmount"] - (row["finalPrice"] - row["totalCost"])) < 0.01
+        print("PASS: Version metrics materialized on write")
+
+    def test_update_refreshes_row(self, two_versions, auth_headers):
+        v1, v2 = two_versions
+        requests.put(f"{BASE_URL}/api/projects/{v2['id']}", json={"profit_margin_percentage": 25}, headers=auth_headers)
+        _, rows = matrix_rows(v1["project_number"])
+        assert rows[1]["profitMarginPercentage"] == 25
+        print("PASS: Update refreshes the version row")
+
+    def test_unknown_project_number_404(self):
+        response = requests.get(f"{BASE_URL}/api/projects/number/TEST_missing/version-matrix")
+        assert response.status_code == 404
+        print("PASS: Unknown project number returns 404")
@@ -0,0 +1,102 @@
+"""
+Version Storage Tests:
+- Superseded versions (stored as deltas) reconstruct their waves exactly
+- Superseded versions are read-only
+- Version list can be fetched without waves
+"""
+
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+
+def allocation(allocation_id, salary):
+    return {
+        "id": allocation_id,
+        "skill_id": "TEST_skill",
+        "skill_name": "TEST Skill",
+        "proficiency_level": "Senior",
+        "avg_monthly_salary": salary,
+        "base_location_id": "TEST_location",
+        "base_location_name": "TEST Location",
+        "overhead_percentage": 20,
+        "phase_allocations": {"0": 1, "1": 0.5}
+    }
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    """Get authentication headers"""
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={
+        "email": "admin@emergent.com",
+        "password": "password"
+    })
+    if response.status_code == 200:
+        return {"Authorization": f"Bearer {response.json().get('token')}"}
+    pytest.skip("Authentication failed - skipping authenticated tests")
+
+
+@pytest.fixture(scope="module")
+def version_chain(auth_headers):
+    """Create a project with three versions, each changing the grid"""
+    waves = [{"id": "TEST_wave_1", "name": "Wave 1", "duration_months": 2,
+              "grid_allocations": [allocation("TEST_a1", 5000), allocation("TEST_a2", 6000)]}]
+    response = requests.post(f"{BASE_URL}/api/projects", json={"name": "TEST_VersionStorage", "waves": waves}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    versions = [response.json()]
+
+    edits = [
+        lambda w: w[0]["grid_allocations"][0]["phase_allocations"].update({"1": 2}),
+        lambda w: (w[0]["grid_allocations"].pop(1), w[0]["grid_allocations"].append(allocation("TEST_a3", 7000)))
+    ]
+    for edit in edits:
+        waves = [dict(w, grid_allocations=[dict(a, phase_allocations=dict(a["phase_allocations"])) for a in w["grid_allocations"]]) for w in versions[-1]["waves"]]
+        edit(waves)
+        response = requests.post(
+            f"{BASE_URL}/api/projects/{versions[-1]['id']}/new-version",
+            json={"waves": waves, "version_notes": "TEST edit"},
+            headers=auth_headers
+        )
+        assert response.status_code == 200, response.text
+        versions.append(response.json())
+
+    yield versions
+    for version in reversed(versions):
+        requests.delete(f"{BASE_URL}/api/projects/{version['id']}", headers=auth_headers)
+
+
+class TestVersionStorage:
+    """Delta-stored superseded versions"""
+
+    def test_old_versions_reconstruct_exactly(self, version_chain):
+        for saved in version_chain:
+            loaded = requests.get(f"{BASE_URL}/api/projects/{saved['id']}").json()
+            assert loaded["waves"] == saved["waves"], f"v{saved['version']} waves differ after reconstruction"
+        print(f"PASS: {len(version_chain)} versions reconstruct exactly")
+
+    def test_versions_endpoint_hydrates_waves(self, version_chain):
+        response = requests.get(f"{BASE_URL}/api/projects/{version_chain[-1]['id']}/versions")
+        assert response.status_code == 200
+        by_id = {v["id"]: v for v in response.json()}
+        for saved in version_chain:
+            assert by_id[saved["id"]]["waves"] == saved["waves"]
+        print("PASS: Versions endpoint returns full waves")
+
+    def test_versions_without_waves(self, version_chain):
+        response = requests.get(f"{BASE_URL}/api/projects/{version_chain[-1]['id']}/versions?include_waves=false")
+        assert response.status_code == 200
+        versions = response.json()
+        assert len(versions) == len(version_chain)
+        assert all(v["waves"] == [] for v in versions)
+        print("PASS: Version list without waves")
+
+    def test_superseded_version_is_read_only(self, version_chain, auth_headers):
+        response = requests.put(
+            f"{BASE_URL}/api/projects/{version_chain[0]['id']}",
+            json={"name": "TEST_should_not_save"},
+            headers=auth_headers
+        )
+        assert response.status_code == 409, f"Expected 409, got {response.status_code}"
+        print("PASS: Superseded version is read-only")
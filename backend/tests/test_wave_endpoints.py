@@ -0,0 +1,138 @@
+"""
+Wave and Allocation Endpoint Tests:
+- Add, update and delete a wave
+- Upsert and delete allocation rows
+- Set a single phase allocation cell
+"""
+
+import pytest
+import requests
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+ALLOCATION = {
+    "skill_id": "TEST_skill",
+    "skill_name": "TEST Skill",
+    "proficiency_level": "Senior",
+    "avg_monthly_salary": 5000,
+    "base_location_id": "TEST_location",
+    "base_location_name": "TEST Location",
+    "overhead_percentage": 20,
+    "phase_allocations": {"0": 1}
+}
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    """Get authentication headers"""
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={
+        "email": "admin@emergent.com",
+        "password": "password"
+    })
+    if response.status_code == 200:
+        return {"Authorization": f"Bearer {response.json().get('token')}"}
+    pytest.skip("Authentication failed - skipping authenticated tests")
+
+
+@pytest.fixture
+def project(auth_headers):
+    """Create a throwaway project with one wave"""
+    response = requests.post(f"{BASE_URL}/api/projects", json={
+        "name": "TEST_WaveEndpoints_Project",
+        "waves": [{"id": "TEST_wave_1", "name": "Wave 1", "duration_months": 3, "grid_allocations": []}]
+    }, headers=auth_headers)
+    assert response.status_code == 200, f"Failed to create project: {response.text}"
+    project = response.json()
+    yield project
+    requests.delete(f"{BASE_URL}/api/projects/{project['id']}", headers=auth_headers)
+
+
+def get_wave(project_id, wave_id):
+    project = requests.get(f"{BASE_URL}/api/projects/{project_id}").json()
+    return next((w for w in project["waves"] if w["id"] == wave_id), None)
+
+
+class TestWaveEndpoints:
+    """Wave-level endpoints"""
+
+    def test_add_update_delete_wave(self, project, auth_headers):
+        base = f"{BASE_URL}/api/projects/{project['id']}/waves"
+        added = requests.post(base, json={"name": "Wave 2", "duration_months": 2}, headers=auth_headers)
+        assert added.status_code == 200, added.text
+        wave_id = added.json()["wave"]["id"]
+
+        updated = requests.patch(f"{base}/{wave_id}", json={"name": "Wave 2 Renamed", "nego_buffer_percentage": 4}, headers=auth_headers)
+        assert updated.status_code == 200, updated.text
+        wave = get_wave(project["id"], wave_id)
+        assert wave["name"] == "Wave 2 Renamed"
+        assert wave["nego_buffer_percentage"] == 4
+
+        deleted = requests.delete(f"{base}/{wave_id}", headers=auth_headers)
+        assert deleted.status_code == 200
+        assert get_wave(project["id"], wave_id) is None
+        print("PASS: Wave add/update/delete")
+
+    def test_unknown_wave_returns_404(self, project, auth_headers):
+        response = requests.patch(
+            f"{BASE_URL}/api/projects/{project['id']}/waves/TEST_missing",
+            json={"name": "x"}, headers=auth_headers
+        )
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Wave not found"
+        print("PASS: Unknown wave 404")
+
+    def test_duplicate_wave_id_rejected(self, project, auth_headers):
+        response = requests.post(
+            f"{BASE_URL}/api/projects/{project['id']}/waves",
+            json={"id": "TEST_wave_1", "name": "Wave 1 again", "duration_months": 1}, headers=auth_headers
+        )
+        assert response.status_code == 409
+        assert [w["id"] for w in requests.get(f"{BASE_URL}/api/projects/{project['id']}").json()["waves"]] == ["TEST_wave_1"]
+        print("PASS: Duplicate wave id rejected")
+
+
+class TestAllocationEndpoints:
+    """Allocation row and phase cell endpoints"""
+
+    def test_upsert_set_phase_and_delete_allocation(self, project, auth_headers):
+        base = f"{BASE_URL}/api/projects/{project['id']}/waves/TEST_wave_1/allocations/TEST_alloc_1"
+
+        created = requests.put(base, json=ALLOCATION, headers=auth_headers)
+        assert created.status_code == 200, created.text
+        assert created.json()["message"] == "Allocation added"
+
+        replaced = requests.put(base, json={**ALLOCATION, "avg_monthly_salary": 6000}, headers=auth_headers)
+        assert replaced.json()["message"] == "Allocation updated"
+
+        cell = requests.put(f"{base}/phases/2", json={"value": 0.5}, headers=auth_headers)
+        assert cell.status_code == 200, cell.text
+
+        wave = get_wave(project["id"], "TEST_wave_1")
+        assert len(wave["grid_allocations"]) == 1
+        allocation = wave["grid_allocations"][0]
+        assert allocation["avg_monthly_salary"] == 6000
+        assert allocation["phase_allocations"] == {"0": 1, "2": 0.5}
+
+        deleted = requests.delete(base, headers=auth_headers)
+        assert deleted.status_code == 200
+        assert get_wave(project["id"], "TEST_wave_1")["grid_allocations"] == []
+        print("PASS: Allocation upsert, phase cell and delete")
+
+    def test_invalid_phase_key_rejected(self, project, auth_headers):
+        base = f"{BASE_URL}/api/projects/{project['id']}/waves/TEST_wave_1/allocations/TEST_alloc_1"
+        requests.put(base, json=ALLOCATION, headers=auth_headers)
+        response = requests.put(f"{base}/phases/a.b", json={"value": 1}, headers=auth_headers)
+        assert response.status_code == 400
+        print("PASS: Invalid phase key rejected")
+
+    def test_concurrent_upserts_add_one_row(self, project, auth_headers):
+        base = f"{BASE_URL}/api/projects/{project['id']}/waves/TEST_wave_1/allocations/TEST_alloc_race"
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            responses = list(pool.map(lambda _: requests.put(base, json=ALLOCATION, headers=auth_headers), range(4)))
+        assert all(r.status_code == 200 for r in responses)
+        assert [r.json()["message"] for r in responses].count("Allocation added") == 1
+        rows = get_wave(project["id"], "TEST_wave_1")["grid_allocations"]
+        assert [a["id"] for a in rows] == ["TEST_alloc_race"]
+        print("PASS: Concurrent upserts of a new allocation add one row")
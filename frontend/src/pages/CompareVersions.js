@@ -15,10 +15,9 @@ const CompareVersions = () => {
   const { projectId } = useParams();
   const navigate = useNavigate();
   const [versions, setVersions] = useState([]);
-  const [leftVersion, setLeftVersion] = useState(null);
-  const [rightVersion, setRightVersion] = useState(null);
-  const [leftVersionId, setLeftVersionId] = useState("");
-  const [rightVersionId, setRightVersionId] = useState("");
+  const [leftVersionNumber, setLeftVersionNumber] = useState("");
+  const [rightVersionNumber, setRightVersionNumber] = useState("");
+  const [versionDiff, setVersionDiff] = useState(null);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
@@ -29,21 +28,17 @@ const CompareVersions = () => {
 
   const fetchVersions = async () => {
     try {
-      const response = await axios.get(`${API}/projects/${projectId}/versions`);
+      const response = await axios.get(`${API}/projects/${projectId}/versions?include_waves=false`);
       const vers = response.data;
       setVersions(vers);
       
       // Auto-select latest two versions for comparison
-      if (vers.length >= 2) {
-        setLeftVersionId(vers[1].id); // Previous version
-        setRightVersionId(vers[0].id); // Latest version
-        setLeftVersion(vers[1]);
-        setRightVersion(vers[0]);
-      } else if (vers.length === 1) {
-        setLeftVersionId(vers[0].id);
-        setRightVersionId(vers[0].id);
-        setLeftVersion(vers[0]);
-        setRightVersion(vers[0]);
+      if (vers.length >= 1) {
+        const left = String(vers[Math.min(1, vers.length - 1)].version); // Previous version
+        const right = String(vers[0].version); // Latest version
+        setLeftVersionNumber(left);
+        setRightVersionNumber(right);
+        await fetchDiff(left, right);
       }
     } catch (error) {
       toast.error("Failed to load project versions");
@@ -52,103 +47,43 @@ const CompareVersions = () => {
     }
   };
 
-  const handleVersionChange = async (side, versionId) => {
+  // The server diffs the two versions and values both, so only the differences are transferred
+  const fetchDiff = async (fromVersion, toVersion) => {
     try {
-      const response = await axios.get(`${API}/projects/${versionId}`);
-      if (side === "left") {
-        setLeftVersionId(versionId);
-        setLeftVersion(response.data);
-      } else {
-        setRightVersionId(versionId);
-        setRightVersion(response.data);
-      }
+      const response = await axios.get(`${API}/projects/${projectId}/diff?from=${fromVersion}&to=${toVersion}`);
+      setVersionDiff(response.data);
     } catch (error) {
-      toast.error("Failed to load version");
+      toast.error("Failed to compare versions");
     }
   };
 
-  // Calculate summary for a project version
-  const calculateSummary = (project) => {
-    if (!project || !project.waves) {
-      return { 
-        totalMM: 0, onsiteMM: 0, offshoreMM: 0, travelingMM: 0, totalLogistics: 0, sellingPrice: 0, 
-        resourceCount: 0, travelingResourceCount: 0, onsiteSalaryCost: 0, offshoreSalaryCost: 0,
-        onsiteSellingPrice: 0, offshoreSellingPrice: 0
-      };
+  const handleVersionChange = async (side, versionNumber) => {
+    if (side === "left") {
+      setLeftVersionNumber(versionNumber);
+      await fetchDiff(versionNumber, rightVersionNumber);
+    } else {
+      setRightVersionNumber(versionNumber);
+      await fetchDiff(leftVersionNumber, versionNumber);
     }
+  };
 
-    const profitMargin = project.profit_margin_percentage || 35;
-    let totalMM = 0, onsiteMM = 0, offshoreMM = 0, travelingMM = 0, totalLogistics = 0;
-    let totalBaseCost = 0, resourceCount = 0, travelingResourceCount = 0;
-    let onsiteSalaryCost = 0, offshoreSalaryCost = 0;
-
-    project.waves.forEach(wave => {
-      const config = wave.logistics_config || {
-        per_diem_daily: 50, per_diem_days: 30,
-        accommodation_daily: 80, accommodation_days: 30,
-        local_conveyance_daily: 15, local_conveyance_days: 21,
-        flight_cost_per_trip: 450, visa_medical_per_trip: 400,
-        num_trips: 6, contingency_percentage: 5,
-      };
-
-      let waveTravelingMM = 0, waveTravelingResources = 0;
-
-      (wave.grid_allocations || []).forEach(alloc => {
-        const mm = Object.values(alloc.phase_allocations || {}).reduce((s, v) => s + v, 0);
-        const salaryCost = alloc.avg_monthly_salary * mm;
-        totalMM += mm;
-        resourceCount++;
-
-        if (alloc.is_onsite) {
-          onsiteMM += mm;
-          onsiteSalaryCost += salaryCost;
-        } else {
-          offshoreMM += mm;
-          offshoreSalaryCost += salaryCost;
-        }
-
-        // Count traveling resources for logistics
-        if (alloc.travel_required) {
-          travelingMM += mm;
-          waveTravelingMM += mm;
-          waveTravelingResources++;
-          travelingResourceCount++;
-        }
-
-        totalBaseCost += salaryCost;
-      });
-
-      // Wave logistics - only for traveling resources
-      const perDiem = waveTravelingMM * config.per_diem_daily * config.per_diem_days;
-      const accommodation = waveTravelingMM * config.accommodation_daily * config.accommodation_days;
-      const conveyance = waveTravelingMM * config.local_conveyance_daily * config.local_conveyance_days;
-      const flights = waveTravelingResources * config.flight_cost_per_trip * config.num_trips;
-      const visa = waveTravelingResources * config.visa_medical_per_trip * config.num_trips;
-      const subtotal = perDiem + accommodation + conveyance + flights + visa;
-      const contingency = subtotal * (config.contingency_percentage / 100);
-      totalLogistics += subtotal + contingency;
-    });
-
-    const baseCostWithLogistics = totalBaseCost + totalLogistics;
-    // Assume avg 30% overhead
-    const costToCompany = baseCostWithLogistics * 1.3;
-    const sellingPrice = costToCompany / (1 - profitMargin / 100);
-    
-    // Calculate onsite and offshore selling prices
-    const onsiteOverheadCost = onsiteSalaryCost * 0.3;
-    const offshoreOverheadCost = offshoreSalaryCost * 0.3;
-    const onsiteSellingPrice = (onsiteSalaryCost + onsiteOverheadCost + totalLogistics) / (1 - profitMargin / 100);
-    const offshoreSellingPrice = (offshoreSalaryCost + offshoreOverheadCost) / (1 - profitMargin / 100);
+  const leftVersion = versionDiff?.from;
+  const rightVersion = versionDiff?.to;
 
-    return { 
-      totalMM, onsiteMM, offshoreMM, travelingMM, totalLogistics, sellingPrice, 
-      resourceCount, travelingResourceCount, onsiteSalaryCost, offshoreSalaryCost,
-      onsiteSellingPrice, offshoreSellingPrice
+  // Summary figures for one side of the comparison, taken from the server's valuation
+  const summaryFor = (side) => {
+    const metrics = versionDiff?.metrics || {};
+    const value = (key) => metrics[key]?.[side] || 0;
+    return {
+      totalMM: value("totalMM"), onsiteMM: value("onsiteMM"), offshoreMM: value("offshoreMM"),
+      travelingMM: value("travelingMM"), totalLogistics: value("totalLogisticsCost"), sellingPrice: value("sellingPrice"),
+      resourceCount: value("resourceCount"), travelingResourceCount: value("travelingResourceCount"),
+      onsiteSellingPrice: value("onsiteSellingPrice"), offshoreSellingPrice: value("offshoreSellingPrice"),
     };
   };
 
-  const leftSummary = calculateSummary(leftVersion);
-  const rightSummary = calculateSummary(rightVersion);
+  const leftSummary = summaryFor("from");
+  const rightSummary = summaryFor("to");
 
   // Calculate differences
   const getDiff = (left, right) => {
@@ -212,13 +147,13 @@ const CompareVersions = () => {
           <CardHeader className="bg-[#E0F2FE] pb-3">
             <CardTitle className="text-lg flex items-center justify-between">
               <span>Version A (Baseline)</span>
-              <Select value={leftVersionId} onValueChange={(v) => handleVersionChange("left", v)}>
+              <Select value={leftVersionNumber} onValueChange={(v) => handleVersionChange("left", v)}>
                 <SelectTrigger className="w-32" data-testid="left-version-select">
                   <SelectValue />
                 </SelectTrigger>
                 <SelectContent>
                   {versions.map(v => (
-                    <SelectItem key={v.id} value={v.id}>v{v.version}</SelectItem>
+                    <SelectItem key={v.id} value={String(v.version)}>v{v.version}</SelectItem>
                   ))}
                 </SelectContent>
               </Select>
@@ -258,13 +193,13 @@ const CompareVersions = () => {
           <CardHeader className="bg-green-50 pb-3">
             <CardTitle className="text-lg flex items-center justify-between">
               <span>Version B (Compare)</span>
-              <Select value={rightVersionId} onValueChange={(v) => handleVersionChange("right", v)}>
+              <Select value={rightVersionNumber} onValueChange={(v) => handleVersionChange("right", v)}>
                 <SelectTrigger className="w-32" data-testid="right-version-select">
                   <SelectValue />
                 </SelectTrigger>
                 <SelectContent>
                   {versions.map(v => (
-                    <SelectItem key={v.id} value={v.id}>v{v.version}</SelectItem>
+                    <SelectItem key={v.id} value={String(v.version)}>v{v.version}</SelectItem>
                   ))}
                 </SelectContent>
               </Select>
@@ -394,6 +329,54 @@ const CompareVersions = () => {
         </CardContent>
       </Card>
 
+      {/* Detailed Changes */}
+      {versionDiff && (
+        <Card>
+          <CardHeader>
+            <CardTitle className="text-xl font-bold">Detailed Changes</CardTitle>
+          </CardHeader>
+          <CardContent className="space-y-3 text-sm">
+            {versionDiff.identical && <p className="text-gray-500">No differences between these versions</p>}
+            {versionDiff.fields.map(change => (
+              <div key={change.field} className="flex justify-between border-b pb-1">
+                <span className="text-gray-600">{change.field.replace(/_/g, " ")}</span>
+                <span className="font-mono">{formatChangeValue(change.from)} → {formatChangeValue(change.to)}</span>
+              </div>
+            ))}
+            {versionDiff.waves.map(wave => (
+              <div key={`${wave.status}-${wave.id}`} className="p-3 bg-gray-50 rounded space-y-1">
+                <div className="flex justify-between">
+                  <span className="font-semibold">
+                    <ChangeBadge status={wave.status} /> {wave.name}
+                  </span>
+                  <DiffBadge diff={toDiff(wave.metrics.finalPrice)} prefix="$" isCurrency />
+                </div>
+                {wave.fields.map(change => (
+                  <div key={change.field} className="text-gray-600 pl-4">
+                    {change.field.replace(/_/g, " ")}: {formatChangeValue(change.from)} → {formatChangeValue(change.to)}
+                  </div>
+                ))}
+                {wave.allocations.map(alloc => (
+                  <div key={`${alloc.status}-${alloc.id}`} className="pl-4">
+                    <ChangeBadge status={alloc.status} /> {alloc.skill_name} ({alloc.proficiency_level}, {alloc.base_location_name})
+                    {(alloc.fields || []).map(change => (
+                      <span key={change.field} className="text-gray-600 ml-2">
+                        {change.field.replace(/_/g, " ")}: {formatChangeValue(change.from)} → {formatChangeValue(change.to)}
+                      </span>
+                    ))}
+                    {(alloc.phases || []).map(phase => (
+                      <span key={phase.phase} className="text-gray-600 ml-2">
+                        {phase.label}: {phase.from} → {phase.to} MM
+                      </span>
+                    ))}
+                  </div>
+                ))}
+              </div>
+            ))}
+          </CardContent>
+        </Card>
+      )}
+
       {/* Wave Comparison */}
       <Card>
         <CardHeader>
@@ -408,7 +391,7 @@ const CompareVersions = () => {
                   {leftVersion.waves.map((wave, i) => (
                     <div key={i} className="p-2 bg-[#E0F2FE] rounded text-sm">
                       <span className="font-medium">{wave.name}</span>
-                      <span className="text-gray-600 ml-2">{wave.duration_months}m, {wave.grid_allocations?.length || 0} resources</span>
+                      <span className="text-gray-600 ml-2">{wave.duration_months}m, {wave.resource_count} resources</span>
                     </div>
                   ))}
                 </div>
@@ -423,7 +406,7 @@ const CompareVersions = () => {
                   {rightVersion.waves.map((wave, i) => (
                     <div key={i} className="p-2 bg-green-50 rounded text-sm">
                       <span className="font-medium">{wave.name}</span>
-                      <span className="text-gray-600 ml-2">{wave.duration_months}m, {wave.grid_allocations?.length || 0} resources</span>
+                      <span className="text-gray-600 ml-2">{wave.duration_months}m, {wave.resource_count} resources</span>
                     </div>
                   ))}
                 </div>
@@ -438,6 +421,30 @@ const CompareVersions = () => {
   );
 };
 
+// Convert a server metric change ({from, to, diff}) into the DiffBadge shape
+const toDiff = ({ from, to, diff }) => ({
+  diff,
+  pct: from !== 0 ? ((diff / from) * 100).toFixed(1) : (to !== 0 ? "100" : "0"),
+  increased: diff > 0,
+  decreased: diff < 0,
+});
+
+const formatChangeValue = (value) => {
+  if (value === null || value === undefined || value === "") return "—";
+  if (Array.isArray(value)) return value.join(", ") || "—";
+  if (typeof value === "object") return JSON.stringify(value);
+  return String(value);
+};
+
+const ChangeBadge = ({ status }) => {
+  const styles = {
+    added: "text-green-700 bg-green-50",
+    removed: "text-red-700 bg-red-50",
+    changed: "text-amber-700 bg-amber-50",
+  };
+  return <Badge className={`${styles[status]} text-xs`}>{status}</Badge>;
+};
+
 // Component for showing difference with color coding
 const DiffBadge = ({ diff, prefix = "", suffix = "", isCurrency = false, large = false }) => {
   const { diff: diffValue, pct, increased, decreased } = diff;
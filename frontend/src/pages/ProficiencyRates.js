@@ -165,66 +165,18 @@ const ProficiencyRates = () => {
       // Skip header row
       const dataRows = rows.slice(1).filter(row => row.length >= 5 && row[0] && row[1] && row[2] && row[3] && row[4]);
       
-      let added = 0;
-      let skipped = 0;
-
-      for (const row of dataRows) {
-        const technologyName = String(row[0]).trim();
-        const skillName = String(row[1]).trim();
-        const locationName = String(row[2]).trim();
-        const proficiencyLevel = String(row[3]).trim();
-        const salary = parseFloat(row[4]);
-
-        // Find skill by name and technology
-        const skill = skills.find(s => 
-          s.name.toLowerCase() === skillName.toLowerCase() && 
-          s.technology_name?.toLowerCase() === technologyName.toLowerCase()
-        );
-        if (!skill) {
-          skipped++;
-          continue;
-        }
-
-        // Find location by name
-        const location = locations.find(l => l.name.toLowerCase() === locationName.toLowerCase());
-        if (!location) {
-          skipped++;
-          continue;
-        }
-
-        // Validate proficiency level
-        if (!PROFICIENCY_LEVELS.includes(proficiencyLevel)) {
-          skipped++;
-          continue;
-        }
-
-        // Check if rate already exists
-        const exists = rates.some(r => 
-          r.skill_id === skill.id && 
-          r.base_location_id === location.id && 
-          r.proficiency_level === proficiencyLevel
-        );
-        if (exists) {
-          skipped++;
-          continue;
-        }
-
-        try {
-          await axios.post(`${API}/proficiency-rates`, {
-            skill_id: skill.id,
-            skill_name: skill.name,
-            technology_id: skill.technology_id,
-            technology_name: skill.technology_name,
-            base_location_id: location.id,
-            base_location_name: location.name,
-            proficiency_level: proficiencyLevel,
-            avg_monthly_salary: salary,
-          });
-          added++;
-        } catch {
-          skipped++;
-        }
-      }
+      // Skills, locations and duplicates are resolved server-side in one request
+      const response = await axios.post(`${API}/proficiency-rates/bulk`, {
+        rows: dataRows.map(row => ({
+          technology_name: String(row[0]).trim(),
+          skill_name: String(row[1]).trim(),
+          base_location_name: String(row[2]).trim(),
+          proficiency_level: String(row[3]).trim(),
+          avg_monthly_salary: parseFloat(row[4]) || null,
+        })),
+      });
+      const added = response.data.created;
+      const skipped = response.data.duplicate + response.data.invalid;
 
       toast.success(`Upload complete: ${added} added, ${skipped} skipped`);
       fetchRates();
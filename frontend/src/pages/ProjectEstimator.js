@@ -1,4 +1,4 @@
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import { useSearchParams, useNavigate } from "react-router-dom";
 import axios from "axios";
 import { Button } from "@/components/ui/button";
@@ -17,9 +17,11 @@ import { Plus, Trash2, Plane, Save, FileDown, X, Settings, Copy, History, Refres
 import { toast } from "sonner";
 import * as XLSX from "xlsx";
 import { COUNTRIES, LOGISTICS_DEFAULTS } from "@/utils/constants";
+import { applyOperations, diffWaves } from "@/utils/gridSync";
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
+const AUTOSAVE_DELAY_MS = 2000;
 
 const STATUS_CONFIG = {
   draft: { label: "Draft", color: "bg-gray-100 text-gray-700", icon: Clock },
@@ -50,6 +52,9 @@ const ProjectEstimator = () => {
   const [projectId, setProjectId] = useState("");
   const [projectNumber, setProjectNumber] = useState("");
   const [projectVersion, setProjectVersion] = useState(1);
+  const [projectRevision, setProjectRevision] = useState(0); // Revision the edits are based on (optimistic concurrency)
+  const lastSyncedWaves = useRef(null); // Waves as last saved on the server; autosave sends the delta from these
+  const latestWaves = useRef([]); // Current waves, for autosave responses that arrive after further edits
   const [projectName, setProjectName] = useState("");
   const [customerId, setCustomerId] = useState("");
   const [projectLocations, setProjectLocations] = useState([]); // Multiple locations
@@ -110,146 +115,138 @@ const ProjectEstimator = () => {
     contingency_percentage: 5,
   });
 
+  // Master data, approvers and the project (when editing or viewing) arrive in one request
   useEffect(() => {
-    fetchRates();
-    fetchSkills();
-    fetchLocations();
-    fetchTechnologies();
-    fetchProjectTypes();
-    fetchCustomers();
-    fetchSalesManagers();
-  }, []);
+    fetchBootstrap(projectIdToLoad);
+  }, [projectIdToLoad]);
 
   useEffect(() => {
-    if (projectIdToLoad) {
-      loadProject(projectIdToLoad);
-    }
-  }, [projectIdToLoad]);
+    latestWaves.current = waves;
+  }, [waves]);
 
-  const fetchSkills = async () => {
-    try {
-      const response = await axios.get(`${API}/skills`);
-      setSkills(response.data);
-    } catch (error) {
-      console.error("Failed to fetch skills");
-    }
-  };
+  // Debounced autosave: grid edits are sent as delta operations; other changes still need Save
+  useEffect(() => {
+    if (!projectId || isReadOnly || !lastSyncedWaves.current) return;
+    const sentWaves = waves;
+    const operations = diffWaves(lastSyncedWaves.current, sentWaves);
+    if (!operations || operations.length === 0) return;
 
-  const loadProject = async (id) => {
-    try {
-      const response = await axios.get(`${API}/projects/${id}`);
-      const project = response.data;
-      
-      setProjectId(project.id);
-      setProjectNumber(project.project_number || "");
-      setProjectVersion(project.version || 1);
-      setProjectName(project.name);
-      setCustomerId(project.customer_id || "");
-      // Handle both single location (legacy) and multiple locations
-      if (project.project_locations && project.project_locations.length > 0) {
-        setProjectLocations(project.project_locations);
-      } else if (project.project_location) {
-        setProjectLocations([project.project_location]);
-      } else {
-        setProjectLocations([]);
-      }
-      // Handle multiple technologies
-      if (project.technology_ids && project.technology_ids.length > 0) {
-        setTechnologyIds(project.technology_ids);
-      } else if (project.technology_id) {
-        setTechnologyIds([project.technology_id]);
-      } else {
-        setTechnologyIds([]);
-      }
-      // Handle multiple project types
-      if (project.project_type_ids && project.project_type_ids.length > 0) {
-        setProjectTypeIds(project.project_type_ids);
-      } else if (project.project_type_id) {
-        setProjectTypeIds([project.project_type_id]);
-      } else {
-        setProjectTypeIds([]);
-      }
-      setProjectDescription(project.description || "");
-      setProfitMarginPercentage(project.profit_margin_percentage || 35);
-      setVersionNotes(project.version_notes || "");
-      setProjectStatus(project.status || "draft");
-      setApproverEmail(project.approver_email || "");
-      setApprovalComments(project.approval_comments || "");
-      setSalesManagerId(project.sales_manager_id || "");
-      setIsLatestVersion(project.is_latest_version !== false);
-      
-      if (project.waves && project.waves.length > 0) {
-        setWaves(project.waves);
-        setActiveWaveId(project.waves[0].id);
-      }
-      
-      const versionInfo = `${project.project_number || "project"} v${project.version || 1}`;
-      if (!project.is_latest_version) {
-        toast.info(`Loaded ${versionInfo} (Read-only: older version)`);
-      } else if (project.status === "approved") {
-        toast.info(`Loaded ${versionInfo} (Read-only: approved)`);
-      } else if (project.status === "in_review") {
-        toast.info(`Loaded ${versionInfo} (Read-only: in review)`);
-      } else {
-        toast.success(`Loaded ${versionInfo}`);
+    const timer = setTimeout(async () => {
+      const token = localStorage.getItem("token");
+      const config = { headers: { Authorization: `Bearer ${token}` } };
+      try {
+        const response = await axios.post(
+          `${API}/projects/${projectId}/sync`,
+          { base_revision: projectRevision, operations },
+          config
+        );
+        if (!response.data.rebased) {
+          lastSyncedWaves.current = sentWaves;
+          setProjectRevision(response.data.revision);
+          return;
+        }
+        // Replay edits made while the request was in flight onto the merged waves
+        const pending = diffWaves(sentWaves, latestWaves.current);
+        if (pending === null) {
+          // They cannot be replayed as grid operations; keep them and the old revision so Save
+          // is rejected instead of overwriting the other user's changes
+          toast.error("This project was changed by another user. Reload it before saving.");
+          return;
+        }
+        lastSyncedWaves.current = response.data.waves;
+        setProjectRevision(response.data.revision);
+        setWaves(pending.length === 0 ? response.data.waves : applyOperations(response.data.waves, pending));
+        toast.info("Merged changes made by another user");
+      } catch (error) {
+        if (error.response?.status === 409) {
+          toast.error("Autosave failed: this project was changed elsewhere. Reload it before continuing.");
+        }
+        console.error("Autosave failed", error);
       }
-    } catch (error) {
-      toast.error("Failed to load project");
-      console.error(error);
-    }
-  };
+    }, AUTOSAVE_DELAY_MS);
+    return () => clearTimeout(timer);
+  }, [waves, projectId, projectRevision, isReadOnly]);
 
-  const fetchRates = async () => {
+  const fetchBootstrap = async (id) => {
     try {
-      const response = await axios.get(`${API}/proficiency-rates`);
-      setRates(response.data);
+      const response = await axios.get(`${API}/estimator/bootstrap`, {
+        params: id ? { project_id: id } : {},
+      });
+      const data = response.data;
+      setRates(data.proficiency_rates);
+      setSkills(data.skills);
+      setLocations(data.base_locations);
+      setTechnologies(data.technologies);
+      setProjectTypes(data.project_types);
+      setCustomers(data.customers);
+      setSalesManagers(data.sales_managers);
+      setApproversList(data.approvers);
+      if (data.project) {
+        applyLoadedProject(data.project);
+      } else if (data.project_error) {
+        toast.error("Failed to load project");
+      }
     } catch (error) {
-      toast.error("Failed to fetch proficiency rates");
+      toast.error("Failed to load estimator data");
+      console.error(error);
     }
   };
 
-  const fetchLocations = async () => {
-    try {
-      const response = await axios.get(`${API}/base-locations`);
-      setLocations(response.data);
-    } catch (error) {
-      toast.error("Failed to fetch base locations");
+  const applyLoadedProject = (project) => {
+    setProjectId(project.id);
+    setProjectNumber(project.project_number || "");
+    setProjectVersion(project.version || 1);
+    setProjectRevision(project.revision || 0);
+    setProjectName(project.name);
+    setCustomerId(project.customer_id || "");
+    // Handle both single location (legacy) and multiple locations
+    if (project.project_locations && project.project_locations.length > 0) {
+      setProjectLocations(project.project_locations);
+    } else if (project.project_location) {
+      setProjectLocations([project.project_location]);
+    } else {
+      setProjectLocations([]);
     }
-  };
-
-  const fetchTechnologies = async () => {
-    try {
-      const response = await axios.get(`${API}/technologies`);
-      setTechnologies(response.data);
-    } catch (error) {
-      toast.error("Failed to fetch technologies");
+    // Handle multiple technologies
+    if (project.technology_ids && project.technology_ids.length > 0) {
+      setTechnologyIds(project.technology_ids);
+    } else if (project.technology_id) {
+      setTechnologyIds([project.technology_id]);
+    } else {
+      setTechnologyIds([]);
     }
-  };
-
-  const fetchProjectTypes = async () => {
-    try {
-      const response = await axios.get(`${API}/project-types`);
-      setProjectTypes(response.data);
-    } catch (error) {
-      toast.error("Failed to fetch project types");
+    // Handle multiple project types
+    if (project.project_type_ids && project.project_type_ids.length > 0) {
+      setProjectTypeIds(project.project_type_ids);
+    } else if (project.project_type_id) {
+      setProjectTypeIds([project.project_type_id]);
+    } else {
+      setProjectTypeIds([]);
     }
-  };
-
-  const fetchCustomers = async () => {
-    try {
-      const response = await axios.get(`${API}/customers`);
-      setCustomers(response.data);
-    } catch (error) {
-      toast.error("Failed to fetch customers");
+    setProjectDescription(project.description || "");
+    setProfitMarginPercentage(project.profit_margin_percentage || 35);
+    setVersionNotes(project.version_notes || "");
+    setProjectStatus(project.status || "draft");
+    setApproverEmail(project.approver_email || "");
+    setApprovalComments(project.approval_comments || "");
+    setSalesManagerId(project.sales_manager_id || "");
+    setIsLatestVersion(project.is_latest_version !== false);
+    
+    lastSyncedWaves.current = project.waves || [];
+    if (project.waves && project.waves.length > 0) {
+      setWaves(project.waves);
+      setActiveWaveId(project.waves[0].id);
     }
-  };
-
-  const fetchSalesManagers = async () => {
-    try {
-      const response = await axios.get(`${API}/sales-managers?active_only=true`);
-      setSalesManagers(response.data);
-    } catch (error) {
-      console.error("Failed to fetch sales managers");
+    
+    const versionInfo = `${project.project_number || "project"} v${project.version || 1}`;
+    if (!project.is_latest_version) {
+      toast.info(`Loaded ${versionInfo} (Read-only: older version)`);
+    } else if (project.status === "approved") {
+      toast.info(`Loaded ${versionInfo} (Read-only: approved)`);
+    } else if (project.status === "in_review") {
+      toast.info(`Loaded ${versionInfo} (Read-only: in review)`);
+    } else {
+      toast.success(`Loaded ${versionInfo}`);
     }
   };
 
@@ -867,12 +864,13 @@ const ProjectEstimator = () => {
     try {
       const token = localStorage.getItem("token");
       const config = { headers: { Authorization: `Bearer ${token}` } };
-      await axios.post(`${API}/projects/${projectId}/submit-for-review?approver_email=${encodeURIComponent(approverEmail)}`, {}, config);
+      const response = await axios.post(`${API}/projects/${projectId}/submit-for-review?approver_email=${encodeURIComponent(approverEmail)}`, {}, config);
       setProjectStatus("in_review");
+      setProjectRevision(response.data.revision);
       setSubmitForReviewDialog(false);
       toast.success("Project submitted for review");
     } catch (error) {
-      toast.error("Failed to submit for review");
+      toast.error(error.response?.data?.detail || "Failed to submit for review");
       console.error(error);
     }
   };
@@ -884,18 +882,20 @@ const ProjectEstimator = () => {
       const token = localStorage.getItem("token");
       const config = { headers: { Authorization: `Bearer ${token}` } };
       if (approvalAction === "approve") {
-        await axios.post(`${API}/projects/${projectId}/approve?comments=${encodeURIComponent(approvalComments)}`, {}, config);
+        const response = await axios.post(`${API}/projects/${projectId}/approve?comments=${encodeURIComponent(approvalComments)}`, {}, config);
         setProjectStatus("approved");
+        setProjectRevision(response.data.revision);
         toast.success("Project approved");
       } else if (approvalAction === "reject") {
-        await axios.post(`${API}/projects/${projectId}/reject?comments=${encodeURIComponent(approvalComments)}`, {}, config);
+        const response = await axios.post(`${API}/projects/${projectId}/reject?comments=${encodeURIComponent(approvalComments)}`, {}, config);
         setProjectStatus("rejected");
+        setProjectRevision(response.data.revision);
         toast.success("Project rejected");
       }
       setApprovalActionDialog(false);
       setApprovalComments("");
     } catch (error) {
-      toast.error(`Failed to ${approvalAction} project`);
+      toast.error(error.response?.data?.detail || `Failed to ${approvalAction} project`);
       console.error(error);
     }
   };
@@ -923,16 +923,24 @@ const ProjectEstimator = () => {
 
     try {
       if (projectId) {
-        await axios.put(`${API}/projects/${projectId}`, payload, config);
+        const response = await axios.put(`${API}/projects/${projectId}`, { ...payload, revision: projectRevision }, config);
+        setProjectRevision(response.data.revision || 0);
+        lastSyncedWaves.current = waves;
         toast.success(`Project ${projectNumber} v${projectVersion} updated`);
       } else {
         const response = await axios.post(`${API}/projects`, payload, config);
         setProjectId(response.data.id);
         setProjectNumber(response.data.project_number);
         setProjectVersion(response.data.version);
+        setProjectRevision(response.data.revision || 0);
+        lastSyncedWaves.current = waves;
         toast.success(`Project ${response.data.project_number} created`);
       }
     } catch (error) {
+      if (error.response?.status === 409) {
+        toast.error("This project was changed by someone else. Reload it to get the latest changes before saving.");
+        return;
+      }
       toast.error("Failed to save project");
       console.error(error);
     }
@@ -958,12 +966,17 @@ const ProjectEstimator = () => {
       const response = await axios.post(`${API}/projects/${projectId}/new-version`, payload, config);
       setProjectId(response.data.id);
       setProjectVersion(response.data.version);
+      setProjectRevision(response.data.revision || 0);
+      lastSyncedWaves.current = waves;
       setProjectStatus(response.data.status || "draft");  // Update status from response
       setApproverEmail(response.data.approver_email || "");  // Clear approver
       setApprovalComments("");  // Clear approval comments
       setIsLatestVersion(true);  // New version is always latest
       setSaveAsNewVersionDialog(false);
       toast.success(`New version ${response.data.project_number} v${response.data.version} created`);
+      if (response.data.duplicate_of_version) {
+        toast.info(`This version has the same estimate as v${response.data.duplicate_of_version}`);
+      }
     } catch (error) {
       toast.error("Failed to create new version");
       console.error(error);
@@ -993,6 +1006,8 @@ const ProjectEstimator = () => {
     setProjectId("");
     setProjectNumber("");
     setProjectVersion(1);
+    setProjectRevision(0);
+    lastSyncedWaves.current = null;
     setProjectName("");
     setCustomerId("");
     setProjectLocations([]);
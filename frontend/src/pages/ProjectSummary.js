@@ -47,7 +47,7 @@ const ProjectSummary = () => {
 
   const fetchVersions = async () => {
     try {
-      const response = await axios.get(`${API}/projects/${projectId}/versions`);
+      const response = await axios.get(`${API}/projects/${projectId}/versions?include_waves=false`);
       setVersions(response.data);
     } catch (error) {
       console.error("Failed to fetch versions", error);
@@ -137,41 +137,15 @@ const SkillsManagement = () => {
       // Skip header row
       const dataRows = rows.slice(1).filter(row => row.length >= 2 && row[0] && row[1]);
       
-      let added = 0;
-      let skipped = 0;
-
-      for (const row of dataRows) {
-        const technologyName = String(row[0]).trim();
-        const skillName = String(row[1]).trim();
-
-        // Find technology by name
-        const technology = technologies.find(t => t.name.toLowerCase() === technologyName.toLowerCase());
-        if (!technology) {
-          skipped++;
-          continue;
-        }
-
-        // Check if skill already exists
-        const exists = skills.some(s => 
-          s.name.toLowerCase() === skillName.toLowerCase() && 
-          s.technology_id === technology.id
-        );
-        if (exists) {
-          skipped++;
-          continue;
-        }
-
-        try {
-          await axios.post(`${API}/skills`, {
-            name: skillName,
-            technology_id: technology.id,
-            technology_name: technology.name,
-          });
-          added++;
-        } catch {
-          skipped++;
-        }
-      }
+      // Technologies and duplicates are resolved server-side in one request
+      const response = await axios.post(`${API}/skills/bulk`, {
+        rows: dataRows.map(row => ({
+          technology_name: String(row[0]).trim(),
+          name: String(row[1]).trim(),
+        })),
+      });
+      const added = response.data.created;
+      const skipped = response.data.duplicate + response.data.invalid;
 
       toast.success(`Upload complete: ${added} added, ${skipped} skipped`);
       fetchSkills();
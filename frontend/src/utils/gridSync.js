@@ -0,0 +1,137 @@
+/**
+ * Delta-sync helpers for estimator autosave.
+ * Turns grid edits into the ordered operations accepted by POST /api/projects/{id}/sync,
+ * so autosave sends only what changed instead of the whole project.
+ */
+
+// Allocation fields the sync endpoint accepts for set_cell (mirrors WaveGridAllocation)
+const ROW_FIELDS = [
+  "skill_id", "skill_name", "proficiency_level", "avg_monthly_salary", "original_monthly_salary",
+  "base_location_id", "base_location_name", "overhead_percentage", "is_onsite", "travel_required",
+  "per_diem_daily", "per_diem_days", "accommodation_daily", "accommodation_days",
+  "local_conveyance_daily", "local_conveyance_days", "flight_cost_per_trip",
+  "visa_insurance_per_trip", "num_trips",
+];
+
+// Wave-level fields that have no sync operation; changing them needs a full save
+const WAVE_STRUCTURE_FIELDS = ["duration_months", "phase_names", "nego_buffer_percentage"];
+
+const sameValue = (a, b) => JSON.stringify(a) === JSON.stringify(b);
+
+const diffAllocation = (waveId, previous, current, operations) => {
+  const rowKeys = new Set([...Object.keys(previous), ...Object.keys(current)]);
+  for (const key of rowKeys) {
+    if (key === "id" || key === "phase_allocations" || sameValue(previous[key], current[key])) continue;
+    if (!ROW_FIELDS.includes(key)) return false;
+    operations.push({ op: "set_cell", wave_id: waveId, allocation_id: current.id, field: key, value: current[key] });
+  }
+
+  const previousPhases = previous.phase_allocations || {};
+  const currentPhases = current.phase_allocations || {};
+  for (const phaseKey of Object.keys(previousPhases)) {
+    if (!(phaseKey in currentPhases)) return false;
+  }
+  for (const [phaseKey, value] of Object.entries(currentPhases)) {
+    if (previousPhases[phaseKey] !== value) {
+      operations.push({ op: "set_cell", wave_id: waveId, allocation_id: current.id, phase_key: phaseKey, value });
+    }
+  }
+  return true;
+};
+
+/**
+ * Compute sync operations that turn previousWaves into currentWaves.
+ * Returns null when the change cannot be expressed as grid operations
+ * (waves added, removed or reordered, duration/phase changes, rows reordered).
+ */
+export const diffWaves = (previousWaves, currentWaves) => {
+  if (previousWaves.length !== currentWaves.length) return null;
+  if (previousWaves.some((w, i) => w.id !== currentWaves[i].id)) return null;
+
+  const operations = [];
+  for (let i = 0; i < currentWaves.length; i++) {
+    const previous = previousWaves[i];
+    const current = currentWaves[i];
+    if (previous === current) continue;
+    if (WAVE_STRUCTURE_FIELDS.some(field => !sameValue(previous[field], current[field]))) return null;
+
+    if (previous.name !== current.name) {
+      operations.push({ op: "rename_wave", wave_id: current.id, name: current.name });
+    }
+
+    const previousLogistics = previous.logistics_config || {};
+    const changedLogistics = {};
+    for (const [key, value] of Object.entries(current.logistics_config || {})) {
+      if (previousLogistics[key] !== value) changedLogistics[key] = value;
+    }
+    if (Object.keys(changedLogistics).length > 0) {
+      operations.push({ op: "set_logistics", wave_id: current.id, logistics_config: changedLogistics });
+    }
+
+    const previousRows = previous.grid_allocations || [];
+    const currentRows = current.grid_allocations || [];
+    const currentIds = new Set(currentRows.map(a => a.id));
+    const previousById = new Map(previousRows.map(a => [a.id, a]));
+
+    for (const row of previousRows) {
+      if (!currentIds.has(row.id)) {
+        operations.push({ op: "delete_row", wave_id: current.id, allocation_id: row.id });
+      }
+    }
+    const keptPreviousIds = previousRows.filter(a => currentIds.has(a.id)).map(a => a.id);
+    const keptCurrentIds = currentRows.filter(a => previousById.has(a.id)).map(a => a.id);
+    if (!sameValue(keptPreviousIds, keptCurrentIds)) return null;
+
+    for (let index = 0; index < currentRows.length; index++) {
+      const row = currentRows[index];
+      const previousRow = previousById.get(row.id);
+      if (!previousRow) {
+        operations.push({ op: "insert_row", wave_id: current.id, allocation: row, index });
+      } else if (previousRow !== row && !diffAllocation(current.id, previousRow, row, operations)) {
+        return null;
+      }
+    }
+  }
+  return operations;
+};
+
+const applyToWave = (wave, operation) => {
+  const rows = wave.grid_allocations || [];
+  switch (operation.op) {
+    case "set_cell":
+      return {
+        ...wave,
+        grid_allocations: rows.map(row => {
+          if (row.id !== operation.allocation_id) return row;
+          if (operation.phase_key !== undefined) {
+            return { ...row, phase_allocations: { ...(row.phase_allocations || {}), [operation.phase_key]: operation.value } };
+          }
+          return { ...row, [operation.field]: operation.value };
+        }),
+      };
+    case "insert_row": {
+      const remaining = rows.filter(row => row.id !== operation.allocation.id);
+      const index = operation.index ?? remaining.length;
+      return { ...wave, grid_allocations: [...remaining.slice(0, index), operation.allocation, ...remaining.slice(index)] };
+    }
+    case "delete_row":
+      return { ...wave, grid_allocations: rows.filter(row => row.id !== operation.allocation_id) };
+    case "rename_wave":
+      return { ...wave, name: operation.name };
+    case "set_logistics":
+      return { ...wave, logistics_config: { ...(wave.logistics_config || {}), ...operation.logistics_config } };
+    default:
+      return wave;
+  }
+};
+
+/**
+ * Apply sync operations to waves, the way the sync endpoint does on the server.
+ * Used to replay edits made while a sync was in flight onto the waves it returned;
+ * operations whose wave or row no longer exists are dropped.
+ */
+export const applyOperations = (waves, operations) =>
+  operations.reduce(
+    (current, operation) => current.map(wave => (wave.id === operation.wave_id ? applyToWave(wave, operation) : wave)),
+    waves
+  );